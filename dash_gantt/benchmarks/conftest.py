@@ -0,0 +1,95 @@
+import datetime
+import json
+import os
+import platform
+import subprocess
+
+import pytest
+
+from dash_gantt.index import ScheduleIndex
+from dash_gantt.schedule import Schedule
+from dash_gantt.store import ScheduleStore, convert_csv
+
+from .synthetic import generate_schedule
+
+# (rows, doctors) of the generated datasets
+CASES = [
+    (10_000, 10),
+    (100_000, 10),
+    (100_000, 100),
+    (100_000, 1_000),
+    (1_000_000, 1_000),
+]
+
+# Set DASH_GANTT_BENCH_MAX_ROWS to skip the larger datasets, e.g. in CI
+MAX_ROWS = int(os.environ.get('DASH_GANTT_BENCH_MAX_ROWS', '1000000'))
+
+
+@pytest.fixture(
+    scope='session',
+    params=[case for case in CASES if case[0] <= MAX_ROWS],
+    ids=lambda case: f'{case[0]}rows-{case[1]}doctors',
+)
+def schedule(request):
+    rows, doctors = request.param
+    return generate_schedule(rows, doctors, seed=0)
+
+
+@pytest.fixture(scope='session')
+def schedule_csv(schedule, tmp_path_factory):
+    path = tmp_path_factory.mktemp('schedules') / f'schedule-{len(schedule)}.csv'
+    schedule.to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture(scope='session')
+def schedule_index(schedule):
+    return ScheduleIndex(schedule, by=('laakari',))
+
+
+@pytest.fixture(scope='session')
+def schedule_store(schedule_csv, tmp_path_factory):
+    path = tmp_path_factory.mktemp('stores') / f'schedule-{schedule_csv.stem}'
+    convert_csv(schedule_csv, path)
+    return ScheduleStore(path)
+
+
+@pytest.fixture(scope='session')
+def compact_schedule(schedule):
+    return Schedule.from_frame(schedule)
+
+
+@pytest.fixture(scope='session')
+def busiest_date(schedule):
+    return schedule['datetime'].str.slice(0, 10).value_counts().index[0]
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@pytest.fixture(scope='session')
+def browser_results():
+    """
+    Collect the results of the browser benchmarks and write them as JSON to
+    DASH_GANTT_BROWSER_BENCH_JSON (default: browser-benchmark.json) at the
+    end of the session, together with the commit they were measured on.
+    """
+    results = []
+    yield results
+
+    if not results:
+        return
+    path = os.environ.get('DASH_GANTT_BROWSER_BENCH_JSON', 'browser-benchmark.json')
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump({
+            'commit': _git_commit(),
+            'datetime': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'machine': platform.platform(),
+            'results': results,
+        }, handle, indent=2)
@@ -0,0 +1,120 @@
+"""
+Seeded synthetic appointment data with the schema of `chatgpt-01.csv`.
+
+The generator reproduces the columns, categories and marginal distributions
+of the sample dataset (clinics, appointment groups, duration mix, booked
+share, office hours) at any size, so benchmarks can run on 10k to 1M rows
+with any number of doctors and still be repeatable.
+"""
+import numpy as np
+import pandas as pd
+
+from dash_gantt.data import format_datetimes
+
+COLUMNS = [
+    'datetime', 'toimipiste', 'aikaryhman', 'aikaryhma', 'laakari',
+    'RESURSSI', 'ETNS', 'ETNS_A', 'kesto_min', 'ETNS_B', 'tyhja',
+]
+
+CLINICS = ['Lääkäriasema Koski', 'Lääkäriasema Tulva', 'Lääkäriasema Virta']
+CLINIC_WEIGHTS = [0.373, 0.358, 0.269]
+
+# aikaryhman -> aikaryhma
+APPOINTMENT_GROUPS = {'In-person appointment': 'IA', 'Remote consultation': 'RC'}
+APPOINTMENT_WEIGHTS = [0.512, 0.488]
+
+# RESURSSI -> ETNS specialties of doctors with that resource
+RESOURCES = {
+    'Gynecology': ['Obstetrics', 'General Gynecology', 'Fertility'],
+    'General practitioner': ['Family Medicine', 'Internal Medicine', 'Preventive Care'],
+    'Orthopedic surgeon': ['Sports Medicine', 'Spine Surgery', 'Joint Replacement'],
+}
+RESOURCE_WEIGHTS = [0.46, 0.291, 0.249]
+
+DURATIONS = [20, 30, 60]
+DURATION_WEIGHTS = [0.704, 0.201, 0.095]
+
+# Share of free (tyhja == 1) slots
+FREE_SHARE = 0.592
+
+# Slots per doctor and working day in the sample data
+SLOTS_PER_DAY = 18
+
+
+def doctor_names(count):
+    """Names in the style of the sample data: Dr. A ... Dr. Z, Dr. AA, ..."""
+    names = []
+    for number in range(count):
+        label = ''
+        number += 1
+        while number:
+            number, rest = divmod(number - 1, 26)
+            label = chr(ord('A') + rest) + label
+        names.append(f'Dr. {label}')
+    return names
+
+
+def generate_schedule(rows, doctors=6, seed=0, start='2024-01-01'):
+    """
+    Return a DataFrame of `rows` appointment slots for `doctors` doctors.
+
+    Every doctor works one resource (RESURSSI) and the specialties (ETNS) of
+    that resource, in all clinics. Each working day a doctor has a run of
+    consecutive slots starting between 7:00 and 10:00, with 0-20 minute
+    gaps, so slots of one doctor never overlap. The number of days is
+    chosen to keep about `SLOTS_PER_DAY` slots per doctor and day. The same
+    arguments always give the same frame.
+    """
+    if rows < 1 or doctors < 1:
+        raise ValueError("rows and doctors must be at least 1")
+
+    rng = np.random.default_rng(seed)
+    names = np.array(doctor_names(doctors), dtype=object)
+
+    resources = list(RESOURCES)
+    doctor_resource = rng.choice(len(resources), size=doctors, p=RESOURCE_WEIGHTS)
+
+    # Spread the rows evenly over doctor-days: row i belongs to group
+    # i % groups, so no doctor gets more slots a day than fit in office hours
+    days = max(1, -(-rows // (doctors * SLOTS_PER_DAY)))
+    groups = days * doctors
+    group = np.sort(np.arange(rows) % groups)
+    day = group // doctors
+    doctor = group % doctors
+
+    durations = rng.choice(DURATIONS, size=rows, p=DURATION_WEIGHTS)
+    gaps = rng.choice([0, 10, 20], size=rows, p=[0.6, 0.3, 0.1])
+    steps = durations + gaps
+
+    # Offset of every slot from the start of its doctor-day run
+    totals = np.cumsum(steps)
+    first = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+    run_start = np.repeat(totals[first] - steps[first], np.diff(np.r_[first, rows]))
+    offsets = totals - steps - run_start
+
+    day_start = rng.integers(7 * 6, 10 * 6 + 1, size=groups) * 10
+    minutes = day_start[group] + offsets
+
+    timestamps = (
+        np.datetime64(start, 'm')
+        + day.astype('timedelta64[D]')
+        + minutes.astype('timedelta64[m]')
+    )
+
+    specialties = np.array([RESOURCES[resource] for resource in resources], dtype=object)
+    specialty = specialties[doctor_resource[doctor], rng.integers(0, 3, size=rows)]
+    appointment = rng.choice(list(APPOINTMENT_GROUPS), size=rows, p=APPOINTMENT_WEIGHTS)
+
+    return pd.DataFrame({
+        'datetime': format_datetimes(timestamps),
+        'toimipiste': rng.choice(CLINICS, size=rows, p=CLINIC_WEIGHTS),
+        'aikaryhman': appointment,
+        'aikaryhma': pd.Series(appointment).map(APPOINTMENT_GROUPS).to_numpy(),
+        'laakari': names[doctor],
+        'RESURSSI': np.array(resources, dtype=object)[doctor_resource[doctor]],
+        'ETNS': specialty,
+        'ETNS_A': np.ones(rows, dtype=np.int64),
+        'kesto_min': durations,
+        'ETNS_B': np.ones(rows, dtype=np.int64),
+        'tyhja': (rng.random(rows) < FREE_SHARE).astype(np.int64),
+    }, columns=COLUMNS)
@@ -0,0 +1,200 @@
+"""
+Front-end benchmarks of DashGantt in a real browser, driven by `dash_duo`.
+
+Every case renders one day of synthetic data and records, in milliseconds
+unless noted:
+
+- first_render: navigation start until the first professional row exists
+- rerender: a rawData update from a callback until the grid stops changing
+- hover: a mouseover on an empty cell until the highlight is painted
+- drag_frame_mean / drag_frame_p95: frame times while dragging a slot
+- dom_nodes: number of elements inside the component (count)
+
+Results are written as JSON (see `browser_results` in conftest.py) so runs of
+different commits can be compared. The benchmarks need Chrome and a matching
+chromedriver on the PATH:
+
+    python -m pytest benchmarks/test_browser.py --headless
+"""
+import shutil
+
+import pytest
+
+from .synthetic import generate_schedule
+
+if not shutil.which('chromedriver'):
+    pytest.skip('chromedriver is not installed', allow_module_level=True)
+
+from dash import Dash, Input, Output, html  # noqa: E402
+
+import dash_gantt  # noqa: E402
+from dash_gantt.data import to_raw_data  # noqa: E402
+
+# (professionals, slotDuration, layout)
+CASES = [
+    (10, 5, 'cells'),
+    (50, 5, 'cells'),
+    (200, 5, 'cells'),
+    (50, 1, 'cells'),
+    (10, 5, 'absolute'),
+    (50, 5, 'absolute'),
+    (200, 5, 'absolute'),
+    (50, 1, 'absolute'),
+]
+
+# Record when the first row of the grid is added to the document
+FIRST_RENDER_SCRIPT = """
+<script>
+new MutationObserver(function (mutations, observer) {
+    if (document.querySelector('#gantt tbody tr')) {
+        window.ganttFirstRender = performance.now();
+        observer.disconnect();
+    }
+}).observe(document.documentElement, {childList: true, subtree: true});
+</script>
+"""
+
+# Resolve with the time from `action()` until the grid has not changed for
+# `quiet` ms, measured at the last change
+SETTLE_JS = """
+function measureSettle(action, quiet, done) {
+    var target = document.querySelector('#gantt');
+    var start = performance.now();
+    var last = null;
+    var observer = new MutationObserver(function () { last = performance.now(); });
+    observer.observe(target, {childList: true, subtree: true, attributes: true});
+    action();
+    (function check() {
+        if (last !== null && performance.now() - last > quiet) {
+            observer.disconnect();
+            done(last - start);
+        } else if (performance.now() - start > 30000) {
+            observer.disconnect();
+            done(null);
+        } else {
+            setTimeout(check, 20);
+        }
+    })();
+}
+"""
+
+RERENDER_JS = SETTLE_JS + """
+var done = arguments[arguments.length - 1];
+measureSettle(function () { document.getElementById('update').click(); }, 500, done);
+"""
+
+HOVER_JS = """
+var done = arguments[arguments.length - 1];
+var target = document.querySelector('#gantt td[title^="Time:"]') ||
+    document.querySelector('#gantt tbody td > div[title^="Click to add"]');
+var rect = target.getBoundingClientRect();
+var start = performance.now();
+var observer = new MutationObserver(function () {
+    observer.disconnect();
+    // Resolve once the change has been painted
+    requestAnimationFrame(function () { done(performance.now() - start); });
+});
+observer.observe(document.querySelector('#gantt'), {childList: true, subtree: true, attributes: true});
+var init = {bubbles: true, clientX: rect.left + 2, clientY: rect.top + rect.height / 2};
+target.dispatchEvent(new MouseEvent('mouseover', init));
+target.dispatchEvent(new MouseEvent('mousemove', init));
+"""
+
+# Drag the first free slot to the right for `frames` animation frames and
+# return the frame times
+DRAG_JS = """
+var frames = arguments[0];
+var done = arguments[arguments.length - 1];
+var slot = document.querySelector('#gantt div[title^="Time slot"][title*="probability"]');
+var rect = slot.getBoundingClientRect();
+var x = rect.left + rect.width / 2;
+var y = rect.top + rect.height / 2;
+slot.dispatchEvent(new MouseEvent('mousedown', {bubbles: true, button: 0, clientX: x, clientY: y}));
+var times = [];
+var previous = performance.now();
+(function frame(now) {
+    if (times.length) {
+        document.dispatchEvent(new MouseEvent('mousemove', {bubbles: true, clientX: x + times.length * 3, clientY: y}));
+    }
+    times.push(now - previous);
+    previous = now;
+    if (times.length <= frames) {
+        requestAnimationFrame(frame);
+    } else {
+        document.dispatchEvent(new MouseEvent('mouseup', {bubbles: true, clientX: x + frames * 3, clientY: y}));
+        done(times.slice(1));
+    }
+})(previous);
+"""
+
+
+def make_app(professionals, slot_duration, layout):
+    # One working day: about 18 slots per professional
+    schedule = generate_schedule(professionals * 18, doctors=professionals, seed=0)
+    date = schedule['datetime'].iloc[0][:10]
+    raw_data = to_raw_data(schedule[schedule['datetime'].str.startswith(date)], with_ids=True)
+
+    app = Dash(__name__)
+    app.index_string = app.index_string.replace('{%metas%}', '{%metas%}' + FIRST_RENDER_SCRIPT)
+    app.layout = html.Div([
+        html.Button('Update', id='update'),
+        dash_gantt.DashGantt(
+            id='gantt',
+            rawData=raw_data,
+            date=date,
+            startHour=6,
+            endHour=22,
+            slotDuration=slot_duration,
+            layout=layout,
+        ),
+    ])
+
+    @app.callback(
+        Output('gantt', 'rawData'),
+        Input('update', 'n_clicks'),
+        prevent_initial_call=True,
+    )
+    def update(n_clicks):
+        # Same schedule with every booking flipped, so every slot is redrawn
+        return [dict(row, tyhja=1 - row['tyhja']) for row in raw_data]
+
+    return app
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+@pytest.mark.parametrize(
+    'professionals,slot_duration,layout',
+    CASES,
+    ids=[f'{case[0]}pros-{case[1]}min-{case[2]}' for case in CASES],
+)
+def test_render_and_interaction(dash_duo, browser_results, professionals, slot_duration, layout):
+    dash_duo.start_server(make_app(professionals, slot_duration, layout))
+    dash_duo.wait_for_element('#gantt tbody tr', timeout=30)
+    driver = dash_duo.driver
+    driver.set_script_timeout(60)
+
+    first_render = driver.execute_script('return window.ganttFirstRender || null;')
+    dom_nodes = driver.execute_script("return document.querySelectorAll('#gantt *').length;")
+    rerender = driver.execute_async_script(RERENDER_JS)
+    hover = driver.execute_async_script(HOVER_JS)
+    frames = driver.execute_async_script(DRAG_JS, 60)
+
+    result = {
+        'professionals': professionals,
+        'slotDuration': slot_duration,
+        'layout': layout,
+        'first_render': first_render,
+        'rerender': rerender,
+        'hover': hover,
+        'drag_frame_mean': sum(frames) / len(frames),
+        'drag_frame_p95': percentile(frames, 95),
+        'dom_nodes': dom_nodes,
+    }
+    browser_results.append(result)
+
+    assert first_render is not None
+    assert rerender is not None
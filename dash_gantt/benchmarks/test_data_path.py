@@ -0,0 +1,137 @@
+"""
+Benchmarks of the Python data path behind DashGantt: loading the CSV,
+looking up a date, converting to rawData, serializing the prop and applying
+edits. Run with
+
+    python -m pytest benchmarks/ --benchmark-json=benchmark.json
+"""
+import pandas as pd
+import pytest
+from plotly.io.json import to_json_plotly
+
+from dash_gantt.cache import ScheduleCache
+from dash_gantt.data import prepare_frame, to_raw_data
+from dash_gantt.index import ScheduleIndex
+from dash_gantt.patch import apply_patch
+from dash_gantt.schedule import Schedule
+from dash_gantt.store import ScheduleStore
+
+from .synthetic import generate_schedule
+
+
+def make_patch(rows, share=0.01):
+    """Modify, add and remove `share` of `rows` each, like a burst of edits."""
+    count = max(1, int(len(rows) * share))
+    modified = [dict(row, kesto_min=row['kesto_min'] + 10) for row in rows[:count]]
+    added = [
+        dict(row, id=f'new-{position}', datetime=row['datetime'][:11] + '23:00')
+        for position, row in enumerate(rows[count:2 * count])
+    ]
+    removed = [row['id'] for row in rows[-count:]]
+    return {'sequence': 1, 'added': added, 'modified': modified, 'removed': removed}
+
+
+def test_generate_schedule_is_seeded():
+    first = generate_schedule(1_000, doctors=10, seed=1)
+    second = generate_schedule(1_000, doctors=10, seed=1)
+
+    assert first.equals(second)
+    assert not first.duplicated(['datetime', 'laakari']).any()
+    assert first['laakari'].nunique() == 10
+
+
+def test_load_csv(benchmark, schedule_csv):
+    frame = benchmark(pd.read_csv, schedule_csv)
+    assert len(frame)
+
+
+def test_open_store(benchmark, schedule_store):
+    # Cold start: open the dataset and list its dates
+    dates = benchmark(lambda: ScheduleStore(schedule_store.path).dates)
+    assert dates
+
+
+def test_store_day_to_records(benchmark, schedule_store, busiest_date):
+    rows = benchmark(schedule_store.raw_data, busiest_date)
+    assert rows
+
+
+def test_store_day_and_doctor(benchmark, schedule_store, busiest_date):
+    frame = benchmark(schedule_store.frame, busiest_date, laakari='Dr. A')
+    assert len(frame)
+
+
+def test_build_index(benchmark, schedule):
+    index = benchmark.pedantic(ScheduleIndex, args=(schedule,), kwargs={'by': ('laakari',)}, rounds=3)
+    assert len(index) == len(schedule)
+
+
+def test_filter_date(benchmark, schedule_index, busiest_date):
+    frame = benchmark(schedule_index.frame, busiest_date)
+    assert len(frame)
+
+
+def test_filter_date_and_doctor(benchmark, schedule_index, busiest_date):
+    frame = benchmark(schedule_index.frame, busiest_date, laakari='Dr. A')
+    assert len(frame)
+
+
+def test_build_schedule(benchmark, schedule):
+    compact = benchmark.pedantic(Schedule.from_frame, args=(schedule,), rounds=3)
+    benchmark.extra_info['bytes_per_row'] = compact.nbytes / len(compact)
+    benchmark.extra_info['frame_bytes_per_row'] = schedule.memory_usage(deep=True).sum() / len(schedule)
+
+
+def test_schedule_filter_date_and_doctor(benchmark, compact_schedule, busiest_date):
+    selected = benchmark(compact_schedule.select, busiest_date, laakari='Dr. A')
+    assert len(selected)
+
+
+def test_schedule_day_to_records(benchmark, compact_schedule, busiest_date):
+    rows = benchmark(compact_schedule.raw_data, busiest_date)
+    assert rows
+
+
+def test_day_to_records(benchmark, schedule_index, busiest_date):
+    rows = benchmark(schedule_index.raw_data, busiest_date)
+    assert rows
+
+
+def test_day_to_columns(benchmark, schedule_index, busiest_date):
+    columns = benchmark(schedule_index.raw_data, busiest_date, orient='columns')
+    assert columns['datetime']
+
+
+def test_full_to_records(benchmark, schedule):
+    rows = benchmark.pedantic(to_raw_data, args=(schedule,), rounds=3)
+    assert len(rows) == len(schedule)
+
+
+@pytest.mark.parametrize('orient', ['records', 'columns'])
+def test_serialize_day(benchmark, schedule_index, busiest_date, orient):
+    # Dash serializes props with the plotly JSON encoder
+    raw_data = schedule_index.raw_data(busiest_date, orient=orient)
+    payload = benchmark(to_json_plotly, raw_data)
+    benchmark.extra_info['bytes'] = len(payload.encode())
+
+
+def test_apply_patch_to_cached_day(benchmark, schedule_index, busiest_date):
+    rows = schedule_index.raw_data(busiest_date)
+    patch = make_patch(rows)
+    cache = ScheduleCache(lambda date: rows)
+
+    def setup():
+        cache.put('session', busiest_date, [dict(row) for row in rows])
+        return ('session', busiest_date, patch), {}
+
+    benchmark.pedantic(cache.apply_patch, setup=setup, rounds=20)
+
+
+def test_apply_patch_to_frame(benchmark, schedule):
+    frame, _ = prepare_frame(schedule, with_ids=True)
+    patch = make_patch(frame.head(1_000).to_dict('records'))
+
+    def setup():
+        return (frame.copy(), patch), {}
+
+    benchmark.pedantic(apply_patch, setup=setup, rounds=5)
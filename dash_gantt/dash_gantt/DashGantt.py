@@ -15,23 +15,115 @@ Keyword arguments:
 - id (string; optional):
     The ID used to identify this component in Dash callbacks.
 
+- allowOverlap (boolean; default False):
+    If False, dragging a slot onto another slot of the same
+    professional or creating one over it is refused: the preview turns
+    red and the edit is dropped, and the slot editor cannot save
+    overlapping times. Set to True to allow overlapping slots.
+
 - backgroundColor (string; default '#f5f5f5'):
     The background color for the header row.
 
 - date (string; default new Date().toISOString().split('T')[0]):
     The date to display in the Gantt chart (YYYY-MM-DD).
 
+- days (number; default 1):
+    Number of consecutive days, starting at `date`, to show side by
+    side. With more than one day the chart is a read-only timeline
+    that scrolls horizontally and loads its data through `viewport`.
+
+- detailPixelsPerHour (number; default 20):
+    Below this many pixels per hour the multi-day timeline shows
+    hourly occupancy from `occupancy` instead of individual slots.
+
 - endHour (number; default 24):
     The end hour of the day (e.g., 24 for midnight).
 
-- rawData (list of dicts; optional):
-    Raw data from CSV/database in the format:  [    {      datetime:
-    string, // Format: \"YYYY-MM-DD HH:MM\"      laakari: string, //
-    Doctor name      kesto_min: number, // Duration in minutes
-    tyhja: number, // 0 if booked, 1 if available
+- height (number; default 600):
+    The height of the scrollable viewport in pixels when `virtualize`
+    is True.
+
+- historyLimit (number; default 100):
+    The number of edits that can be undone with the Undo button or
+    Ctrl+Z and redone with Redo, Ctrl+Shift+Z or Ctrl+Y. A step holds
+    only the slots the edit changed, and undoing or redoing reports
+    only those rows (through rawDataPatch in 'patch' mode). The history
+    is cleared when `date` changes or a callback replaces `rawData`. 0
+    disables undo.
+
+- layout (a value equal to: 'cells', 'absolute'; default 'cells'):
+    How timeslots are laid out on a row: - 'cells': one table cell per
+    slotDuration minutes, slots anchored to the cell of their start
+    time - 'absolute': one cell per professional, with the grid drawn
+    as a background and slots positioned by their start minute. The
+    number of DOM nodes depends on the number of slots only, which
+    keeps short slot durations and long days cheap to render.
+
+- occupancy (dict with strings as keys and values of type list | dict; optional):
+    Hourly occupancy per professional for the zoomed-out multi-day
+    timeline, in the columnar format with one entry per professional
+    and hour: {    date: [string], // \"YYYY-MM-DD\"    hour: [number],
+    // 0-23    laakari: [string],    booked: [number], // Booked minutes
+    available: [number], // Available minutes    expected: [number] //
+    Available minutes times bookingProbability  } Any column may be
+    dictionary-encoded like in rawData. See dash_gantt.occupancy.
+
+- overscan (number; default 5):
+    The number of rows mounted above and below the viewport when
+    `virtualize` is True.
+
+- perfMetrics (dict; optional):
+    Performance telemetry, set at most every `perfMetricsInterval` ms
+    while something was measured: {    sequence: number, // Increases
+    with every report    timestamp: number, // Epoch milliseconds
+    rows: number, // rawData size when reported    slots: number, //
+    Timeslots of the displayed date    professionals: number,
+    samples: {name: [number]}, // Up to 200 samples per metric
+    counts: {name: number}, // Measurements taken per metric
+    droppedFrames: number, // Frames missed while dragging
+    dragFrames: number // Frames seen while dragging  } Metrics are
+    'render', 'transform', 'update' and 'drag' durations in
+    milliseconds, and 'payloadBytes', the JSON size of the data sent
+    back to Dash on each edit. Durations are also recorded as User
+    Timing measures named `dash-gantt:<metric>`.
+
+- perfMetricsInterval (number; default 0):
+    How often, in milliseconds, the component reports performance
+    telemetry through `perfMetrics`. 0 disables telemetry; nothing is
+    measured then.
+
+- pixelsPerHour (number; default 60):
+    Zoom of the multi-day timeline in pixels per hour. Ctrl+wheel over
+    the timeline zooms in and out between 4 and 240 and updates this
+    prop.
+
+- predictions (dict with strings as keys and values of type number; optional):
+    Booking probabilities by row id, e.g. {\"17\": 0.82,
+    \"new-lx2k-1\": 0.4}. Overrides the bookingProbability of the
+    matching slots without resending rawData; only the listed slots
+    are recolored. Row ids are the same as in rawDataPatch. Slots that
+    are not listed keep their current probability.
+
+- prefetchDays (number; default 1):
+    Days on either side of the visible ones that the multi-day
+    timeline requests ahead of scrolling. Days more than twice as far
+    away are dropped from the browser and requested again when
+    scrolled back to.
+
+- rawData (list of dicts | dict with strings as keys and values of type list | dict; optional):
+    Raw data from CSV/database, either as a list of rows:  [    {
+    datetime: string, // Format: \"YYYY-MM-DD HH:MM\"      laakari:
+    string, // Doctor name      kesto_min: number, // Duration in
+    minutes      tyhja: number, // 0 if booked, 1 if available
     bookingProbability?: number, // Optional, defaults to 0.5 if not
     provided      // Additional fields are allowed and will be
-    preserved    }  ].
+    preserved    }  ] or in columnar format, as an object of equally
+    long arrays keyed by field name. String columns may be
+    dictionary-encoded as {categories: [...], codes: [...]}, e.g.  {
+    datetime: [\"2024-01-01 08:00\", \"2024-01-01 08:20\"],   laakari:
+    {categories: [\"Dr. A\"], codes: [0, 0]},   kesto_min: [20, 20],
+    tyhja: [1, 0]  } Edits are reported back in the same format as the
+    input.
 
     `rawData` is a list of dicts with keys:
 
@@ -43,22 +135,96 @@ Keyword arguments:
 
     - tyhja (number; required)
 
-    - bookingProbability (number; optional)
+    - bookingProbability (number; optional) | dict with strings as keys and values of type list | dict with keys:
+
+    - categories (list; optional)
+
+    - codes (list of numbers; optional)
+
+- rawDataPatch (dict; optional):
+    The rows changed by the last edit, set when updateMode is 'patch':
+    {    sequence: number, // Increases with every patch    added:
+    [row], // New rows, with ids generated in the browser    modified:
+    [row], // Complete rows after the edit    removed: [id] // Ids of
+    removed rows  } Rows are in the rawData row format and carry an
+    `id`, taken from the `id` field of the source row or, if it has
+    none, its position in rawData.
+
+    `rawDataPatch` is a dict with keys:
+
+    - sequence (number; optional)
+
+    - added (list of dicts; optional)
+
+    - modified (list of dicts; optional)
+
+    - removed (list of string | numbers; optional)
 
 - slotDuration (number; default 5):
     The duration of each slot in minutes.
 
 - startHour (number; default 6):
-    The start hour of the day (e.g., 6 for 6:00 AM)."""
+    The start hour of the day (e.g., 6 for 6:00 AM).
+
+- summary (dict; optional):
+    Utilization totals shown in the single-day view, computed on the
+    server (see dash_gantt.utilization): {   professionals: {name:
+    totals}, // Shown as a column after the hours   hours: {hour:
+    totals}, // Shown as a row below the professionals   total: totals
+    // Shown where the column and the row meet } where totals are
+    {booked, available, expected, utilization,  expectedUtilization}, in
+    minutes and as shares of the scheduled  minutes. Either part may be
+    left out.
+
+    `summary` is a dict with keys:
+
+    - professionals (dict with strings as keys and values of type dict; optional)
+
+    - hours (dict with strings as keys and values of type dict; optional)
+
+    - total (dict; optional)
+
+- updateMode (a value equal to: 'full', 'patch'; default 'full'):
+    How edits are reported to Dash. With 'full' the whole updated
+    rawData is set on every edit. With 'patch' rawData is left untouched
+    and only the changed rows are reported through rawDataPatch.
+
+- virtualize (boolean; default False):
+    If True, only the professional rows inside the scrollable viewport
+    (plus `overscan` rows above and below it) are mounted. The time
+    header stays visible while scrolling.
+
+- viewport (dict; optional):
+    Visible window of the multi-day timeline, set when scrolling
+    pauses: {    start: string, // First visible hour, \"YYYY-MM-DD
+    HH:MM\"    end: string, // End of the last visible hour,
+    \"YYYY-MM-DD HH:MM\"    dates: [string], // Visible dates
+    detail: 'slots' | 'occupancy', // What the missing dates are needed
+    as    missing: [string] // Dates to send, nearest first  } rawData
+    (or, when `detail` is 'occupancy', occupancy) set in response is
+    merged by date into the loaded days, so it only needs to hold the
+    `missing` dates.
+
+    `viewport` is a dict with keys:
+
+    - start (string; optional)
+
+    - end (string; optional)
+
+    - dates (list of strings; optional)
+
+    - detail (a value equal to: 'slots', 'occupancy'; optional)
+
+    - missing (list of strings; optional)"""
     _children_props = []
     _base_nodes = ['children']
     _namespace = 'dash_gantt'
     _type = 'DashGantt'
     @_explicitize_args
-    def __init__(self, id=Component.UNDEFINED, rawData=Component.UNDEFINED, date=Component.UNDEFINED, startHour=Component.UNDEFINED, endHour=Component.UNDEFINED, slotDuration=Component.UNDEFINED, backgroundColor=Component.UNDEFINED, onDataChange=Component.UNDEFINED, **kwargs):
-        self._prop_names = ['id', 'backgroundColor', 'date', 'endHour', 'rawData', 'slotDuration', 'startHour']
+    def __init__(self, id=Component.UNDEFINED, rawData=Component.UNDEFINED, date=Component.UNDEFINED, startHour=Component.UNDEFINED, endHour=Component.UNDEFINED, slotDuration=Component.UNDEFINED, backgroundColor=Component.UNDEFINED, onDataChange=Component.UNDEFINED, updateMode=Component.UNDEFINED, predictions=Component.UNDEFINED, rawDataPatch=Component.UNDEFINED, virtualize=Component.UNDEFINED, height=Component.UNDEFINED, overscan=Component.UNDEFINED, layout=Component.UNDEFINED, perfMetricsInterval=Component.UNDEFINED, perfMetrics=Component.UNDEFINED, days=Component.UNDEFINED, prefetchDays=Component.UNDEFINED, viewport=Component.UNDEFINED, pixelsPerHour=Component.UNDEFINED, detailPixelsPerHour=Component.UNDEFINED, occupancy=Component.UNDEFINED, summary=Component.UNDEFINED, allowOverlap=Component.UNDEFINED, historyLimit=Component.UNDEFINED, **kwargs):
+        self._prop_names = ['id', 'allowOverlap', 'backgroundColor', 'date', 'days', 'detailPixelsPerHour', 'endHour', 'height', 'historyLimit', 'layout', 'occupancy', 'overscan', 'perfMetrics', 'perfMetricsInterval', 'pixelsPerHour', 'predictions', 'prefetchDays', 'rawData', 'rawDataPatch', 'slotDuration', 'startHour', 'summary', 'updateMode', 'virtualize', 'viewport']
         self._valid_wildcard_attributes =            []
-        self.available_properties = ['id', 'backgroundColor', 'date', 'endHour', 'rawData', 'slotDuration', 'startHour']
+        self.available_properties = ['id', 'allowOverlap', 'backgroundColor', 'date', 'days', 'detailPixelsPerHour', 'endHour', 'height', 'historyLimit', 'layout', 'occupancy', 'overscan', 'perfMetrics', 'perfMetricsInterval', 'pixelsPerHour', 'predictions', 'prefetchDays', 'rawData', 'rawDataPatch', 'slotDuration', 'startHour', 'summary', 'updateMode', 'virtualize', 'viewport']
         self.available_wildcard_properties =            []
         _explicit_args = kwargs.pop('_explicit_args')
         _locals = locals()
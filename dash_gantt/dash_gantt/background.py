@@ -0,0 +1,153 @@
+"""
+Background scoring jobs for slow booking-probability models.
+
+Scoring a week of slots with a real model can take seconds. Run inside a
+callback, that blocks the Flask worker handling it, and the edits of every
+other user queue behind it. `ScoringJobs` runs `Scorer.score_batches` on a
+background thread (and the model itself on an optional process pool) and
+keeps the scores of finished batches until they are polled, so a callback
+triggered by a `dcc.Interval` can stream them into the `predictions` prop of
+DashGantt while the user keeps editing.
+"""
+import threading
+import uuid
+from collections import OrderedDict
+
+
+class _Job:
+    __slots__ = ('thread', 'cancelled', 'done', 'total', 'pending', 'finished', 'error')
+
+    def __init__(self, total):
+        self.thread = None
+        self.cancelled = threading.Event()
+        self.done = 0
+        self.total = total
+        self.pending = {}
+        self.finished = False
+        self.error = None
+
+
+class ScoringJobs:
+    """
+    Registry of background scoring jobs of one `Scorer`.
+
+    Every job scores its rows in batches of `batch_size` distinct feature
+    combinations; with an `executor` (e.g. a
+    `concurrent.futures.ProcessPoolExecutor`) the batches run in parallel on
+    its workers. At most `max_jobs` jobs are kept: submitting more drops the
+    oldest finished jobs, then cancels the oldest running ones.
+
+    Jobs live in the memory of the process that started them, so with
+    several server processes the polls of a job must reach the process it
+    was submitted to. All methods are thread-safe.
+    """
+
+    def __init__(self, scorer, executor=None, batch_size=5_000, max_jobs=64):
+        if max_jobs < 1:
+            raise ValueError("max_jobs must be at least 1")
+
+        self.scorer = scorer
+        self.executor = executor
+        self.batch_size = batch_size
+        self.max_jobs = max_jobs
+
+        self.submitted = 0
+        self.failed = 0
+
+        self._jobs = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def __contains__(self, job_id):
+        return job_id in self._jobs
+
+    def _run(self, job, rows):
+        try:
+            batches = self.scorer.score_batches(rows, batch_size=self.batch_size, executor=self.executor)
+            try:
+                for done, _, scores in batches:
+                    if job.cancelled.is_set():
+                        break
+                    with self._lock:
+                        job.pending.update(scores)
+                        job.done = done
+            finally:
+                batches.close()
+        except Exception as error:  # reported through poll()
+            with self._lock:
+                job.error = f"{type(error).__name__}: {error}"
+                self.failed += 1
+        finally:
+            with self._lock:
+                job.finished = True
+
+    def _evict(self):
+        while len(self._jobs) > self.max_jobs:
+            finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+            job_id = finished[0] if finished else next(iter(self._jobs))
+            self._jobs.pop(job_id).cancelled.set()
+
+    def submit(self, rows, job_id=None):
+        """
+        Start scoring `rows` (a list of rawData dicts) and return the job
+        id. Submitting with the id of a job that is still running, e.g. a
+        session id, cancels that job first.
+        """
+        job_id = job_id or uuid.uuid4().hex
+        job = _Job(len(rows))
+        job.thread = threading.Thread(
+            target=self._run, args=(job, list(rows)), name=f'dash-gantt-scoring-{job_id}', daemon=True
+        )
+
+        with self._lock:
+            previous = self._jobs.pop(job_id, None)
+            if previous is not None:
+                previous.cancelled.set()
+            self._jobs[job_id] = job
+            self.submitted += 1
+            self._evict()
+
+        job.thread.start()
+        return job_id
+
+    def poll(self, job_id):
+        """
+        Return the progress of a job as a dict with `done` and `total` row
+        counts, the `predictions` (row id -> probability) finished since
+        the last poll, and `finished` and `error` (None or a message). A
+        finished job is forgotten once its last results have been polled.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                raise KeyError(f"Unknown scoring job: {job_id}")
+
+            predictions, job.pending = job.pending, {}
+            if job.finished:
+                del self._jobs[job_id]
+            return {
+                'done': job.done,
+                'total': job.total,
+                'predictions': predictions,
+                'finished': job.finished,
+                'error': job.error,
+            }
+
+    def cancel(self, job_id):
+        """Stop a job after its current batch and forget it."""
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+        if job is not None:
+            job.cancelled.set()
+
+    def stats(self):
+        """Return the job counters and the number of running jobs as a dict."""
+        with self._lock:
+            return {
+                'submitted': self.submitted,
+                'failed': self.failed,
+                'running': sum(1 for job in self._jobs.values() if not job.finished),
+                'jobs': len(self._jobs),
+            }
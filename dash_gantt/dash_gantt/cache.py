@@ -0,0 +1,183 @@
+"""
+Server-side cache of per-date schedules.
+
+Instead of round-tripping every visited date through a `dcc.Store`, the rows
+stay on the server in a `ScheduleCache` keyed by `(session_id, date)`.
+Callbacks only exchange the date and a version number, and edits reported
+through `rawDataPatch` are applied to the cached rows in place.
+"""
+import threading
+from collections import OrderedDict
+
+from .patch import apply_patch
+
+
+class _Entry:
+    __slots__ = ('rows', 'version', 'derived')
+
+    def __init__(self, rows):
+        # Rows are kept by id so patches cost the size of the edit
+        self.rows = {row.get('id', position): row for position, row in enumerate(rows)}
+        self.version = 0
+        # State computed from the rows, see ScheduleCache.derived
+        self.derived = {}
+
+
+class ScheduleCache:
+    """
+    LRU cache of rawData rows per session and date.
+
+    `loader(date)` returns the rawData rows (a list of dicts) of a date and
+    is called on a cache miss; the loaded rows are private to the session
+    that requested them. Memory is bounded by `max_entries` cached
+    (session, date) pairs and, optionally, by `max_rows` rows in total. The
+    least recently used entries are evicted first.
+
+    The `hits`, `misses` and `evictions` counters are available as
+    attributes and through `stats()`. All methods are thread-safe.
+    """
+
+    def __init__(self, loader, max_entries=256, max_rows=None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.loader = loader
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries = OrderedDict()
+        self._rows = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def _evict(self, keep):
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries
+            or (self.max_rows is not None and self._rows > self.max_rows)
+        ):
+            key, entry = next(iter(self._entries.items()))
+            if key == keep:
+                # Never evict the entry that is being used right now
+                self._entries.move_to_end(key)
+                continue
+            del self._entries[key]
+            self._rows -= len(entry.rows)
+            self.evictions += 1
+
+    def _entry(self, session_id, date):
+        key = (session_id, date)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        # Load outside the lock so slow loaders don't block other sessions
+        entry = _Entry(self.loader(date))
+
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                self._entries.move_to_end(key)
+                return existing
+            self._entries[key] = entry
+            self._rows += len(entry.rows)
+            self._evict(keep=key)
+        return entry
+
+    def get(self, session_id, date):
+        """Return `(rows, version)` for a date, loading it on a miss."""
+        entry = self._entry(session_id, date)
+        with self._lock:
+            return list(entry.rows.values()), entry.version
+
+    def version(self, session_id, date):
+        """Return the version of a cached date, or None if it isn't cached."""
+        with self._lock:
+            entry = self._entries.get((session_id, date))
+            return None if entry is None else entry.version
+
+    def put(self, session_id, date, rows):
+        """Replace the rows of a date and return the new version."""
+        key = (session_id, date)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            entry = _Entry(rows)
+            if old is not None:
+                self._rows -= len(old.rows)
+                entry.version = old.version + 1
+            self._entries[key] = entry
+            self._rows += len(entry.rows)
+            self._evict(keep=key)
+            return entry.version
+
+    def apply_patch(self, session_id, date, patch):
+        """
+        Apply a `rawDataPatch` to the rows of a date and return the new
+        version. The date is loaded first if it isn't cached.
+        """
+        key = (session_id, date)
+        while True:
+            entry = self._entry(session_id, date)
+            with self._lock:
+                # Evicted or replaced since the lookup: patch the current entry
+                if self._entries.get(key) is not entry:
+                    continue
+                before = len(entry.rows)
+                apply_patch(entry.rows, patch)
+                for value in entry.derived.values():
+                    if hasattr(value, 'apply_patch'):
+                        value.apply_patch(patch)
+                self._rows += len(entry.rows) - before
+                entry.version += 1
+                self._evict(keep=key)
+                return entry.version
+
+    def derived(self, session_id, date, name, factory):
+        """
+        Return state derived from the rows of a date, e.g. a
+        `UtilizationTracker`, built by `factory(rows)` on first use and
+        evicted together with the rows. Values with an `apply_patch` method
+        receive every patch applied to the date, so they stay in step.
+        """
+        key = (session_id, date)
+        while True:
+            entry = self._entry(session_id, date)
+            with self._lock:
+                if self._entries.get(key) is not entry:
+                    continue
+                if name not in entry.derived:
+                    entry.derived[name] = factory(list(entry.rows.values()))
+                return entry.derived[name]
+
+    def clear(self, session_id=None):
+        """Drop all entries, or only those of one session."""
+        with self._lock:
+            keys = [
+                key for key in self._entries
+                if session_id is None or key[0] == session_id
+            ]
+            for key in keys:
+                self._rows -= len(self._entries.pop(key).rows)
+
+    def stats(self):
+        """Return the cache counters and current size as a dict."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'rows': self._rows,
+            }
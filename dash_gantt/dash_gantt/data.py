@@ -0,0 +1,227 @@
+"""
+Helpers for turning appointment data into the `rawData` prop of DashGantt.
+
+The source data follows the schema of `chatgpt-01.csv`:
+
+    datetime,toimipiste,aikaryhman,aikaryhma,laakari,RESURSSI,ETNS,
+    ETNS_A,kesto_min,ETNS_B,tyhja
+
+All conversions work on whole columns at once, so converting a day (or a
+whole history) costs a handful of vectorized pandas operations instead of
+one Python dict per row.
+"""
+import logging
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Source column -> rawData key for columns passed through as strings
+STRING_COLUMNS = {
+    'toimipiste': 'toimipiste',
+    'aikaryhman': 'aikaryhman',
+    'aikaryhma': 'aikaryhma',
+    'laakari': 'laakari',
+    'RESURSSI': 'RESURSSI',
+    'ETNS': 'specialty',
+}
+
+# Columns that DashGantt expects as integers
+INT_COLUMNS = ['ETNS_A', 'kesto_min', 'ETNS_B', 'tyhja']
+
+# Optional columns that are forwarded as floats when present. Missing values
+# are sent as null (DashGantt falls back to its default) and do not make a
+# row bad.
+FLOAT_COLUMNS = ['bookingProbability']
+
+# String columns dictionary-encoded in the columnar rawData format
+ENCODED_COLUMNS = ('laakari', 'toimipiste', 'aikaryhman')
+
+
+def _as_frame(data):
+    """Accept a DataFrame or any mapping of column name -> sequence."""
+    if isinstance(data, pd.DataFrame):
+        return data
+    return pd.DataFrame(data)
+
+
+def format_datetimes(timestamps):
+    """
+    Format datetime64 values as "YYYY-MM-DD HH:MM" strings. Timezone-aware
+    timestamps keep their local wall-clock time.
+
+    Goes through `numpy.datetime_as_string`, which is an order of magnitude
+    faster than `Series.dt.strftime` on large columns.
+    """
+    # NumPy would convert aware timestamps to UTC; drop the timezone first
+    local = getattr(timestamps, 'dt', timestamps)
+    if getattr(local, 'tz', None) is not None:
+        timestamps = local.tz_localize(None)
+    values = np.asarray(timestamps, dtype='datetime64[m]')
+    return np.char.replace(np.datetime_as_string(values, unit='m'), 'T', ' ')
+
+
+def prepare_frame(data, with_ids=False):
+    """
+    Convert source data into a frame holding exactly the rawData columns.
+
+    Returns a tuple `(frame, bad_index)`. `frame` has the rawData keys as
+    columns (with `datetime` already formatted as "YYYY-MM-DD HH:MM" and the
+    integer columns cast to int64) and keeps the index of the input.
+    `bad_index` holds the index labels of the input rows that could not be
+    converted; those rows are not part of `frame`.
+
+    With `with_ids=True` an `id` column holding the index labels is added.
+    DashGantt uses it as the stable row id in `rawDataPatch`.
+    """
+    source = _as_frame(data)
+
+    missing = [
+        column for column in ['datetime', *STRING_COLUMNS, *INT_COLUMNS]
+        if column not in source.columns
+    ]
+    if missing:
+        raise KeyError(f"Missing required columns: {', '.join(missing)}")
+
+    timestamps = pd.to_datetime(source['datetime'], errors='coerce')
+    bad = timestamps.isna().to_numpy().copy()
+
+    converted = {}
+    for column in INT_COLUMNS:
+        values = pd.to_numeric(source[column], errors='coerce')
+        bad |= values.isna().to_numpy()
+        converted[column] = values
+
+    for column in FLOAT_COLUMNS:
+        if column in source.columns:
+            converted[column] = pd.to_numeric(source[column], errors='coerce')
+
+    good = ~bad
+    frame = pd.DataFrame(index=source.index[good])
+    if with_ids:
+        frame['id'] = source.index[good]
+    frame['datetime'] = format_datetimes(timestamps[good])
+    for column, key in STRING_COLUMNS.items():
+        frame[key] = source[column][good].astype(str)
+    for column in INT_COLUMNS:
+        frame[column] = converted[column][good].astype(np.int64)
+    for column in FLOAT_COLUMNS:
+        if column in converted:
+            frame[column] = converted[column][good].astype(np.float64)
+
+    return frame, source.index[bad]
+
+
+def _values(column):
+    """Native Python values of a column, with missing values as None."""
+    if column.isna().any():
+        return column.astype(object).where(column.notna(), None).tolist()
+    return column.tolist()
+
+
+def frame_to_records(frame):
+    """
+    Turn a prepared frame into a list of rawData dicts.
+
+    `tolist()` yields native Python values column by column, so no per-row
+    boxing or type checks are needed.
+    """
+    keys = list(frame.columns)
+    columns = [_values(frame[key]) for key in keys]
+    return [dict(zip(keys, values)) for values in zip(*columns)]
+
+
+def frame_to_columns(frame, encode=ENCODED_COLUMNS):
+    """
+    Turn a prepared frame into columnar rawData.
+
+    Every column becomes a list; the columns named in `encode` are
+    dictionary-encoded as `{'categories': [...], 'codes': [...]}`, so each
+    doctor or clinic name is sent once instead of once per row.
+    """
+    columns = {}
+    for key in frame.columns:
+        if key in encode:
+            codes, categories = pd.factorize(frame[key], sort=False)
+            columns[key] = {'categories': categories.tolist(), 'codes': codes.tolist()}
+        else:
+            columns[key] = _values(frame[key])
+    return columns
+
+
+def is_columnar(raw_data):
+    """Check whether rawData is in the columnar format."""
+    return isinstance(raw_data, Mapping)
+
+
+def raw_data_to_frame(raw_data):
+    """
+    Load rawData of either format (e.g. edits sent back by DashGantt) into
+    a DataFrame with one column per rawData key.
+    """
+    if not is_columnar(raw_data):
+        return pd.DataFrame.from_records(raw_data)
+
+    columns = {}
+    for key, column in raw_data.items():
+        if isinstance(column, Mapping):
+            categories = np.asarray(column['categories'], dtype=object)
+            columns[key] = categories[np.asarray(column['codes'], dtype=np.intp)]
+        else:
+            columns[key] = column
+    return pd.DataFrame(columns)
+
+
+def report_bad_rows(bad_index, errors='skip'):
+    """
+    Report the rows `prepare_frame` could not convert, once for the whole
+    batch: logged as a single warning with `errors='skip'`, raised as a
+    ValueError listing them with `errors='raise'`.
+    """
+    if errors not in ('skip', 'raise'):
+        raise ValueError("errors must be either 'skip' or 'raise'")
+    if not len(bad_index):
+        return
+
+    preview = ', '.join(str(label) for label in bad_index[:10])
+    if len(bad_index) > 10:
+        preview += ', ...'
+    message = f"{len(bad_index)} rows could not be converted to rawData (index: {preview})"
+    if errors == 'raise':
+        raise ValueError(message)
+    logger.warning(message)
+
+
+def to_raw_data(data, errors='skip', orient='records', with_ids=False):
+    """
+    Convert appointment data into the `rawData` payload of DashGantt.
+
+    `data` is a pandas DataFrame or a mapping of column name -> sequence
+    with the columns of `chatgpt-01.csv`. The `ETNS` column is renamed to
+    `specialty`, `datetime` is formatted as "YYYY-MM-DD HH:MM" and the
+    integer columns are cast to int. A `bookingProbability` column is
+    passed through when present, with missing probabilities as None.
+
+    Rows that cannot be converted (unparseable datetime, non-numeric
+    integer column) are reported once for the whole batch: with
+    `errors='skip'` they are logged as a single warning and dropped, with
+    `errors='raise'` a ValueError listing them is raised.
+
+    With `orient='records'` the payload is a list of dicts, with
+    `orient='columns'` it is the columnar format (see `frame_to_columns`),
+    which DashGantt accepts as well and echoes back on edits. With
+    `with_ids=True` every row carries its index label as `id`.
+    """
+    if errors not in ('skip', 'raise'):
+        raise ValueError("errors must be either 'skip' or 'raise'")
+    if orient not in ('records', 'columns'):
+        raise ValueError("orient must be either 'records' or 'columns'")
+
+    frame, bad_index = prepare_frame(data, with_ids=with_ids)
+    report_bad_rows(bad_index, errors)
+
+    if orient == 'columns':
+        return frame_to_columns(frame)
+    return frame_to_records(frame)
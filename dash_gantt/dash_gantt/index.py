@@ -0,0 +1,102 @@
+"""
+Date-partitioned index over the appointment dataset.
+
+`ScheduleIndex` converts the source data into rawData columns once, sorts it
+by `datetime` and remembers where each date starts and ends. Looking up a
+date is then a slice of the pre-converted frame, so the cost of a callback
+depends on the size of that day instead of the whole history, and the source
+DataFrame is never mutated.
+"""
+import numpy as np
+
+from .data import frame_to_columns, frame_to_records, prepare_frame, report_bad_rows
+
+
+class ScheduleIndex:
+    """
+    Read-only lookup of rawData rows by date.
+
+    `data` is anything accepted by `dash_gantt.data.to_raw_data`. `by` lists
+    rawData columns (e.g. `('toimipiste', 'laakari')`) for which row offsets
+    are pre-computed per date, so that `frame(date, laakari='Dr. A')` does
+    not have to scan the whole day. Filters on other columns still work but
+    are evaluated against the day's slice.
+
+    Every row carries the index label of its source row as `id`, so edits
+    reported through `rawDataPatch` can be applied back to the source.
+    Rows that cannot be converted are reported like in `to_raw_data` (see
+    `dash_gantt.data.report_bad_rows`) and kept in `bad_index`.
+    """
+
+    def __init__(self, data, by=(), errors='skip'):
+        frame, self.bad_index = prepare_frame(data, with_ids=True)
+        report_bad_rows(self.bad_index, errors)
+
+        # Sorting by datetime makes every date a contiguous block of rows
+        order = np.argsort(frame['datetime'].to_numpy(), kind='stable')
+        self._frame = frame.iloc[order]
+        self._by = tuple(by)
+
+        day_keys = self._frame['datetime'].str.slice(0, 10).to_numpy()
+        dates, starts = np.unique(day_keys, return_index=True)
+        stops = np.append(starts[1:], len(day_keys))
+        self._bounds = {
+            date: (int(start), int(stop))
+            for date, start, stop in zip(dates.tolist(), starts, stops)
+        }
+
+        self._offsets = {}
+        for column in self._by:
+            if column not in self._frame.columns:
+                raise KeyError(f"Cannot index on unknown column: {column}")
+            groups = self._frame.groupby([day_keys, self._frame[column].to_numpy()], sort=False).indices
+            self._offsets[column] = {key: np.asarray(value) for key, value in groups.items()}
+
+    @property
+    def dates(self):
+        """Sorted list of the dates ("YYYY-MM-DD") present in the data."""
+        return list(self._bounds)
+
+    def __contains__(self, date):
+        return date in self._bounds
+
+    def __len__(self):
+        return len(self._frame)
+
+    def frame(self, date, **filters):
+        """
+        Return the prepared rows of `date` as a DataFrame.
+
+        Keyword arguments filter on rawData columns, e.g.
+        `frame('2024-01-01', laakari='Dr. A')`. The returned frame is a copy
+        and can be modified freely.
+        """
+        if date not in self._bounds:
+            return self._frame.iloc[0:0].copy()
+
+        indexed = [column for column in filters if column in self._offsets]
+        if indexed:
+            positions = None
+            for column in indexed:
+                found = self._offsets[column].get((date, filters[column]), np.empty(0, dtype=np.intp))
+                positions = found if positions is None else np.intersect1d(positions, found)
+            result = self._frame.take(np.sort(positions))
+        else:
+            start, stop = self._bounds[date]
+            result = self._frame.iloc[start:stop]
+
+        for column, value in filters.items():
+            if column not in self._offsets:
+                result = result[result[column] == value]
+
+        return result.copy()
+
+    def raw_data(self, date, orient='records', **filters):
+        """
+        Return the rows of `date` in the rawData format, as a list of dicts
+        (`orient='records'`) or in the columnar format (`orient='columns'`).
+        """
+        frame = self.frame(date, **filters)
+        if orient == 'columns':
+            return frame_to_columns(frame)
+        return frame_to_records(frame)
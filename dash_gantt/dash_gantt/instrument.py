@@ -0,0 +1,292 @@
+"""
+Opt-in instrumentation of the Dash callbacks wired around DashGantt.
+
+`CallbackMetrics.instrument` wraps a callback function and records its wall
+time and the number of schedule rows it receives and returns. Once the
+collector is attached to the app with `init_app`, it also records, per
+callback, the size of the serialized request and response and the time of
+the whole request, which includes the JSON encoding done by Dash. Everything
+is served in the Prometheus text format from a route of the app's own Flask
+server:
+
+    metrics = CallbackMetrics(max_response_bytes=5_000_000)
+    metrics.init_app(app)  # GET /metrics
+
+    @callback(Output('gantt-chart', 'rawData'), Input('date-picker', 'date'))
+    @metrics.instrument
+    def update_gantt_data(date):
+        ...
+"""
+import functools
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Mapping
+
+import flask
+from dash.exceptions import PreventUpdate
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7, 1e8)
+ROW_BUCKETS = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+PATCH_KEYS = ('added', 'modified', 'removed')
+
+# Attribute of flask.g naming the instrumented callback of the request
+_CALLBACK = '_dash_gantt_callback'
+_STARTED = '_dash_gantt_started'
+
+
+def count_rows(value):
+    """
+    Count the schedule rows in a callback argument or return value: rawData
+    rows in either format and `rawDataPatch` entries. Lists and tuples of
+    several outputs are counted together; anything else counts as 0.
+    """
+    if isinstance(value, Mapping):
+        if any(key in value for key in PATCH_KEYS):
+            return sum(len(value.get(key) or ()) for key in PATCH_KEYS)
+        datetimes = value.get('datetime')
+        if isinstance(datetimes, Mapping):
+            return len(datetimes.get('codes') or ())
+        if isinstance(datetimes, (list, tuple)):
+            return len(datetimes)
+        return 1 if datetimes is not None else 0
+    if isinstance(value, (list, tuple)):
+        if value and isinstance(value[0], Mapping) and 'datetime' in value[0]:
+            return len(value)
+        return sum(count_rows(item) for item in value)
+    return 0
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Histogram:
+    __slots__ = ('bounds', 'counts', 'sum')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0
+
+    def observe(self, value):
+        # Buckets are inclusive upper bounds, as in Prometheus
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def lines(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.bounds + (float('inf'),), self.counts):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else _format(bound)
+            yield f'{name}_bucket{{{labels},le="{le}"}} {cumulative}'
+        yield f'{name}_sum{{{labels}}} {_format(self.sum)}'
+        yield f'{name}_count{{{labels}}} {cumulative}'
+
+
+class _Callback:
+    __slots__ = ('calls', 'errors', 'oversized', 'histograms')
+
+    def __init__(self, metrics):
+        self.calls = 0
+        self.errors = 0
+        self.oversized = 0
+        self.histograms = {
+            name: _Histogram(bounds) for name, (bounds, _) in metrics.items()
+        }
+
+
+class CallbackMetrics:
+    """
+    Timings, payload sizes and row counts of instrumented Dash callbacks.
+
+    Responses larger than `max_response_bytes` are logged as warnings and
+    counted, to catch schedules that are too big to ship to the browser.
+    All methods are thread-safe.
+    """
+
+    # Histogram name -> (kind of buckets, help text)
+    METRICS = {
+        'callback_duration_seconds': ('duration', 'Wall time spent in the callback function.'),
+        'request_duration_seconds': ('duration', 'Wall time of the whole callback request, including JSON encoding.'),
+        'request_bytes': ('size', 'Size of the serialized callback request.'),
+        'response_bytes': ('size', 'Size of the serialized callback response.'),
+        'input_rows': ('rows', 'Schedule rows received by the callback.'),
+        'output_rows': ('rows', 'Schedule rows returned by the callback.'),
+    }
+
+    def __init__(self, prefix='dash_gantt', max_response_bytes=None,
+                 duration_buckets=DURATION_BUCKETS, size_buckets=SIZE_BUCKETS,
+                 row_buckets=ROW_BUCKETS):
+        self.prefix = prefix
+        self.max_response_bytes = max_response_bytes
+
+        buckets = {
+            'duration': tuple(sorted(duration_buckets)),
+            'size': tuple(sorted(size_buckets)),
+            'rows': tuple(sorted(row_buckets)),
+        }
+        self._metrics = {
+            name: (buckets[kind], help_text)
+            for name, (kind, help_text) in self.METRICS.items()
+        }
+
+        self._callbacks = {}
+        self._lock = threading.RLock()
+
+    def _callback(self, name):
+        entry = self._callbacks.get(name)
+        if entry is None:
+            entry = self._callbacks[name] = _Callback(self._metrics)
+        return entry
+
+    def _observe(self, name, **values):
+        with self._lock:
+            entry = self._callback(name)
+            if 'callback_duration_seconds' in values:
+                entry.calls += 1
+            for metric, value in values.items():
+                if value is not None:
+                    entry.histograms[metric].observe(value)
+            return entry
+
+    def instrument(self, func=None, name=None):
+        """
+        Decorator recording the metrics of a callback under `name` (the
+        function name by default). Apply it below `@callback`.
+        """
+        if func is None:
+            return functools.partial(self.instrument, name=name)
+
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if flask.has_request_context():
+                setattr(flask.g, _CALLBACK, label)
+
+            started = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except PreventUpdate:
+                self._observe(label, callback_duration_seconds=time.perf_counter() - started)
+                raise
+            except Exception:
+                entry = self._observe(label, callback_duration_seconds=time.perf_counter() - started)
+                with self._lock:
+                    entry.errors += 1
+                raise
+
+            self._observe(
+                label,
+                callback_duration_seconds=time.perf_counter() - started,
+                input_rows=count_rows(args) + count_rows(list(kwargs.values())),
+                output_rows=count_rows(result),
+            )
+            return result
+
+        return wrapper
+
+    def init_app(self, app, path='/metrics'):
+        """
+        Attach to a Dash app (or its Flask server): measure callback
+        requests and serve the metrics at `path`.
+        """
+        server = getattr(app, 'server', app)
+
+        @server.before_request
+        def _start_timer():
+            setattr(flask.g, _STARTED, time.perf_counter())
+
+        @server.after_request
+        def _record_request(response):
+            label = getattr(flask.g, _CALLBACK, None)
+            if label is None:
+                return response
+
+            started = getattr(flask.g, _STARTED, None)
+            size = None if response.is_streamed else response.calculate_content_length()
+            entry = self._observe(
+                label,
+                request_duration_seconds=None if started is None else time.perf_counter() - started,
+                request_bytes=flask.request.content_length,
+                response_bytes=size,
+            )
+
+            if self.max_response_bytes is not None and size is not None and size > self.max_response_bytes:
+                with self._lock:
+                    entry.oversized += 1
+                logger.warning(
+                    "Callback %s returned %d bytes (limit %d)", label, size, self.max_response_bytes
+                )
+            return response
+
+        server.add_url_rule(path, f'{self.prefix}_metrics', self._serve)
+        return server
+
+    def _serve(self):
+        return flask.Response(self.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+    def render(self):
+        """Return all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            callbacks = sorted(self._callbacks.items())
+            lines = []
+
+            counters = (
+                ('callback_calls_total', 'calls', 'Callback calls, including failed and prevented ones.'),
+                ('callback_errors_total', 'errors', 'Callback calls that raised an exception.'),
+                ('oversized_responses_total', 'oversized', 'Responses larger than max_response_bytes.'),
+            )
+            for metric, attribute, help_text in counters:
+                name = f'{self.prefix}_{metric}'
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} counter')
+                for label, entry in callbacks:
+                    lines.append(f'{name}{{callback="{_escape(label)}"}} {getattr(entry, attribute)}')
+
+            for metric, (_, help_text) in self._metrics.items():
+                name = f'{self.prefix}_{metric}'
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} histogram')
+                for label, entry in callbacks:
+                    lines.extend(entry.histograms[metric].lines(name, f'callback="{_escape(label)}"'))
+
+        return '\n'.join(lines) + '\n'
+
+    def clear(self):
+        """Drop all recorded metrics."""
+        with self._lock:
+            self._callbacks.clear()
+
+    def stats(self):
+        """
+        Return the metrics as a dict of callback name -> counters, with the
+        count, sum and mean of every histogram.
+        """
+        with self._lock:
+            result = {}
+            for label, entry in self._callbacks.items():
+                values = {'calls': entry.calls, 'errors': entry.errors, 'oversized': entry.oversized}
+                for metric, histogram in entry.histograms.items():
+                    count = histogram.count
+                    values[metric] = {
+                        'count': count,
+                        'sum': histogram.sum,
+                        'mean': histogram.sum / count if count else None,
+                    }
+                result[label] = values
+            return result
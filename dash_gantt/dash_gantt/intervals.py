@@ -0,0 +1,151 @@
+"""
+Sorted interval index of the slots of every professional.
+
+`IntervalIndex` merges the slots of each professional into sorted, disjoint
+busy intervals, so checking a range for overlaps is a binary search and
+free time of all professionals is found in one vectorized pass instead of
+a scan over the rows per professional:
+
+    index = IntervalIndex(schedule.select('2024-01-01'))
+    index.overlaps('Dr. A', '2024-01-01 08:00', '2024-01-01 08:20')
+    index.next_free(20, '2024-01-01 08:00', '2024-01-01 16:00')
+
+Both booked and available slots are busy time by default; with
+`booked_only=True` available slots count as free, which finds bookable
+time instead of room for new slots.
+"""
+import numpy as np
+import pandas as pd
+
+from .occupancy import _slot_arrays
+
+# Busy intervals of all professionals live on one axis: professional codes
+# are spaced this many minutes apart, more than any epoch minute
+CODE_SPACING = 1 << 32
+
+GAP_COLUMNS = ('laakari', 'start', 'end', 'minutes')
+
+
+def _to_minutes(value):
+    """Minutes since the epoch of a "YYYY-MM-DD HH:MM" datetime (or array of them)."""
+    return np.asarray(value, dtype='datetime64[m]').astype(np.int64)
+
+
+def _to_datetimes(minutes):
+    return [value.replace('T', ' ') for value in np.datetime_as_string(minutes.astype('datetime64[m]'))]
+
+
+class IntervalIndex:
+    """
+    Busy intervals per professional. `data` is anything
+    `dash_gantt.occupancy.occupancy_frame` accepts: a `Schedule`, a
+    DataFrame of rawData columns or rawData in either format. Only the
+    professionals with slots in `data` are known to the index.
+
+    The index is immutable; build a new one after the schedule changes.
+    """
+
+    def __init__(self, data, booked_only=False):
+        starts, durations, booked, _, codes, names = _slot_arrays(data)
+        # Only professionals with slots, e.g. not every category of a Schedule
+        present, codes = np.unique(codes, return_inverse=True)
+        codes = codes.reshape(-1).astype(np.int64)
+        self.names = [names[code] for code in present]
+        self._codes = {name: code for code, name in enumerate(self.names)}
+
+        keep = booked if booked_only else np.ones(len(starts), dtype=bool)
+        starts = codes[keep] * CODE_SPACING + starts[keep]
+        ends = starts + np.maximum(durations[keep], 0)
+
+        # Merge overlapping and touching slots: a busy interval starts where
+        # no earlier slot (of the same professional) reaches
+        order = np.argsort(starts, kind='stable')
+        starts, ends = starts[order], ends[order]
+        reach = np.maximum.accumulate(ends) if len(ends) else ends
+        first = np.ones(len(starts), dtype=bool)
+        first[1:] = starts[1:] > reach[:-1]
+        blocks = np.cumsum(first) - 1
+
+        self._starts = starts[first]
+        self._ends = np.zeros(len(self._starts), dtype=np.int64)
+        np.maximum.at(self._ends, blocks, ends)
+
+    def __len__(self):
+        """Number of busy intervals."""
+        return len(self._starts)
+
+    def _code(self, laakari):
+        try:
+            return self._codes[laakari]
+        except KeyError:
+            raise KeyError(f"Unknown professional: {laakari}") from None
+
+    def overlaps(self, laakari, start, end):
+        """
+        Whether `start`..`end` ("YYYY-MM-DD HH:MM") overlaps a busy interval
+        of `laakari`, by binary search. Unknown professionals are free.
+        """
+        if laakari not in self._codes:
+            return False
+        offset = self._codes[laakari] * CODE_SPACING
+        start, end = offset + _to_minutes(start), offset + _to_minutes(end)
+        position = np.searchsorted(self._starts, end, side='left')
+        return bool(position and self._ends[position - 1] > start)
+
+    def free_gaps(self, minutes, start, end, laakari=None):
+        """
+        Return the free gaps of at least `minutes` minutes between `start`
+        and `end` ("YYYY-MM-DD HH:MM") of every professional, or only of
+        those listed in `laakari`.
+
+        Returns a DataFrame with the columns `laakari`, `start`, `end` (as
+        "YYYY-MM-DD HH:MM") and `minutes`, sorted by professional and time.
+        """
+        if minutes <= 0:
+            raise ValueError("minutes must be positive")
+        window_start, window_end = _to_minutes(start), _to_minutes(end)
+        if window_end <= window_start:
+            raise ValueError("end must be after start")
+
+        if laakari is None:
+            codes = np.arange(len(self.names), dtype=np.int64)
+        else:
+            codes = np.array([self._code(name) for name in laakari], dtype=np.int64)
+        offsets = codes * CODE_SPACING
+
+        # Busy intervals inside the window, between zero-length intervals
+        # at both edges of the window of each professional
+        busy_codes = self._starts // CODE_SPACING
+        busy_starts = np.maximum(self._starts, busy_codes * CODE_SPACING + window_start)
+        busy_ends = np.minimum(self._ends, busy_codes * CODE_SPACING + window_end)
+        inside = (busy_ends > busy_starts) & np.isin(busy_codes, codes)
+        edges = np.concatenate([offsets + window_start, offsets + window_end])
+        starts = np.concatenate([busy_starts[inside], edges])
+        ends = np.concatenate([busy_ends[inside], edges])
+        # The edge at the window start sorts before a busy interval there
+        order = np.lexsort((ends, starts))
+        starts, ends = starts[order], ends[order]
+
+        gap_starts, gap_ends = ends[:-1], starts[1:]
+        found = (gap_ends - gap_starts >= minutes) & (gap_starts // CODE_SPACING == gap_ends // CODE_SPACING)
+        gap_starts, gap_ends = gap_starts[found], gap_ends[found]
+        gap_codes = gap_starts // CODE_SPACING
+
+        return pd.DataFrame({
+            'laakari': np.asarray(self.names, dtype=object)[gap_codes] if len(self.names) else np.empty(0, dtype=object),
+            'start': _to_datetimes(gap_starts - gap_codes * CODE_SPACING),
+            'end': _to_datetimes(gap_ends - gap_codes * CODE_SPACING),
+            'minutes': gap_ends - gap_starts,
+        }, columns=list(GAP_COLUMNS))
+
+    def next_free(self, minutes, start, end, laakari=None):
+        """
+        Return the earliest free `minutes` of every professional between
+        `start` and `end`, like `free_gaps` but with one row per
+        professional that has room, whose `end` is `start + minutes`.
+        """
+        gaps = self.free_gaps(minutes, start, end, laakari=laakari)
+        first = gaps.drop_duplicates('laakari').reset_index(drop=True)
+        first['end'] = _to_datetimes(_to_minutes(first['start'].to_numpy(dtype=str)) + minutes)
+        first['minutes'] = minutes
+        return first
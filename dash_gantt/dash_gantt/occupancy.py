@@ -0,0 +1,119 @@
+"""
+Hourly occupancy of every professional, for zoomed-out views of DashGantt.
+
+At overview zoom a rectangle per appointment is too small to read and costs
+a DOM node per slot. `occupancy` bins the slots per professional and hour
+with NumPy instead: the minutes booked (`tyhja == 0`), the minutes available
+and the expected minutes, the available minutes weighted by
+`bookingProbability`. A slot spanning several hours is split between them.
+The result is in the format of the `occupancy` prop of DashGantt, with one
+entry per professional and hour that has slots, so its size depends on the
+number of professionals and hours but not on the number of appointments.
+"""
+import numpy as np
+import pandas as pd
+
+from .data import frame_to_columns, raw_data_to_frame
+from .schedule import Schedule
+
+# Probability of slots without bookingProbability, as in DashGantt
+DEFAULT_PROBABILITY = 0.5
+
+BIN_COLUMNS = ('date', 'hour', 'laakari', 'booked', 'available', 'expected')
+
+# Expected minutes are sent with this many decimals
+EXPECTED_DECIMALS = 2
+
+
+def _slot_arrays(data):
+    """
+    Return the start (minutes since the epoch), duration, booked flag,
+    probability and professional code of every slot, and the professional
+    names the codes refer to.
+    """
+    if isinstance(data, Schedule):
+        records = data.records
+        names = np.asarray(data.categories('laakari'), dtype=object)
+        return (
+            records['start'].astype(np.int64),
+            records['kesto_min'].astype(np.int64),
+            ~records['tyhja'],
+            records['bookingProbability'].astype(np.float64),
+            records['laakari'].astype(np.int64),
+            names,
+        )
+
+    frame = data if isinstance(data, pd.DataFrame) else raw_data_to_frame(data)
+    if not len(frame):
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0, dtype=bool), np.empty(0), empty, np.empty(0, dtype=object)
+    for column in ('datetime', 'laakari', 'kesto_min', 'tyhja'):
+        if column not in frame.columns:
+            raise KeyError(f"Missing required column: {column}")
+
+    codes, names = pd.factorize(frame['laakari'].to_numpy(), sort=True)
+    if 'bookingProbability' in frame.columns:
+        probabilities = pd.to_numeric(frame['bookingProbability'], errors='coerce').to_numpy(dtype=np.float64)
+    else:
+        probabilities = np.full(len(frame), np.nan)
+    return (
+        np.asarray(frame['datetime'].to_numpy(dtype=str), dtype='datetime64[m]').astype(np.int64),
+        frame['kesto_min'].to_numpy(dtype=np.int64),
+        frame['tyhja'].to_numpy() == 0,
+        probabilities,
+        codes.astype(np.int64),
+        np.asarray(names, dtype=object),
+    )
+
+
+def occupancy_frame(data, decimals=EXPECTED_DECIMALS):
+    """
+    Bin slots per professional and hour. `data` is a `Schedule`, a
+    DataFrame of rawData columns (e.g. from `ScheduleIndex.frame`) or
+    rawData in either format.
+
+    Returns a DataFrame with the columns `date` ("YYYY-MM-DD"), `hour`
+    (0-23), `laakari`, and the `booked`, `available` and `expected` minutes
+    of that hour, sorted by professional and time. Hours without slots are
+    left out. Expected minutes are rounded to `decimals`, unless it is None.
+    """
+    starts, durations, booked, probabilities, codes, names = _slot_arrays(data)
+    probabilities = np.where(np.isnan(probabilities), DEFAULT_PROBABILITY, probabilities)
+
+    # Split every slot into pieces of whole clock hours
+    ends = starts + np.maximum(durations, 0)
+    first = starts // 60
+    pieces = (np.maximum(ends, starts + 1) - 1) // 60 - first + 1
+    slot = np.repeat(np.arange(len(starts)), pieces)
+    offsets = np.arange(len(slot)) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+    hours = first[slot] + offsets
+    minutes = np.minimum(ends[slot], (hours + 1) * 60) - np.maximum(starts[slot], hours * 60)
+
+    keys, bins = np.unique(np.stack([codes[slot], hours]), axis=1, return_inverse=True)
+    bins = bins.ravel()
+    free = np.where(booked[slot], 0, minutes)
+
+    def total(weights):
+        return np.bincount(bins, weights=weights, minlength=keys.shape[1])
+
+    expected = total(free * probabilities[slot])
+    if decimals is not None:
+        expected = expected.round(decimals)
+
+    return pd.DataFrame({
+        'date': np.datetime_as_string((keys[1] // 24).astype('datetime64[D]')),
+        'hour': keys[1] % 24,
+        'laakari': names[keys[0]] if len(names) else np.empty(0, dtype=object),
+        'booked': total(minutes - free).astype(np.int64),
+        'available': total(free).astype(np.int64),
+        'expected': expected,
+    }, columns=list(BIN_COLUMNS))
+
+
+def occupancy(data):
+    """
+    Return the hourly occupancy of `data` (see `occupancy_frame`) as the
+    `occupancy` prop of DashGantt: columnar, with the dates and
+    professionals dictionary-encoded.
+    """
+    return frame_to_columns(occupancy_frame(data), encode=('date', 'laakari'))
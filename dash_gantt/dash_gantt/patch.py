@@ -0,0 +1,113 @@
+"""
+Apply the `rawDataPatch` edits reported by DashGantt to server-side data.
+
+With `updateMode='patch'` DashGantt does not send the whole rawData back
+after an edit. Instead it sets `rawDataPatch` to
+
+    {
+        'sequence': 3,
+        'added': [row, ...],     # new rows, ids generated in the browser
+        'modified': [row, ...],  # complete rows after the edit
+        'removed': [id, ...],
+    }
+
+where every row is in the rawData format and carries its `id`. Rows that
+came without an `id` are identified by their position in rawData.
+"""
+from collections.abc import MutableMapping
+
+import pandas as pd
+
+
+def _rows_by_id(rows, keep_id):
+    return {
+        row['id']: {key: value for key, value in row.items() if keep_id or key != 'id'}
+        for row in rows
+    }
+
+
+def _apply_to_frame(frame, patch):
+    # The id is the index; it is only written as a column if the frame has one
+    keep_id = 'id' in frame.columns
+
+    removed = [row_id for row_id in patch.get('removed', []) if row_id in frame.index]
+    if removed:
+        frame.drop(index=removed, inplace=True)
+
+    modified = _rows_by_id(patch.get('modified', []), keep_id)
+    known = {row_id: row for row_id, row in modified.items() if row_id in frame.index}
+    if known:
+        updates = pd.DataFrame.from_dict(known, orient='index')
+        for column in updates.columns:
+            frame.loc[updates.index, column] = updates[column]
+
+    # Modified rows the frame does not know about are treated as additions
+    added = {row_id: row for row_id, row in modified.items() if row_id not in known}
+    added.update(_rows_by_id(patch.get('added', []), keep_id))
+    if added:
+        # One concat for all added rows rather than enlarging the frame row by
+        # row. Its result replaces the data of `frame`, so the patch is still
+        # applied in place. A numeric id column becomes object if the browser
+        # generated string ids.
+        rows = pd.DataFrame.from_dict(added, orient='index')
+        rows.index.name = frame.index.name
+        frame._update_inplace(pd.concat([frame, rows]))
+
+
+def _apply_to_mapping(store, patch):
+    for row_id in patch.get('removed', []):
+        store.pop(row_id, None)
+    for row in patch.get('modified', []):
+        store.setdefault(row['id'], {}).update(row)
+    for row in patch.get('added', []):
+        store[row['id']] = dict(row)
+
+
+def _apply_to_records(records, patch):
+    # Rows without an id are identified by their position before the patch
+    row_ids = [row.get('id', position) for position, row in enumerate(records)]
+
+    modified = {row['id']: row for row in patch.get('modified', [])}
+    if modified:
+        positions = {row_id: position for position, row_id in enumerate(row_ids)}
+        for row_id, row in modified.items():
+            if row_id in positions:
+                records[positions.pop(row_id)].update(row)
+            else:
+                records.append(dict(row))
+                row_ids.append(row_id)
+
+    removed = set(patch.get('removed', []))
+    if removed:
+        records[:] = [row for row, row_id in zip(records, row_ids) if row_id not in removed]
+
+    records.extend(dict(row) for row in patch.get('added', []))
+
+
+def apply_patch(target, patch):
+    """
+    Apply a `rawDataPatch` to `target` in place and return it.
+
+    `target` may be
+    - a DataFrame with rawData columns indexed by row id (e.g. the frames
+      of `ScheduleIndex`, or `to_raw_data` input with `with_ids=True`);
+      removing or adding rows makes pandas copy the frame once per patch,
+      so prefer a mapping for large data that is edited often,
+    - a mutable mapping of row id -> rawData row, also proportional to the
+      size of the patch,
+    - a list of rawData rows, which needs one pass over the list to locate
+      modified rows.
+    """
+    if not patch:
+        return target
+
+    if isinstance(target, pd.DataFrame):
+        _apply_to_frame(target, patch)
+    elif isinstance(target, MutableMapping):
+        _apply_to_mapping(target, patch)
+    elif isinstance(target, list):
+        _apply_to_records(target, patch)
+    else:
+        raise TypeError(f"Cannot apply a patch to {type(target).__name__}")
+
+    return target
@@ -0,0 +1,339 @@
+"""
+Compact in-memory schedules backed by a NumPy structured array.
+
+A DataFrame of Python strings (or a list of rawData dicts) costs a few
+hundred bytes per slot. `Schedule` stores every slot as one fixed-size
+record instead: the start as minutes since the epoch, small integers for the
+durations and codes, a bool for `tyhja` and a float32 probability. String
+columns are dictionary-encoded, so every doctor or clinic name is stored
+once. Slots are sorted by start time, which makes selecting a date a binary
+search and a slice of the array rather than a scan.
+
+A schedule saved with `Schedule.save` can be opened with `Schedule.load` as
+a read-only memory map, so every worker process of a server shares one
+physical copy through the page cache instead of loading its own.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .data import (
+    ENCODED_COLUMNS,
+    STRING_COLUMNS,
+    format_datetimes,
+    frame_to_records,
+    prepare_frame,
+    raw_data_to_frame,
+    report_bad_rows,
+    _values,
+)
+
+MINUTES_PER_DAY = 24 * 60
+
+# rawData key -> field type of the numeric columns
+NUMERIC_FIELDS = {
+    'kesto_min': np.int16,
+    'ETNS_A': np.int16,
+    'ETNS_B': np.int16,
+}
+
+# String columns stored as codes into a per-schedule table of categories
+CATEGORY_COLUMNS = tuple(STRING_COLUMNS.values())
+
+DTYPE = np.dtype(
+    [
+        ('id', np.int64),
+        ('start', np.int32),
+        ('tyhja', np.bool_),
+        ('bookingProbability', np.float32),
+    ]
+    + [(key, dtype) for key, dtype in NUMERIC_FIELDS.items()]
+    + [(key, np.int32) for key in CATEGORY_COLUMNS]
+)
+
+# Files of a saved schedule
+RECORDS_FILE = 'records.npy'
+METADATA_FILE = 'schedule.json'
+FORMAT_VERSION = 1
+
+# Probabilities are float32; rounding on the way out gives back the values
+# that went in (e.g. 0.82 instead of 0.8199999928474426)
+PROBABILITY_DECIMALS = 6
+
+
+def _minutes(values):
+    """Convert datetime strings or datetime64 values to minutes since the epoch."""
+    return np.asarray(values, dtype='datetime64[m]').astype(np.int64)
+
+
+def _decode(categories, codes):
+    """
+    Look up the values of category `codes`. Missing values have code -1,
+    which indexes the None appended after the categories.
+    """
+    return np.append(categories, None)[codes]
+
+
+def _narrow(values, dtype, name):
+    """Cast integer values to `dtype`, refusing values that don't fit."""
+    values = np.asarray(values)
+    info = np.iinfo(dtype)
+    if len(values) and (values.min() < info.min or values.max() > info.max):
+        raise ValueError(f"{name} values must be between {info.min} and {info.max}")
+    return values.astype(dtype)
+
+
+class Schedule:
+    """
+    Immutable table of slots, sorted by start time.
+
+    Build one with `from_frame` (source data with the columns of
+    `chatgpt-01.csv`) or `from_raw_data` (rawData in either format). Rows
+    need integer ids, which become the `id` of every rawData row; rawData
+    without ids is numbered by position. Converting back with `to_raw_data`
+    returns the same rows, ordered by start time. Only the rawData columns
+    DashGantt knows are kept; additional fields are dropped.
+
+    `select` and `raw_data` filter by date and by any column and share the
+    records and category tables of the schedule they come from: a date is a
+    view into the array, not a copy. The records are never written to, so a
+    schedule can be shared by any number of threads.
+    """
+
+    def __init__(self, records, categories, columns):
+        records.flags.writeable = False
+        self._records = records
+        self._categories = categories
+        self.columns = tuple(columns)
+
+        # Value -> code of every category table, shared by derived schedules
+        self._codes = {
+            column: {value: code for code, value in enumerate(values.tolist())}
+            for column, values in categories.items()
+        }
+
+    @classmethod
+    def from_frame(cls, data, errors='skip'):
+        """
+        Build a schedule from source data, as accepted by
+        `dash_gantt.data.to_raw_data`. Rows that cannot be converted are
+        reported (see `dash_gantt.data.report_bad_rows`) and left out. The
+        index labels of the rows become their ids.
+        """
+        frame, bad_index = prepare_frame(data, with_ids=True)
+        report_bad_rows(bad_index, errors)
+        return cls._from_prepared(frame)
+
+    @classmethod
+    def from_raw_data(cls, raw_data):
+        """Build a schedule from rawData rows or columnar rawData."""
+        frame = raw_data_to_frame(raw_data)
+        if 'id' not in frame.columns:
+            frame.insert(0, 'id', np.arange(len(frame)))
+        return cls._from_prepared(frame)
+
+    @classmethod
+    def _from_prepared(cls, frame):
+        for column in ('datetime', 'laakari', 'kesto_min', 'tyhja'):
+            if column not in frame.columns:
+                raise KeyError(f"Missing required column: {column}")
+
+        ids = pd.to_numeric(frame['id'], errors='coerce')
+        if ids.isna().any() or (ids % 1 != 0).any():
+            raise ValueError("Schedule rows need integer ids")
+
+        starts = _minutes(frame['datetime'].to_numpy())
+        order = np.argsort(starts, kind='stable')
+
+        records = np.zeros(len(frame), dtype=DTYPE)
+        records['id'] = ids.to_numpy(dtype=np.int64)[order]
+        records['start'] = _narrow(starts[order], np.int32, 'datetime')
+        records['tyhja'] = frame['tyhja'].to_numpy()[order] != 0
+
+        if 'bookingProbability' in frame.columns:
+            probabilities = pd.to_numeric(frame['bookingProbability'], errors='coerce')
+            records['bookingProbability'] = probabilities.to_numpy(dtype=np.float32)[order]
+        else:
+            records['bookingProbability'] = np.nan
+
+        for key, dtype in NUMERIC_FIELDS.items():
+            if key in frame.columns:
+                records[key] = _narrow(frame[key].to_numpy(dtype=np.int64)[order], dtype, key)
+
+        categories = {}
+        for key in CATEGORY_COLUMNS:
+            if key in frame.columns:
+                codes, values = pd.factorize(frame[key].to_numpy()[order], sort=True)
+                records[key] = codes
+                categories[key] = np.asarray(values, dtype=object)
+            else:
+                records[key] = -1
+
+        columns = [key for key in frame.columns if key in records.dtype.names or key == 'datetime']
+        return cls(records, categories, columns)
+
+    def save(self, path):
+        """
+        Write the schedule to the directory `path` for `Schedule.load`. The
+        directory is created if needed but must not hold a saved schedule
+        already: workers may have it mapped, so save a new version to a new
+        directory instead.
+        """
+        metadata_path = os.path.join(path, METADATA_FILE)
+        if os.path.exists(metadata_path):
+            raise FileExistsError(f"{path} already holds a schedule")
+
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, RECORDS_FILE), np.ascontiguousarray(self._records))
+
+        # The metadata is written last, so a directory with metadata is complete
+        metadata = {
+            'version': FORMAT_VERSION,
+            'columns': list(self.columns),
+            'categories': {key: values.tolist() for key, values in self._categories.items()},
+        }
+        with open(metadata_path, 'w', encoding='utf-8') as handle:
+            json.dump(metadata, handle, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Open a schedule written by `save`. With `mmap=True` the records are
+        memory-mapped read-only instead of read: opening costs nothing but
+        the category tables, pages are loaded on first access and processes
+        mapping the same file share them.
+        """
+        with open(os.path.join(path, METADATA_FILE), encoding='utf-8') as handle:
+            metadata = json.load(handle)
+        if metadata.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported schedule format version: {metadata.get('version')}")
+
+        records = np.load(os.path.join(path, RECORDS_FILE), mmap_mode='r' if mmap else None)
+        if records.dtype != DTYPE:
+            raise ValueError("Saved records do not match the Schedule layout")
+
+        categories = {
+            key: np.asarray(values, dtype=object)
+            for key, values in metadata['categories'].items()
+        }
+        return cls(records, categories, metadata['columns'])
+
+    def _derive(self, records):
+        derived = object.__new__(Schedule)
+        derived._records = records
+        derived._categories = self._categories
+        derived._codes = self._codes
+        derived.columns = self.columns
+        return derived
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, date):
+        start, stop = self._day_bounds(date)
+        return stop > start
+
+    @property
+    def records(self):
+        """The underlying structured array (read-only)."""
+        return self._records
+
+    @property
+    def nbytes(self):
+        """Memory used by the records (category tables are not counted)."""
+        return self._records.nbytes
+
+    @property
+    def dates(self):
+        """Sorted list of the dates ("YYYY-MM-DD") that have slots."""
+        days = self._records['start'] // MINUTES_PER_DAY
+        if not len(days):
+            return []
+        # Starts are sorted, so a new date begins wherever the day changes
+        firsts = days[np.flatnonzero(np.diff(days, prepend=days[0] - 1))]
+        return np.datetime_as_string(firsts.astype('datetime64[D]')).tolist()
+
+    def categories(self, column):
+        """Return the distinct values of a string column, e.g. the doctors."""
+        if column not in self._categories:
+            raise KeyError(f"Not a string column of this schedule: {column}")
+        return self._categories[column].tolist()
+
+    def _day_bounds(self, date):
+        day = int(_minutes(np.datetime64(date, 'D')))
+        return np.searchsorted(self._records['start'], [day, day + MINUTES_PER_DAY]).tolist()
+
+    def between(self, start, end):
+        """Return the slots starting in [start, end) as a schedule."""
+        bounds = np.searchsorted(self._records['start'], [int(_minutes(start)), int(_minutes(end))])
+        return self._derive(self._records[bounds[0]:bounds[1]])
+
+    def select(self, date=None, **filters):
+        """
+        Return the slots of `date` (if given) matching `filters` as a
+        schedule. Filters compare rawData columns with a value or, for a
+        list, tuple or set, with any of its values, e.g.
+        `select('2024-01-01', laakari=['Dr. A', 'Dr. B'], tyhja=1)`.
+        """
+        records = self._records
+        if date is not None:
+            start, stop = self._day_bounds(date)
+            records = records[start:stop]
+
+        for column, value in filters.items():
+            values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+            if column in self._codes:
+                lookup = self._codes[column]
+                values = [lookup[item] for item in values if item in lookup]
+            elif column not in records.dtype.names or column == 'start':
+                raise KeyError(f"Cannot filter on unknown column: {column}")
+            records = records[np.isin(records[column], values)]
+
+        return self._derive(records)
+
+    def _column(self, key):
+        records = self._records
+        if key == 'datetime':
+            return format_datetimes(records['start'].astype('datetime64[m]'))
+        if key in self._categories:
+            return _decode(self._categories[key], records[key])
+        if key == 'bookingProbability':
+            return records[key].astype(np.float64).round(PROBABILITY_DECIMALS)
+        return records[key].astype(np.int64)
+
+    def to_frame(self):
+        """Return the slots as a DataFrame of rawData columns."""
+        return pd.DataFrame({key: self._column(key) for key in self.columns}, columns=list(self.columns))
+
+    def to_raw_data(self, orient='records'):
+        """
+        Return the slots as rawData: a list of dicts (`orient='records'`)
+        or the columnar format (`orient='columns'`), whose encoded columns
+        are built from the stored codes without looking at the strings.
+        """
+        if orient not in ('records', 'columns'):
+            raise ValueError("orient must be either 'records' or 'columns'")
+
+        if orient == 'records':
+            return frame_to_records(self.to_frame())
+
+        columns = {}
+        for key in self.columns:
+            if key in ENCODED_COLUMNS and key in self._categories:
+                used, codes = np.unique(self._records[key], return_inverse=True)
+                columns[key] = {
+                    'categories': _decode(self._categories[key], used).tolist(),
+                    'codes': codes.tolist(),
+                }
+            else:
+                columns[key] = _values(pd.Series(self._column(key)))
+        return columns
+
+    def raw_data(self, date, orient='records', **filters):
+        """
+        Return the rows of `date` matching `filters` as rawData, like
+        `ScheduleIndex.raw_data`.
+        """
+        return self.select(date, **filters).to_raw_data(orient)
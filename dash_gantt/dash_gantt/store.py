@@ -0,0 +1,172 @@
+"""
+Date-partitioned Parquet or Arrow IPC storage of appointment data.
+
+`convert_csv` turns a CSV export with the columns of `chatgpt-01.csv` into a
+directory with one sub-directory per date (`date=YYYY-MM-DD`, the Hive
+layout), holding the rawData columns. `ScheduleStore` opens such a directory
+without reading it: the available dates come from the directory names, and
+a lookup reads only the files of the requested date, only the requested
+columns and, with Parquet, only the row groups whose statistics match the
+filters. Start-up time and memory no longer depend on the size of the
+history.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from .data import format_datetimes, frame_to_columns, frame_to_records, prepare_frame, report_bad_rows
+
+FORMATS = {'parquet': 'parquet', 'arrow': 'ipc'}
+
+PARTITION_PREFIX = 'date='
+
+
+def _datetime_key(value):
+    """Format a date or datetime as the "YYYY-MM-DD HH:MM" rawData string."""
+    return str(format_datetimes(np.datetime64(pd.Timestamp(value), 'm')))
+
+
+def _expression(filters):
+    """Build an Arrow filter from column=value or column=[values] pairs."""
+    expression = None
+    for column, value in filters.items():
+        if isinstance(value, (list, tuple, set)):
+            condition = pc.field(column).isin(list(value))
+        else:
+            condition = pc.field(column) == value
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def convert_csv(source, target, format='parquet', chunksize=500_000, errors='skip'):
+    """
+    Convert a CSV export to a date-partitioned dataset in `target`, which
+    must not exist yet or be empty. The CSV is read in chunks of
+    `chunksize` rows, so files larger than memory can be converted. Rows
+    that cannot be converted are reported like in `to_raw_data`. Every row
+    gets its line number in the CSV (starting at 0) as `id`.
+
+    Returns the number of rows written.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+    if os.path.isdir(target) and os.listdir(target):
+        raise FileExistsError(f"{target} is not empty")
+
+    written = 0
+    extension = 'parquet' if format == 'parquet' else 'arrow'
+    for number, chunk in enumerate(pd.read_csv(source, chunksize=chunksize)):
+        frame, bad_index = prepare_frame(chunk, with_ids=True)
+        report_bad_rows(bad_index, errors)
+
+        # Sorted rows give tight min/max statistics for predicate pushdown
+        frame = frame.sort_values(['datetime', 'id'], kind='stable')
+        frame['date'] = frame['datetime'].str.slice(0, 10)
+
+        ds.write_dataset(
+            pa.Table.from_pandas(frame, preserve_index=False),
+            target,
+            format=FORMATS[format],
+            partitioning=['date'],
+            partitioning_flavor='hive',
+            basename_template=f'part-{number}-{{i}}.{extension}',
+            existing_data_behavior='overwrite_or_ignore',
+        )
+        written += len(frame)
+    return written
+
+
+class ScheduleStore:
+    """
+    Lazy, read-only lookup of rawData rows in a dataset written by
+    `convert_csv`.
+
+    Nothing is read when the store is opened. `frame` and `raw_data` have
+    the same interface as `ScheduleIndex` and take an optional list of
+    `columns` to read; filters are pushed down to the file reader. All
+    methods are safe to call from several threads.
+    """
+
+    def __init__(self, path, format='parquet'):
+        if format not in FORMATS:
+            raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+        if not os.path.isdir(path):
+            raise FileNotFoundError(path)
+
+        self.path = path
+        self.format = format
+
+    @property
+    def dates(self):
+        """Sorted list of the dates ("YYYY-MM-DD") in the dataset."""
+        return sorted(
+            name[len(PARTITION_PREFIX):] for name in os.listdir(self.path)
+            if name.startswith(PARTITION_PREFIX)
+        )
+
+    def __contains__(self, date):
+        return os.path.isdir(self._directory(date))
+
+    def _directory(self, date):
+        return os.path.join(self.path, f'{PARTITION_PREFIX}{date}')
+
+    def _read(self, dates, columns, expression):
+        tables = []
+        for date in dates:
+            if date not in self:
+                continue
+            dataset = ds.dataset(self._directory(date), format=FORMATS[self.format])
+            tables.append(dataset.to_table(columns=columns, filter=expression))
+        if not tables:
+            return None
+        return pa.concat_tables(tables)
+
+    def _to_frame(self, table, columns):
+        if table is None:
+            return pd.DataFrame(columns=columns or [])
+        frame = table.to_pandas()
+        if 'datetime' in frame.columns:
+            sort_by = ['datetime', 'id'] if 'id' in frame.columns else ['datetime']
+            frame = frame.sort_values(sort_by, kind='stable', ignore_index=True)
+        return frame
+
+    def frame(self, date, columns=None, **filters):
+        """
+        Return the rows of `date` as a DataFrame of rawData columns (all
+        of them unless `columns` is given), e.g.
+        `frame('2024-01-01', laakari=['Dr. A', 'Dr. B'])`.
+        """
+        columns = None if columns is None else list(columns)
+        table = self._read([date], columns, _expression(filters))
+        return self._to_frame(table, columns)
+
+    def between(self, start, end, columns=None, **filters):
+        """
+        Return the rows starting in [start, end) as a DataFrame. Only the
+        dates in that range are read.
+        """
+        columns = None if columns is None else list(columns)
+        start, end = _datetime_key(start), _datetime_key(end)
+        dates = [date for date in self.dates if start[:10] <= date <= end[:10]]
+
+        expression = (pc.field('datetime') >= start) & (pc.field('datetime') < end)
+        extra = _expression(filters)
+        if extra is not None:
+            expression = expression & extra
+
+        return self._to_frame(self._read(dates, columns, expression), columns)
+
+    def raw_data(self, date, orient='records', columns=None, **filters):
+        """
+        Return the rows of `date` in the rawData format, as a list of dicts
+        (`orient='records'`) or in the columnar format (`orient='columns'`).
+        """
+        frame = self.frame(date, columns=columns, **filters)
+        if orient == 'columns':
+            return frame_to_columns(frame)
+        return frame_to_records(frame)
+
@@ -0,0 +1,176 @@
+"""
+Server-side aggregation of the `perfMetrics` reports of DashGantt.
+
+With `perfMetricsInterval` set, the component periodically reports samples
+of its render, transform, update and drag timings and of the payload sizes it
+sends back. A callback with `perfMetrics` as its input hands every report to
+a `PerfCollector`, which keeps a bounded window of recent samples per session
+and turns them into percentiles, so slow schedules can be spotted per
+customer.
+"""
+import threading
+from collections import OrderedDict, deque
+
+import numpy as np
+
+
+class _Session:
+    __slots__ = ('samples', 'reports', 'rows', 'slots', 'professionals',
+                 'dropped_frames', 'drag_frames')
+
+    def __init__(self):
+        self.samples = {}
+        self.reports = 0
+        self.rows = 0
+        self.slots = 0
+        self.professionals = 0
+        self.dropped_frames = 0
+        self.drag_frames = 0
+
+
+class PerfCollector:
+    """
+    Percentiles of DashGantt telemetry per session.
+
+    The last `max_samples` samples of every metric are kept per session,
+    and at most `max_sessions` sessions; the least recently reporting
+    sessions are dropped first. `reports` counts the reports added and
+    `evictions` the sessions dropped, both available through `stats()`.
+    All methods are thread-safe.
+    """
+
+    def __init__(self, max_samples=1000, max_sessions=1024):
+        if max_samples < 1:
+            raise ValueError("max_samples must be at least 1")
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+
+        self.max_samples = max_samples
+        self.max_sessions = max_sessions
+
+        self.reports = 0
+        self.evictions = 0
+
+        self._sessions = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def __contains__(self, session_id):
+        return session_id in self._sessions
+
+    def add(self, session_id, metrics):
+        """
+        Add a `perfMetrics` report of a session. Reports that are None (the
+        initial value of the prop) are ignored.
+        """
+        if metrics is None:
+            return
+        if not isinstance(metrics, dict):
+            raise TypeError(f"perfMetrics must be a dict, not {type(metrics).__name__}")
+
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = _Session()
+            else:
+                self._sessions.move_to_end(session_id)
+
+            for name, values in (metrics.get('samples') or {}).items():
+                window = session.samples.get(name)
+                if window is None:
+                    window = session.samples[name] = deque(maxlen=self.max_samples)
+                window.extend(float(value) for value in values)
+
+            session.reports += 1
+            session.rows = metrics.get('rows', session.rows)
+            session.slots = metrics.get('slots', session.slots)
+            session.professionals = metrics.get('professionals', session.professionals)
+            session.dropped_frames += metrics.get('droppedFrames', 0)
+            session.drag_frames += metrics.get('dragFrames', 0)
+            self.reports += 1
+
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evictions += 1
+
+    def _sessions_for(self, session_id):
+        if session_id is None:
+            return list(self._sessions.values())
+        if session_id not in self._sessions:
+            raise KeyError(f"No telemetry for session {session_id!r}")
+        return [self._sessions[session_id]]
+
+    def summary(self, session_id=None, percentiles=(50, 90, 99)):
+        """
+        Summarize the samples of one session, or of all sessions pooled.
+
+        Returns a dict with the latest `rows`, `slots` and `professionals`
+        (the largest across sessions when pooled), the `droppedFrames` and
+        `dragFrames` totals, and for every metric its sample `count`, `max`
+        and one `p<q>` entry per requested percentile.
+        """
+        with self._lock:
+            sessions = self._sessions_for(session_id)
+            pooled = {}
+            for session in sessions:
+                for name, window in session.samples.items():
+                    pooled.setdefault(name, []).extend(window)
+            result = {
+                'reports': sum(session.reports for session in sessions),
+                'rows': max((session.rows for session in sessions), default=0),
+                'slots': max((session.slots for session in sessions), default=0),
+                'professionals': max((session.professionals for session in sessions), default=0),
+                'droppedFrames': sum(session.dropped_frames for session in sessions),
+                'dragFrames': sum(session.drag_frames for session in sessions),
+            }
+
+        metrics = {}
+        for name, values in pooled.items():
+            if not values:
+                continue
+            samples = np.asarray(values, dtype=np.float64)
+            entry = {'count': len(samples), 'max': float(samples.max())}
+            for q, value in zip(percentiles, np.percentile(samples, percentiles).tolist()):
+                entry[f'p{q:g}'] = value
+            metrics[name] = entry
+        result['metrics'] = metrics
+        return result
+
+    def sessions_over(self, threshold, metric='render', percentile=95):
+        """
+        Return the sessions whose `percentile` of `metric` exceeds
+        `threshold`, as a dict of session id -> that percentile, slowest
+        first. Sessions without samples of the metric are left out.
+        """
+        with self._lock:
+            windows = {
+                session_id: list(session.samples[metric])
+                for session_id, session in self._sessions.items()
+                if session.samples.get(metric)
+            }
+
+        over = {}
+        for session_id, values in windows.items():
+            value = float(np.percentile(np.asarray(values, dtype=np.float64), percentile))
+            if value > threshold:
+                over[session_id] = value
+        return dict(sorted(over.items(), key=lambda item: item[1], reverse=True))
+
+    def clear(self, session_id=None):
+        """Drop the samples of all sessions, or of one session."""
+        with self._lock:
+            if session_id is None:
+                self._sessions.clear()
+            else:
+                self._sessions.pop(session_id, None)
+
+    def stats(self):
+        """Return the collector counters and current size as a dict."""
+        with self._lock:
+            return {
+                'reports': self.reports,
+                'evictions': self.evictions,
+                'sessions': len(self._sessions),
+            }
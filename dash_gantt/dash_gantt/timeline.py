@@ -0,0 +1,93 @@
+"""
+Server side of the multi-day timeline of DashGantt.
+
+With `days` greater than 1 the component shows consecutive days side by side
+and reports the part the user has scrolled to through its `viewport` prop.
+`viewport['missing']` lists the dates it needs but has not received, the
+visible ones first and then the neighbours it prefetches. A callback answers
+with the rawData of only those dates; the component merges it by date into
+the days it already holds and drops days far from the viewport, so scrolling
+through a month streams it in a few days at a time.
+
+Zoomed out below `detailPixelsPerHour`, the timeline shows hourly occupancy
+instead of slots and its viewport has `detail` set to 'occupancy'; the
+missing dates are then answered through the `occupancy` prop:
+
+    @callback(Output('gantt-chart', 'rawData'),
+              Output('gantt-chart', 'occupancy'),
+              Input('gantt-chart', 'viewport'))
+    def load_viewport(viewport):
+        raw_data = viewport_raw_data(schedule_store, viewport)
+        bins = viewport_occupancy(schedule_store, viewport)
+        if raw_data is None and bins is None:
+            raise PreventUpdate
+        return (no_update if raw_data is None else raw_data,
+                no_update if bins is None else bins)
+"""
+import pandas as pd
+
+from .data import frame_to_columns, raw_data_to_frame
+from .occupancy import occupancy_frame
+from .schedule import Schedule
+
+
+def missing_dates(viewport, detail='slots'):
+    """
+    Return the dates a `viewport` asks for at the level of `detail`
+    ('slots' or 'occupancy'), or an empty list.
+    """
+    if not viewport or viewport.get('detail', 'slots') != detail:
+        return []
+    return list(viewport.get('missing') or ())
+
+
+def viewport_raw_data(source, viewport, orient='records', **filters):
+    """
+    Return the rows of the dates missing from `viewport` (the `viewport`
+    prop of DashGantt) as rawData, nearest dates first. `source` is a
+    `ScheduleIndex`, `Schedule` or `ScheduleStore`, or anything else with
+    their `raw_data(date, orient, **filters)` method.
+
+    Returns None when the viewport asks for no slots, e.g. after it only
+    scrolled within the loaded days or while it shows occupancy, so the
+    callback can raise PreventUpdate instead of resending data.
+    """
+    if orient not in ('records', 'columns'):
+        raise ValueError("orient must be either 'records' or 'columns'")
+
+    dates = missing_dates(viewport, 'slots')
+    if not dates:
+        return None
+
+    rows = []
+    for date in dates:
+        rows.extend(source.raw_data(date, **filters))
+    if orient == 'columns':
+        return frame_to_columns(raw_data_to_frame(rows))
+    return rows
+
+
+def _day(source, date, filters):
+    """Read the slots of one date from `source` in a form occupancy_frame accepts."""
+    if isinstance(source, Schedule):
+        return source.select(date, **filters)
+    if hasattr(source, 'frame'):
+        return source.frame(date, **filters)
+    return source.raw_data(date, **filters)
+
+
+def viewport_occupancy(source, viewport, **filters):
+    """
+    Return the hourly occupancy (see `dash_gantt.occupancy`) of the dates
+    missing from a `viewport` that shows occupancy, for the `occupancy`
+    prop. `source` is as for `viewport_raw_data`; Schedules are binned
+    straight from their records.
+
+    Returns None when the viewport asks for no occupancy.
+    """
+    dates = missing_dates(viewport, 'occupancy')
+    if not dates:
+        return None
+
+    frame = pd.concat([occupancy_frame(_day(source, date, filters)) for date in dates], ignore_index=True)
+    return frame_to_columns(frame, encode=('date', 'laakari'))
@@ -0,0 +1,167 @@
+"""
+Utilization statistics of schedules.
+
+Utilization is the share of the scheduled minutes that are booked
+(`tyhja == 0`); expected utilization also counts the available minutes
+weighted by their `bookingProbability`. `utilization` computes both per
+doctor, date and/or hour in one vectorized pass over the hourly bins of
+`dash_gantt.occupancy`, so a slot crossing an hour counts towards both.
+
+`UtilizationTracker` keeps the hourly totals of one schedule and updates
+them from the `rawDataPatch` edits of DashGantt: only the rows a patch
+removes, replaces or adds are binned again. `summary` (and
+`UtilizationTracker.summary`) turn totals into the `summary` prop, which
+DashGantt displays as a column of per-doctor and a row of per-hour totals.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .occupancy import occupancy_frame
+
+METRICS = ('booked', 'available', 'expected')
+GROUPS = ('date', 'hour', 'laakari')
+
+# Hourly totals smaller than this many minutes are empty
+EPSILON = 1e-9
+
+
+def _bins(data):
+    """Hourly bins of `data`, indexed by date, hour and professional."""
+    return occupancy_frame(data, decimals=None).set_index(list(GROUPS))[list(METRICS)]
+
+
+def _aggregate(bins, by):
+    by = list(by)
+    unknown = [column for column in by if column not in GROUPS]
+    if unknown:
+        raise ValueError(f"Cannot group utilization by: {', '.join(unknown)}")
+
+    if by:
+        totals = bins.groupby(by, sort=True)[list(METRICS)].sum().reset_index()
+    else:
+        totals = bins[list(METRICS)].sum().to_frame().T.reset_index(drop=True)
+
+    capacity = (totals['booked'] + totals['available']).to_numpy(dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        totals['utilization'] = np.where(capacity > 0, totals['booked'] / capacity, np.nan)
+        totals['expected_utilization'] = np.where(
+            capacity > 0, (totals['booked'] + totals['expected']) / capacity, np.nan
+        )
+    return totals
+
+
+def utilization(data, by=('laakari',)):
+    """
+    Return the utilization of `data` (anything `occupancy_frame` accepts)
+    grouped by any of 'date', 'hour' and 'laakari', or in total for
+    `by=()`.
+
+    The DataFrame has the `by` columns, the `booked`, `available` and
+    `expected` minutes, and `utilization` and `expected_utilization` (NaN
+    for groups without minutes).
+    """
+    return _aggregate(_bins(data).reset_index(), by)
+
+
+def _entry(row):
+    def number(value):
+        return None if pd.isna(value) else round(float(value), 4)
+
+    return {
+        'booked': number(row['booked']),
+        'available': number(row['available']),
+        'expected': number(row['expected']),
+        'utilization': number(row['utilization']),
+        'expectedUtilization': number(row['expected_utilization']),
+    }
+
+
+def _summary(bins):
+    bins = bins.reset_index()
+    professionals = _aggregate(bins, ['laakari'])
+    hours = _aggregate(bins, ['hour'])
+    return {
+        'professionals': {
+            name: _entry(row) for name, row in zip(professionals['laakari'], professionals.to_dict('records'))
+        },
+        'hours': {str(hour): _entry(row) for hour, row in zip(hours['hour'], hours.to_dict('records'))},
+        'total': _entry(_aggregate(bins, []).iloc[0]),
+    }
+
+
+def summary(data):
+    """
+    Return the utilization of `data` as the `summary` prop of DashGantt:
+    `professionals` (name -> totals), `hours` (hour of day -> totals) and
+    the `total`, where totals are the `booked`, `available` and `expected`
+    minutes with `utilization` and `expectedUtilization`.
+    """
+    return _summary(_bins(data))
+
+
+class UtilizationTracker:
+    """
+    Hourly utilization totals of one schedule, kept up to date by patches.
+
+    `rows` are the rawData rows of the schedule (a list of dicts). They are
+    identified like in `rawDataPatch`: by their `id`, or by their position
+    if they have none. Applying a patch costs the size of the edit, not of
+    the schedule. All methods are thread-safe.
+    """
+
+    def __init__(self, rows=()):
+        # Copies, so rows patched in place elsewhere keep their old bins here
+        self._rows = {row.get('id', position): dict(row) for position, row in enumerate(rows)}
+        self._bins = _bins(list(self._rows.values()))
+        self.patches = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def apply_patch(self, patch):
+        """Update the totals with a `rawDataPatch`."""
+        if not patch:
+            return
+
+        with self._lock:
+            old, new = [], []
+            for row_id in patch.get('removed', []):
+                row = self._rows.pop(row_id, None)
+                if row is not None:
+                    old.append(row)
+            for row in patch.get('modified', []):
+                previous = self._rows.get(row['id'])
+                if previous is not None:
+                    old.append(previous)
+                updated = self._rows[row['id']] = {**(previous or {}), **row}
+                new.append(updated)
+            for row in patch.get('added', []):
+                added = self._rows[row['id']] = dict(row)
+                new.append(added)
+
+            delta = _bins(new).sub(_bins(old), fill_value=0)
+            totals = self._bins.add(delta, fill_value=0)
+            # Hours whose last slot was removed or moved away
+            keep = (totals['booked'].abs() > EPSILON) | (totals['available'].abs() > EPSILON)
+            self._bins = totals[keep]
+            self.patches += 1
+
+    def utilization(self, by=('laakari',)):
+        """Return the current utilization grouped `by`, like `utilization`."""
+        with self._lock:
+            bins = self._bins
+        return _aggregate(bins.reset_index(), by)
+
+    def summary(self):
+        """Return the current totals as the `summary` prop, like `summary`."""
+        with self._lock:
+            bins = self._bins
+        return _summary(bins)
+
+    def stats(self):
+        """Return the number of rows, hourly bins and applied patches as a dict."""
+        with self._lock:
+            return {'rows': len(self._rows), 'bins': len(self._bins), 'patches': self.patches}
@@ -1,47 +1,48 @@
 import dash_gantt
-from dash import Dash, callback, html, Input, Output, State, dcc
+from dash_gantt.background import ScoringJobs
+from dash_gantt.predict import FunctionModel, Scorer
+from dash import Dash, callback, html, Input, Output, State, dcc, no_update
+from concurrent.futures import ProcessPoolExecutor
+from prediction_model import predict_bookings
 import json
+import logging
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
+logger = logging.getLogger(__name__)
+
 # Sample data
-professionals = [
-    {"id": 1, "name": "John Doe"},
-    {"id": 2, "name": "Jane Smith"},
-    {"id": 3, "name": "Bob Johnson"}
-]
-
-# Generate some sample timeslots
-timeslots = []
-slot_id = 1
+professionals = ["John Doe", "Jane Smith", "Bob Johnson"]
+
+# Generate some sample rawData rows
+raw_data = []
+row_id = 1
 today = datetime.now().strftime('%Y-%m-%d')
 
 # Add some timeslots for each professional
-for prof_id in range(1, 4):
-    # Morning slots
-    for hour in [9, 10, 11]:
-        if np.random.random() > 0.5:  # Randomly add some slots
-            timeslots.append({
-                "id": slot_id,
-                "professionalId": prof_id,
-                "start": f"{hour:02d}:00",
-                "end": f"{hour+1:02d}:00",
-                "date": today
-            })
-            slot_id += 1
-    
-    # Afternoon slots
-    for hour in [13, 14, 15, 16]:
+for name in professionals:
+    # Morning and afternoon slots
+    for hour in [9, 10, 11, 13, 14, 15, 16]:
         if np.random.random() > 0.5:  # Randomly add some slots
-            timeslots.append({
-                "id": slot_id,
-                "professionalId": prof_id,
-                "start": f"{hour:02d}:00",
-                "end": f"{hour+1:02d}:00",
-                "date": today
+            raw_data.append({
+                "id": row_id,
+                "datetime": f"{today} {hour:02d}:00",
+                "laakari": name,
+                "kesto_min": 60,
+                "tyhja": 1
             })
-            slot_id += 1
+            row_id += 1
+
+
+# Scores are cached by the model features, so running the model again after
+# an edit only scores the slots that were added or moved
+scorer = Scorer(FunctionModel(predict_bookings, ['datetime', 'laakari']))
+
+# Scoring runs on a background thread, so the Flask worker answering the
+# button click returns at once and other users' edits never wait for a
+# scoring run. The process pool for the model is started in __main__ below.
+jobs = ScoringJobs(scorer, batch_size=1_000)
 
 app = Dash(__name__)
 
@@ -63,13 +64,17 @@ app.layout = html.Div([
             'padding': '10px 15px',
             'borderRadius': '4px',
             'cursor': 'pointer'
-        })
+        }),
+        html.Progress(id='prediction-progress', value='0', max='1', style={'marginLeft': '20px'})
     ], style={'marginBottom': '20px'}),
     
+    # Polls the running scoring job and streams its results into the chart
+    dcc.Store(id='prediction-job'),
+    dcc.Interval(id='prediction-poll', interval=300, disabled=True),
+    
     dash_gantt.DashGantt(
         id='gantt-chart',
-        professionals=professionals,
-        timeslots=timeslots,
+        rawData=raw_data,
         date=today,
         startHour=8,
         endHour=18,
@@ -88,7 +93,8 @@ app.layout = html.Div([
             html.Li("Professional's popularity"),
             html.Li("Historical booking patterns")
         ]),
-        html.P("Click the 'Run Prediction Model' button to simulate running the prediction model on the current timeslots."),
+        html.P("Click the 'Run Prediction Model' button to run the prediction model on the current timeslots. "
+               "Only slots that were added or changed since the last run are scored again."),
         
         html.H3("Timeslot Data (for Prediction Model)"),
         html.Pre(id='timeslot-data', style={
@@ -103,17 +109,17 @@ app.layout = html.Div([
 
 @callback(
     Output('timeslot-data', 'children'),
-    Input('gantt-chart', 'timeslots')
+    Input('gantt-chart', 'rawData')
 )
-def display_timeslot_data(timeslots):
-    if not timeslots:
+def display_timeslot_data(raw_data):
+    if not raw_data:
         return "No timeslots available."
     
     # Convert to pandas DataFrame for display
-    df = pd.DataFrame(timeslots)
+    df = pd.DataFrame(raw_data)
     
     # Format the DataFrame as a string
-    return f"DataFrame Shape: {df.shape}\n\n" + df.to_string()
+    return f"DataFrame Shape: {df.shape}\n\n" + df.to_string() + f"\n\nScorer: {json.dumps(scorer.stats())}"
 
 
 @callback(
@@ -125,44 +131,50 @@ def update_gantt_date(date):
 
 
 @callback(
-    Output('gantt-chart', 'timeslots'),
+    Output('prediction-job', 'data'),
+    Output('prediction-poll', 'disabled'),
     Input('run-prediction', 'n_clicks'),
-    State('gantt-chart', 'timeslots'),
+    State('gantt-chart', 'rawData'),
+    State('prediction-job', 'data'),
     prevent_initial_call=True
 )
-def run_prediction_model(n_clicks, timeslots):
-    if not timeslots:
-        return timeslots
-    
-    # Convert timeslots to DataFrame for feature extraction
-    df = pd.DataFrame(timeslots)
+def run_prediction_model(n_clicks, raw_data, job_id):
+    if not raw_data:
+        return no_update, True
     
-    # Extract features
-    df['hour'] = df['start'].apply(lambda x: int(x.split(':')[0]))
-    df['is_morning'] = df['hour'] < 12
-    
-    # Simple prediction model (for demonstration)
-    # In a real scenario, you would use a trained machine learning model
-    
-    # Feature 1: Time of day effect (morning slots are more popular)
-    time_factor = df['is_morning'].apply(lambda x: 0.2 if x else -0.1)
-    
-    # Feature 2: Professional popularity (based on ID for demo)
-    prof_factor = df['professionalId'].apply(lambda x: 0.1 if x == 1 else (0.2 if x == 2 else 0))
-    
-    # Feature 3: Random factor (to simulate other unknown variables)
-    random_factor = np.random.normal(0, 0.1, len(df))
-    
-    # Calculate probability (base probability + factors, clamped between 0 and 1)
-    base_probability = 0.5  # 50% base probability
-    probabilities = np.clip(base_probability + time_factor + prof_factor + random_factor, 0, 1)
-    
-    # Update timeslots with predictions
-    for i, prob in enumerate(probabilities):
-        timeslots[i]['bookingProbability'] = float(prob)
+    # Start scoring in the background; clicking again restarts the job.
+    # Unchanged slots are served from the cache in the first batch.
+    return jobs.submit(raw_data, job_id=job_id), False
+
+
+@callback(
+    Output('gantt-chart', 'predictions'),
+    Output('prediction-progress', 'value'),
+    Output('prediction-progress', 'max'),
+    Output('prediction-poll', 'disabled', allow_duplicate=True),
+    Input('prediction-poll', 'n_intervals'),
+    State('prediction-job', 'data'),
+    prevent_initial_call=True
+)
+def poll_prediction_model(n_intervals, job_id):
+    if job_id not in jobs:
+        return no_update, no_update, no_update, True
     
-    return timeslots
+    # Only the slots scored since the last poll are sent; DashGantt keeps
+    # the probabilities of the slots that are not listed
+    progress = jobs.poll(job_id)
+    if progress['error']:
+        logger.error("Scoring failed: %s", progress['error'])
+    return (
+        progress['predictions'] or no_update,
+        str(progress['done']),
+        str(max(progress['total'], 1)),
+        progress['finished'],
+    )
 
 
 if __name__ == '__main__':
+    # Only the server process starts the pool: its workers import this
+    # module, and starting pools at import time would start them again
+    jobs.executor = ProcessPoolExecutor(max_workers=2)
     app.run(debug=True) 
\ No newline at end of file
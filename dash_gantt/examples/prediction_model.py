@@ -0,0 +1,23 @@
+import numpy as np
+
+
+# Lives in its own module so process pool workers can import it; functions
+# defined in the script that starts the app exist only in its __main__
+def predict_bookings(features):
+    """
+    Simple prediction model (for demonstration). In a real scenario this
+    would call a trained machine learning model. Features arrive as NumPy
+    arrays, one element per slot, so the whole batch is scored at once.
+    """
+    hours = np.array([int(value[11:13]) for value in features['datetime']])
+    doctors = features['laakari']
+
+    # Feature 1: Time of day effect (morning slots are more popular)
+    time_factor = np.where(hours < 12, 0.2, -0.1)
+
+    # Feature 2: Professional popularity
+    prof_factor = np.select([doctors == "John Doe", doctors == "Jane Smith"], [0.1, 0.2], 0)
+
+    # Calculate probability (base probability + factors, clamped between 0 and 1)
+    base_probability = 0.5  # 50% base probability
+    return np.round(np.clip(base_probability + time_factor + prof_factor, 0, 1), 2)
@@ -20,6 +20,10 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     install_requires=[],
+    extras_require={
+        'data': ['pandas', 'numpy'],
+        'arrow': ['pandas', 'numpy', 'pyarrow'],
+    },
     classifiers = [
         'Framework :: Dash',
     ],    
@@ -23,7 +23,25 @@ DashGantt.defaultProps = {
     endHour: 24, // Midnight
     slotDuration: 5, // 5 minutes as per business requirements
     backgroundColor: '#f5f5f5', // Default background color
-    onDataChange: null // Callback for when data changes
+    onDataChange: null, // Callback for when data changes
+    updateMode: 'full', // Send the whole rawData back on every edit
+    predictions: null, // Booking probabilities by row id
+    rawDataPatch: null, // Last patch reported in 'patch' mode
+    virtualize: false, // Mount every professional row
+    height: 600, // Viewport height in pixels when virtualizing
+    overscan: 5, // Extra rows mounted above and below the viewport
+    layout: 'cells', // One table cell per time slot
+    perfMetricsInterval: 0, // Telemetry disabled
+    perfMetrics: null, // Last telemetry report
+    days: 1, // Single-day editor
+    prefetchDays: 1, // Load one day on either side of the viewport
+    viewport: null, // Set once the multi-day timeline is mounted
+    pixelsPerHour: 60, // Zoom of the multi-day timeline
+    detailPixelsPerHour: 20, // Show occupancy below 20 pixels per hour
+    occupancy: null, // No hourly occupancy loaded
+    summary: null, // No utilization totals shown
+    allowOverlap: false, // Edits may not overlap another slot
+    historyLimit: 100 // Undo up to 100 edits
 };
 
 DashGantt.propTypes = {
@@ -33,7 +51,7 @@ DashGantt.propTypes = {
     id: PropTypes.string,
 
     /**
-     * Raw data from CSV/database in the format:
+     * Raw data from CSV/database, either as a list of rows:
      * [
      *   {
      *     datetime: string, // Format: "YYYY-MM-DD HH:MM"
@@ -44,16 +62,37 @@ DashGantt.propTypes = {
      *     // Additional fields are allowed and will be preserved
      *   }
      * ]
+     * or in columnar format, as an object of equally long arrays keyed by
+     * field name. String columns may be dictionary-encoded as
+     * {categories: [...], codes: [...]}, e.g.
+     * {
+     *   datetime: ["2024-01-01 08:00", "2024-01-01 08:20"],
+     *   laakari: {categories: ["Dr. A"], codes: [0, 0]},
+     *   kesto_min: [20, 20],
+     *   tyhja: [1, 0]
+     * }
+     * Edits are reported back in the same format as the input.
      */
-    rawData: PropTypes.arrayOf(
-        PropTypes.shape({
-            datetime: PropTypes.string.isRequired,
-            laakari: PropTypes.string.isRequired,
-            kesto_min: PropTypes.number.isRequired,
-            tyhja: PropTypes.number.isRequired,
-            bookingProbability: PropTypes.number
-        }).isRequired
-    ),
+    rawData: PropTypes.oneOfType([
+        PropTypes.arrayOf(
+            PropTypes.shape({
+                datetime: PropTypes.string.isRequired,
+                laakari: PropTypes.string.isRequired,
+                kesto_min: PropTypes.number.isRequired,
+                tyhja: PropTypes.number.isRequired,
+                bookingProbability: PropTypes.number
+            }).isRequired
+        ),
+        PropTypes.objectOf(
+            PropTypes.oneOfType([
+                PropTypes.array,
+                PropTypes.shape({
+                    categories: PropTypes.array,
+                    codes: PropTypes.arrayOf(PropTypes.number)
+                })
+            ])
+        )
+    ]),
 
     /**
      * The date to display in the Gantt chart (YYYY-MM-DD).
@@ -86,6 +125,208 @@ DashGantt.propTypes = {
      */
     onDataChange: PropTypes.func,
 
+    /**
+     * How edits are reported to Dash. With 'full' the whole updated rawData
+     * is set on every edit. With 'patch' rawData is left untouched and only
+     * the changed rows are reported through rawDataPatch.
+     */
+    updateMode: PropTypes.oneOf(['full', 'patch']),
+
+    /**
+     * Booking probabilities by row id, e.g. {"17": 0.82, "new-lx2k-1": 0.4}.
+     * Overrides the bookingProbability of the matching slots without
+     * resending rawData; only the listed slots are recolored. Row ids are
+     * the same as in rawDataPatch. Slots that are not listed keep their
+     * current probability.
+     */
+    predictions: PropTypes.objectOf(PropTypes.number),
+
+    /**
+     * The rows changed by the last edit, set when updateMode is 'patch':
+     * {
+     *   sequence: number, // Increases with every patch
+     *   added: [row], // New rows, with ids generated in the browser
+     *   modified: [row], // Complete rows after the edit
+     *   removed: [id] // Ids of removed rows
+     * }
+     * Rows are in the rawData row format and carry an `id`, taken from the
+     * `id` field of the source row or, if it has none, its position in rawData.
+     */
+    rawDataPatch: PropTypes.shape({
+        sequence: PropTypes.number,
+        added: PropTypes.arrayOf(PropTypes.object),
+        modified: PropTypes.arrayOf(PropTypes.object),
+        removed: PropTypes.arrayOf(
+            PropTypes.oneOfType([PropTypes.string, PropTypes.number])
+        )
+    }),
+
+    /**
+     * If true, only the professional rows inside the scrollable viewport
+     * (plus `overscan` rows above and below it) are mounted. The time header
+     * stays visible while scrolling.
+     */
+    virtualize: PropTypes.bool,
+
+    /**
+     * The height of the scrollable viewport in pixels when `virtualize` is true.
+     */
+    height: PropTypes.number,
+
+    /**
+     * The number of rows mounted above and below the viewport when
+     * `virtualize` is true.
+     */
+    overscan: PropTypes.number,
+
+    /**
+     * How timeslots are laid out on a row:
+     * - 'cells': one table cell per slotDuration minutes, slots anchored to
+     *   the cell of their start time
+     * - 'absolute': one cell per professional, with the grid drawn as a
+     *   background and slots positioned by their start minute. The number of
+     *   DOM nodes depends on the number of slots only, which keeps short
+     *   slot durations and long days cheap to render.
+     */
+    layout: PropTypes.oneOf(['cells', 'absolute']),
+
+    /**
+     * How often, in milliseconds, the component reports performance
+     * telemetry through `perfMetrics`. 0 disables telemetry; nothing is
+     * measured then.
+     */
+    perfMetricsInterval: PropTypes.number,
+
+    /**
+     * Performance telemetry, set at most every `perfMetricsInterval` ms while
+     * something was measured:
+     * {
+     *   sequence: number, // Increases with every report
+     *   timestamp: number, // Epoch milliseconds
+     *   rows: number, // rawData size when reported
+     *   slots: number, // Timeslots of the displayed date
+     *   professionals: number,
+     *   samples: {name: [number]}, // Up to 200 samples per metric
+     *   counts: {name: number}, // Measurements taken per metric
+     *   droppedFrames: number, // Frames missed while dragging
+     *   dragFrames: number // Frames seen while dragging
+     * }
+     * Metrics are 'render', 'transform', 'update' and 'drag' durations in
+     * milliseconds, and 'payloadBytes', the JSON size of the data sent back
+     * to Dash on each edit. Durations are also recorded as User Timing
+     * measures named `dash-gantt:<metric>`.
+     */
+    perfMetrics: PropTypes.object,
+
+    /**
+     * Number of consecutive days, starting at `date`, to show side by side.
+     * With more than one day the chart is a read-only timeline that scrolls
+     * horizontally and loads its data through `viewport`.
+     */
+    days: PropTypes.number,
+
+    /**
+     * Days on either side of the visible ones that the multi-day timeline
+     * requests ahead of scrolling. Days more than twice as far away are
+     * dropped from the browser and requested again when scrolled back to.
+     */
+    prefetchDays: PropTypes.number,
+
+    /**
+     * Visible window of the multi-day timeline, set when scrolling pauses:
+     * {
+     *   start: string, // First visible hour, "YYYY-MM-DD HH:MM"
+     *   end: string, // End of the last visible hour, "YYYY-MM-DD HH:MM"
+     *   dates: [string], // Visible dates
+     *   detail: 'slots' | 'occupancy', // What the missing dates are needed as
+     *   missing: [string] // Dates to send, nearest first
+     * }
+     * rawData (or, when `detail` is 'occupancy', occupancy) set in response
+     * is merged by date into the loaded days, so it only needs to hold the
+     * `missing` dates.
+     */
+    viewport: PropTypes.shape({
+        start: PropTypes.string,
+        end: PropTypes.string,
+        dates: PropTypes.arrayOf(PropTypes.string),
+        detail: PropTypes.oneOf(['slots', 'occupancy']),
+        missing: PropTypes.arrayOf(PropTypes.string)
+    }),
+
+    /**
+     * Zoom of the multi-day timeline in pixels per hour. Ctrl+wheel over
+     * the timeline zooms in and out between 4 and 240 and updates this
+     * prop.
+     */
+    pixelsPerHour: PropTypes.number,
+
+    /**
+     * Below this many pixels per hour the multi-day timeline shows hourly
+     * occupancy from `occupancy` instead of individual slots.
+     */
+    detailPixelsPerHour: PropTypes.number,
+
+    /**
+     * Hourly occupancy per professional for the zoomed-out multi-day
+     * timeline, in the columnar format with one entry per professional and
+     * hour:
+     * {
+     *   date: [string], // "YYYY-MM-DD"
+     *   hour: [number], // 0-23
+     *   laakari: [string],
+     *   booked: [number], // Booked minutes
+     *   available: [number], // Available minutes
+     *   expected: [number] // Available minutes times bookingProbability
+     * }
+     * Any column may be dictionary-encoded like in rawData. See
+     * dash_gantt.occupancy.
+     */
+    occupancy: PropTypes.objectOf(
+        PropTypes.oneOfType([
+            PropTypes.array,
+            PropTypes.shape({
+                categories: PropTypes.array,
+                codes: PropTypes.arrayOf(PropTypes.number)
+            })
+        ])
+    ),
+
+    /**
+     * Utilization totals shown in the single-day view, computed on the
+     * server (see dash_gantt.utilization):
+     * {
+     *   professionals: {name: totals}, // Shown as a column after the hours
+     *   hours: {hour: totals}, // Shown as a row below the professionals
+     *   total: totals // Shown where the column and the row meet
+     * }
+     * where totals are {booked, available, expected, utilization,
+     * expectedUtilization}, in minutes and as shares of the scheduled
+     * minutes. Either part may be left out.
+     */
+    summary: PropTypes.shape({
+        professionals: PropTypes.objectOf(PropTypes.object),
+        hours: PropTypes.objectOf(PropTypes.object),
+        total: PropTypes.object
+    }),
+
+    /**
+     * If False, dragging a slot onto another slot of the same professional
+     * or creating one over it is refused: the preview turns red and the
+     * edit is dropped, and the slot editor cannot save overlapping times.
+     * Set to True to allow overlapping slots.
+     */
+    allowOverlap: PropTypes.bool,
+
+    /**
+     * The number of edits that can be undone with the Undo button or
+     * Ctrl+Z and redone with Redo, Ctrl+Shift+Z or Ctrl+Y. A step holds
+     * only the slots the edit changed, and undoing or redoing reports only
+     * those rows (through rawDataPatch in 'patch' mode). The history is
+     * cleared when `date` changes or a callback replaces `rawData`. 0
+     * disables undo.
+     */
+    historyLimit: PropTypes.number,
+
     /**
      * Dash-assigned callback that should be called to report property changes
      * to Dash, to make them available for callbacks.
@@ -1,5 +1,62 @@
 import React, {Component} from 'react';
 import PropTypes from 'prop-types';
+import {
+    decodeColumnar,
+    encodeColumnar,
+    fieldAccessor,
+    isColumnar,
+    rowAt,
+    rowCount
+} from '../utils/columnar';
+import { addDays, dayRange, prefetchOrder, visibleWindow } from '../utils/days';
+import { EditHistory } from '../utils/history';
+import { intervalIndex } from '../utils/intervals';
+import { partitionByDate } from '../utils/partition';
+import { now, payloadBytes, PerfRecorder } from '../utils/perf';
+import { buildRowIndex, rowKey, RowIndexCache } from '../utils/rowIndex';
+import { formatMinutes, toMinutes } from '../utils/time';
+
+// Height of one professional row in pixels
+const ROW_HEIGHT = 60;
+
+// Width of the name column of the multi-day timeline in pixels
+const NAME_COLUMN_WIDTH = 150;
+
+// Zoom range of the multi-day timeline in pixels per hour, and the factor
+// of one ctrl+wheel step
+const MIN_PIXELS_PER_HOUR = 4;
+const MAX_PIXELS_PER_HOUR = 240;
+const ZOOM_STEP = 1.25;
+
+// Minimum width of an hour label of the multi-day timeline in pixels
+const HOUR_LABEL_WIDTH = 40;
+
+// State holding the loaded days of each detail level of the timeline
+const LEVEL_DAYS = { slots: 'loadedDays', occupancy: 'loadedOccupancy' };
+
+// Milliseconds without scrolling before the multi-day timeline reports its viewport
+const VIEWPORT_DELAY = 150;
+
+// Transformed data per rawData object and date, see DashGantt.transformData
+const transformCache = new WeakMap();
+
+// Shared slot list of professionals without slots
+const EMPTY_SLOTS = [];
+
+// Preview colors of a drag or creation that would overlap another slot
+const OVERLAP_FILL = 'rgba(244, 67, 54, 0.4)';
+const OVERLAP_BORDER = '#D32F2F';
+
+// Fields of rows created in the browser that the timeslot does not determine
+const NEW_ROW_DEFAULTS = {
+    toimipiste: "Default",
+    aikaryhman: "Default",
+    aikaryhma: "Default",
+    RESURSSI: "Default",
+    specialty: "Default",
+    ETNS_A: 1,
+    ETNS_B: 1
+};
 
 /**
  * DashGantt is a Gantt chart component for scheduling.
@@ -11,8 +68,20 @@ export default class DashGantt extends Component {
     constructor(props) {
         super(props);
         
-        // Add table ref
+        // Add table ref, and a ref to the header cell above the names used
+        // to find where the time area of the grid starts
         this.tableRef = React.createRef();
+        this.nameHeaderRef = React.createRef();
+        this.lastHourHeaderRef = React.createRef();
+        
+        // Grid geometry and pointer position of the ongoing drag
+        this.gridGeometry = null;
+        this.pointerX = undefined;
+        this.dragFrame = null;
+        
+        // Rendered time cells per professional, see renderRowCells
+        this.rowCache = new WeakMap();
+        this.slotGroups = { timeslots: null, groups: new Map() };
         
         // Add a flag to track if we just finished dragging
         this.justFinishedDragging = false;
@@ -20,9 +89,43 @@ export default class DashGantt extends Component {
         // Add flag for slot creation dragging
         this.isCreatingSlot = false;
         
+        // Counters for ids of client-created rows and for emitted patches
+        this.newRowCounter = 0;
+        this.patchSequence = 0;
+        
+        // Index of rawData rows by (datetime, laakari), reused across edits
+        this.rowIndexCache = new RowIndexCache();
+        
+        // Undo/redo steps, the rawData the component emitted last (which
+        // keeps the history when it comes back as a prop) and whether the
+        // last click was inside the chart, for the keyboard shortcuts
+        this.history = new EditHistory(props.historyLimit);
+        this.emittedRawData = null;
+        this.rootRef = React.createRef();
+        this.historyFocus = false;
+        
+        // Performance telemetry, published through perfMetrics when
+        // perfMetricsInterval is set
+        this.perf = new PerfRecorder();
+        this.perfTimer = null;
+        this.renderTiming = null;
+        this.frameMonitor = null;
+        
+        // Multi-day timeline: the scrolled container, the pending viewport
+        // report and the window of the last one
+        this.containerRef = React.createRef();
+        this.viewportTimer = null;
+        this.viewportKey = null;
+        this.dayCellCache = new WeakMap();
+        this.zoomAnchor = null;
+        
         // Initialize state with props
-        const { rawData, date } = props;
-        const { professionals, timeslots } = DashGantt.transformData(rawData || [], date || new Date().toISOString().split('T')[0]);
+        const { rawData, date, predictions } = props;
+        const transformStart = now();
+        const { professionals, professionalsById, timeslots } = DashGantt.transformData(rawData || [], date || new Date().toISOString().split('T')[0]);
+        if (this.perfEnabled()) {
+            this.perf.record('transform', now() - transformStart);
+        }
         
         this.state = {
             selectedSlot: null,
@@ -37,8 +140,10 @@ export default class DashGantt extends Component {
             slotWidthCache: {},
             // Internal state for transformed data
             professionals: professionals || [],
-            timeslots: timeslots || [],
+            professionalsById,
+            timeslots: DashGantt.applyPredictions(timeslots || [], predictions),
             rawData: rawData || [],
+            predictions,
             date: date || new Date().toISOString().split('T')[0],
             isDragging: false,
             dragSide: null, // 'start' or 'end'
@@ -49,6 +154,17 @@ export default class DashGantt extends Component {
             creationStart: null, // Starting point for new slot creation
             creationEnd: null, // Ending point for new slot creation
             creationProfessionalId: null, // Professional for whom the slot is being created
+            scrollTop: 0, // Vertical scroll position used for row virtualization
+            // Days of the multi-day timeline: date -> grouped slots, or null
+            // while requested through viewport and not received yet
+            loadedDays: new Map(),
+            mergedRawData: null, // Last rawData merged into loadedDays
+            // Hourly occupancy by date, shown instead of slots when zoomed out
+            loadedOccupancy: new Map(),
+            mergedOccupancy: null, // Last occupancy merged into loadedOccupancy
+            timelineLevel: null,
+            canUndo: false,
+            canRedo: false
         };
         
         // Bind methods
@@ -62,97 +178,299 @@ export default class DashGantt extends Component {
         this.handleCellLeave = this.handleCellLeave.bind(this);
         this.renderSlotRectangle = this.renderSlotRectangle.bind(this);
         this.generateTimeCells = this.generateTimeCells.bind(this);
+        this.renderSlotLayer = this.renderSlotLayer.bind(this);
         this.formatTime = this.formatTime.bind(this);
         this.timeToDecimal = this.timeToDecimal.bind(this);
         this.calculateSlotWidth = this.calculateSlotWidth.bind(this);
         this.getSlotWidth = this.getSlotWidth.bind(this);
         this.updateRawData = this.updateRawData.bind(this);
+        this.commitEdit = this.commitEdit.bind(this);
+        this.applyEdit = this.applyEdit.bind(this);
+        this.handleUndo = this.handleUndo.bind(this);
+        this.handleRedo = this.handleRedo.bind(this);
+        this.handleHistoryKey = this.handleHistoryKey.bind(this);
+        this.handleDocumentMouseDown = this.handleDocumentMouseDown.bind(this);
+        this.slotFields = this.slotFields.bind(this);
+        this.slotToRow = this.slotToRow.bind(this);
+        this.emitPatch = this.emitPatch.bind(this);
         this.handleDragStart = this.handleDragStart.bind(this);
         this.handleDrag = this.handleDrag.bind(this);
         this.handleDragEnd = this.handleDragEnd.bind(this);
         this.handleCreationStart = this.handleCreationStart.bind(this);
         this.handleCreationDrag = this.handleCreationDrag.bind(this);
         this.handleCreationEnd = this.handleCreationEnd.bind(this);
+        this.measureGrid = this.measureGrid.bind(this);
+        this.getGridGeometry = this.getGridGeometry.bind(this);
+        this.invalidateGrid = this.invalidateGrid.bind(this);
+        this.watchGrid = this.watchGrid.bind(this);
+        this.pointerToTime = this.pointerToTime.bind(this);
+        this.requestDragFrame = this.requestDragFrame.bind(this);
+        this.cancelDragFrame = this.cancelDragFrame.bind(this);
+        this.updateDragPreview = this.updateDragPreview.bind(this);
+        this.computeDragPreview = this.computeDragPreview.bind(this);
+        this.computeCreationEnd = this.computeCreationEnd.bind(this);
+        this.getSlotGroups = this.getSlotGroups.bind(this);
+        this.renderRowCells = this.renderRowCells.bind(this);
+        this.perfEnabled = this.perfEnabled.bind(this);
+        this.finishRenderTiming = this.finishRenderTiming.bind(this);
+        this.schedulePerfMetrics = this.schedulePerfMetrics.bind(this);
+        this.startFrameMonitor = this.startFrameMonitor.bind(this);
+        this.stopFrameMonitor = this.stopFrameMonitor.bind(this);
+        this.writeRawData = this.writeRawData.bind(this);
+        this.applyDragPointer = this.applyDragPointer.bind(this);
+        this.handleScroll = this.handleScroll.bind(this);
+        this.getVisibleRowRange = this.getVisibleRowRange.bind(this);
+        this.isTimeline = this.isTimeline.bind(this);
+        this.scheduleViewport = this.scheduleViewport.bind(this);
+        this.publishViewport = this.publishViewport.bind(this);
+        this.renderDayCell = this.renderDayCell.bind(this);
+        this.renderTimeline = this.renderTimeline.bind(this);
+        this.renderOccupancyCell = this.renderOccupancyCell.bind(this);
+        this.handleWheel = this.handleWheel.bind(this);
     }
     
-    // Transform raw data into component format
+    // Transform raw data (row or columnar format) into component format.
+    // Results are memoized per rawData object and date, so re-rendering or
+    // switching back to a date already shown does not transform it again.
     static transformData(rawData, date) {
-        if (!rawData || !date) return { professionals: [], timeslots: [] };
+        if (!rawData || !date) return { professionals: [], professionalsById: new Map(), timeslots: [] };
 
-        // Filter data for the specific date
-        const filteredData = rawData.filter(row => {
-            const rowDate = row.datetime.split(' ')[0];
-            return rowDate === date;
-        });
+        let byDate = transformCache.get(rawData);
+        if (!byDate) {
+            byDate = new Map();
+            transformCache.set(rawData, byDate);
+        }
+        if (!byDate.has(date)) {
+            byDate.set(date, DashGantt.transformDate(rawData, date));
+        }
+        return byDate.get(date);
+    }
+    
+    // Transform the rows of one date of rawData
+    static transformDate(rawData, date) {
+        // Read fields through accessors so columnar data is never expanded into rows
+        const datetimeAt = fieldAccessor(rawData, 'datetime');
+        const laakariAt = fieldAccessor(rawData, 'laakari');
+        const durationAt = fieldAccessor(rawData, 'kesto_min');
+        const tyhjaAt = fieldAccessor(rawData, 'tyhja');
+        const probabilityAt = fieldAccessor(rawData, 'bookingProbability');
+        const idAt = fieldAccessor(rawData, 'id');
+        const columnar = isColumnar(rawData);
+
+        // Row indices of the specific date, from the partition of rawData by date
+        const filteredRows = partitionByDate(rawData).get(date) || [];
 
         // Create professionals list from unique doctors
-        const professionals = Array.from(new Set(filteredData.map(row => row.laakari)))
+        const professionals = Array.from(new Set(filteredRows.map(laakariAt)))
             .map((doctor, idx) => ({ id: idx + 1, name: doctor }));
 
-        // Create doctor to id mapping
+        // Create doctor to id mapping and the lookup of professionals by id
         const doctorToId = Object.fromEntries(
             professionals.map((p, idx) => [p.name, idx + 1])
         );
+        const professionalsById = new Map(professionals.map(p => [p.id, p]));
 
         // Transform timeslots
-        const timeslots = filteredData.map((row, idx) => {
-            const [date, time] = row.datetime.split(' ');
-            const startTime = time;
+        const timeslots = filteredRows.map((rowIndex, idx) => {
+            const datetime = datetimeAt(rowIndex);
+            const separator = datetime.indexOf(' ');
+            const startTime = datetime.slice(separator + 1);
+            const sourceId = idAt(rowIndex);
             
-            // Calculate end time based on duration
-            const [hours, minutes] = time.split(':').map(Number);
-            const startDate = new Date();
-            startDate.setHours(hours, minutes, 0);
-            // Use kesto_min directly from the data
-            const durationMinutes = row.kesto_min || 0;
-            const endDate = new Date(startDate.getTime() + durationMinutes * 60000);
-            const endTime = `${endDate.getHours().toString().padStart(2, '0')}:${endDate.getMinutes().toString().padStart(2, '0')}`;
+            // Calculate end time from kesto_min in whole minutes
+            const durationMinutes = durationAt(rowIndex) || 0;
+            const endTime = formatMinutes(toMinutes(startTime) + durationMinutes);
 
             return {
                 id: idx + 1,
-                professionalId: doctorToId[row.laakari],
+                professionalId: doctorToId[laakariAt(rowIndex)],
                 start: startTime,
                 end: endTime,
                 date: date,
                 durationMinutes: durationMinutes, // Store the original duration
-                bookingProbability: row.bookingProbability || 0.5,
-                isBooked: row.tyhja === 0,
-                rawData: row // Keep reference to original data with all fields
+                bookingProbability: probabilityAt(rowIndex) || 0.5,
+                isBooked: tyhjaAt(rowIndex) === 0,
+                rowIndex: rowIndex, // Position of the source row in rawData
+                // Stable row id used in rawDataPatch, falls back to the row position
+                rowId: sourceId !== undefined && sourceId !== null ? sourceId : rowIndex,
+                rawData: columnar ? null : rawData[rowIndex] // Keep reference to original data with all fields
             };
         });
 
-        return { professionals, timeslots };
+        return { professionals, professionalsById, timeslots };
     }
     
     // Update getDerivedStateFromProps to handle undefined values
     static getDerivedStateFromProps(nextProps, prevState) {
         if (!nextProps) return null;
         
-        const { rawData, date } = nextProps;
+        if (nextProps.days > 1) {
+            return DashGantt.deriveTimeline(nextProps, prevState);
+        }
+        
+        const { rawData, date, predictions } = nextProps;
         if (rawData !== prevState.rawData || date !== prevState.date) {
-            const { professionals, timeslots } = DashGantt.transformData(rawData || [], date || prevState.date);
+            const transformStart = now();
+            const { professionals, professionalsById, timeslots } = DashGantt.transformData(rawData || [], date || prevState.date);
             return { 
                 professionals: professionals || [], 
-                timeslots: timeslots || [], 
+                professionalsById,
+                timeslots: DashGantt.applyPredictions(timeslots || [], predictions), 
                 rawData: rawData || [], 
-                date: date || prevState.date 
+                predictions,
+                date: date || prevState.date,
+                // Picked up by componentDidUpdate for the perfMetrics prop
+                transformTiming: { ms: now() - transformStart }
+            };
+        }
+        if (predictions !== prevState.predictions) {
+            // Only recolor: the schedule itself is not transformed again
+            return {
+                timeslots: DashGantt.applyPredictions(prevState.timeslots, predictions),
+                predictions
             };
         }
         return null;
     }
-
-    // Update componentDidMount to handle undefined values
-    componentDidMount() {
-        const { rawData, date } = this.props;
-        const { professionals, timeslots } = DashGantt.transformData(rawData || [], date || this.state.date);
-        this.setState({ 
-            professionals: professionals || [], 
-            timeslots: timeslots || [],
-            rawData: rawData || [],
-            date: date || this.state.date
+    
+    // State of the multi-day timeline: every date of a new rawData (or
+    // occupancy) that is within the shown days is transformed and replaces
+    // what was loaded for it; other loaded days are kept. Rows are the
+    // professionals of all days loaded at the current level of detail, by
+    // name.
+    static deriveTimeline(nextProps, prevState) {
+        const { rawData, predictions, occupancy, days } = nextProps;
+        const data = rawData || [];
+        const level = DashGantt.timelineLevel(nextProps);
+        const merge = data !== prevState.mergedRawData;
+        const mergeOccupancy = (occupancy || null) !== prevState.mergedOccupancy;
+        if (!merge && !mergeOccupancy && predictions === prevState.predictions &&
+            level === prevState.timelineLevel) return null;
+        
+        const transformStart = now();
+        const shown = new Set(dayRange(nextProps.date || prevState.date, days));
+        const loadedDays = new Map();
+        prevState.loadedDays.forEach((day, date) => {
+            const regroup = day && predictions !== prevState.predictions;
+            loadedDays.set(date, regroup ? DashGantt.groupDay(day.transformed, predictions) : day);
+        });
+        if (merge) {
+            partitionByDate(data).forEach((rows, date) => {
+                if (shown.has(date)) {
+                    loadedDays.set(date, DashGantt.groupDay(DashGantt.transformData(data, date), predictions));
+                }
+            });
+        }
+        
+        let loadedOccupancy = prevState.loadedOccupancy;
+        if (mergeOccupancy && occupancy) {
+            loadedOccupancy = new Map(loadedOccupancy);
+            DashGantt.groupOccupancy(occupancy).forEach((day, date) => {
+                if (shown.has(date)) {
+                    loadedOccupancy.set(date, day);
+                }
+            });
+        }
+        
+        return {
+            loadedDays,
+            mergedRawData: data,
+            loadedOccupancy,
+            mergedOccupancy: occupancy || null,
+            timelineLevel: level,
+            professionals: DashGantt.timelineRows(level === 'occupancy' ? loadedOccupancy : loadedDays),
+            professionalsById: new Map(),
+            timeslots: EMPTY_SLOTS,
+            predictions,
+            // Transform the date again when switching back to a single day
+            rawData: null,
+            transformTiming: merge ? { ms: now() - transformStart } : prevState.transformTiming
+        };
+    }
+    
+    // Level of detail of the multi-day timeline: hourly occupancy when
+    // zoomed out below detailPixelsPerHour, individual slots otherwise
+    static timelineLevel(props) {
+        return props.pixelsPerHour < props.detailPixelsPerHour ? 'occupancy' : 'slots';
+    }
+    
+    // Group columnar occupancy by date and professional name into 24 hourly
+    // [booked, available, expected] bins
+    static groupOccupancy(occupancy) {
+        const dateAt = fieldAccessor(occupancy, 'date');
+        const nameAt = fieldAccessor(occupancy, 'laakari');
+        const hourAt = fieldAccessor(occupancy, 'hour');
+        const bookedAt = fieldAccessor(occupancy, 'booked');
+        const availableAt = fieldAccessor(occupancy, 'available');
+        const expectedAt = fieldAccessor(occupancy, 'expected');
+        
+        const byDate = new Map();
+        const length = rowCount(occupancy);
+        for (let i = 0; i < length; i++) {
+            const date = dateAt(i);
+            let day = byDate.get(date);
+            if (!day) {
+                day = { groups: new Map() };
+                byDate.set(date, day);
+            }
+            const name = nameAt(i);
+            let bins = day.groups.get(name);
+            if (!bins) {
+                bins = new Array(24).fill(null);
+                day.groups.set(name, bins);
+            }
+            bins[hourAt(i)] = [bookedAt(i) || 0, availableAt(i) || 0, expectedAt(i) || 0];
+        }
+        return byDate;
+    }
+    
+    // Group the slots of a transformed day by professional name
+    static groupDay(transformed, predictions) {
+        const groups = new Map();
+        DashGantt.applyPredictions(transformed.timeslots, predictions).forEach(slot => {
+            const name = transformed.professionalsById.get(slot.professionalId).name;
+            const group = groups.get(name);
+            if (group) {
+                group.push(slot);
+            } else {
+                groups.set(name, [slot]);
+            }
+        });
+        return { transformed, groups };
+    }
+    
+    // Rows of the multi-day timeline, sorted by name so that loading or
+    // dropping days does not reorder them
+    static timelineRows(loadedDays) {
+        const names = new Set();
+        loadedDays.forEach(day => {
+            if (day) {
+                day.groups.forEach((slots, name) => names.add(name));
+            }
         });
+        return Array.from(names).sort().map((name, idx) => ({ id: idx + 1, name }));
     }
     
+    // Set the bookingProbability of the slots listed in `predictions` (row id
+    // -> probability). Only those slots are copied; the others, and the array
+    // itself if nothing changes, keep their identity so unaffected rows are
+    // not re-rendered.
+    static applyPredictions(timeslots, predictions) {
+        if (!predictions) return timeslots;
+        
+        let updated = null;
+        timeslots.forEach((slot, i) => {
+            const probability = predictions[slot.rowId];
+            if (typeof probability === 'number' && probability !== slot.bookingProbability) {
+                if (!updated) {
+                    updated = timeslots.slice();
+                }
+                updated[i] = { ...slot, bookingProbability: probability };
+            }
+        });
+        return updated || timeslots;
+    }
+
     // Handle clicking on a timeslot
     handleSlotClick(slot) {
         this.setState({
@@ -207,6 +525,9 @@ export default class DashGantt extends Component {
         const endMinutes = totalEndMinutes % 60;
         const endTime = `${endHour.toString().padStart(2, '0')}:${endMinutes.toString().padStart(2, '0')}`;
         
+        // Refuse a slot on top of another one
+        if (this.overlapsSlot(professionalId, totalStartMinutes, totalEndMinutes)) return;
+        
         // Create new slot
         const newId = timeslots.length > 0 ? Math.max(...timeslots.map(slot => slot.id)) + 1 : 1;
         const slotToAdd = {
@@ -219,13 +540,14 @@ export default class DashGantt extends Component {
             isBooked: false,
             appointmentType: 'In-person appointment',
             resource: 'Default',
+            rowId: this.newRowId(),
             rawData: null // New slot has no original data
         };
         
         // Update timeslots and raw data
         const updatedTimeslots = [...timeslots, slotToAdd];
         this.setState({ timeslots: updatedTimeslots });
-        this.updateRawData(updatedTimeslots);
+        this.commitEdit(updatedTimeslots, { added: [slotToAdd] });
     }
     
     // Handle adding a new timeslot
@@ -259,6 +581,7 @@ export default class DashGantt extends Component {
         }
         
         const { timeslots } = this.state;
+        const removedSlots = timeslots.filter(slot => slot.id === slotId);
         const updatedTimeslots = timeslots.filter(slot => slot.id !== slotId);
         
         this.setState({ 
@@ -266,7 +589,7 @@ export default class DashGantt extends Component {
             selectedSlot: null
         });
         
-        this.updateRawData(updatedTimeslots);
+        this.commitEdit(updatedTimeslots, { removed: removedSlots });
     }
     
     // Handle saving a timeslot (new or edited)
@@ -274,7 +597,11 @@ export default class DashGantt extends Component {
         const { timeslots } = this.state;
         const { selectedSlot, newSlot, isAddingSlot } = this.state;
         
+        // The Save button is disabled then, see editorOverlaps
+        if (this.editorOverlaps()) return;
+        
         let updatedTimeslots;
+        let change;
         
         if (isAddingSlot) {
             // Add new slot
@@ -289,15 +616,21 @@ export default class DashGantt extends Component {
                 isBooked: false,
                 appointmentType: 'In-person appointment',
                 resource: 'Default',
+                rowId: this.newRowId(),
                 rawData: null
             };
             
             updatedTimeslots = [...timeslots, slotToAdd];
+            change = { added: [slotToAdd] };
         } else {
             // Update existing slot
             updatedTimeslots = timeslots.map(slot => 
                 slot.id === selectedSlot.id ? { ...slot, ...selectedSlot } : slot
             );
+            change = {
+                modified: updatedTimeslots.filter(slot => slot.id === selectedSlot.id),
+                previous: timeslots.filter(slot => slot.id === selectedSlot.id)
+            };
         }
         
         this.setState({
@@ -311,7 +644,23 @@ export default class DashGantt extends Component {
             }
         });
         
-        this.updateRawData(updatedTimeslots);
+        this.commitEdit(updatedTimeslots, change);
+    }
+    
+    // Whether the slot in the editor would overlap another slot: a new
+    // slot, or an existing one whose start or end was changed
+    editorOverlaps() {
+        const { timeslots, selectedSlot, newSlot, isAddingSlot } = this.state;
+        const slot = isAddingSlot ? newSlot : selectedSlot;
+        if (!slot || !slot.start || !slot.end) return false;
+        
+        if (!isAddingSlot) {
+            const original = timeslots.find(s => s.id === slot.id);
+            if (original && original.start === slot.start && original.end === slot.end) return false;
+        }
+        return this.overlapsSlot(
+            slot.professionalId, toMinutes(slot.start), toMinutes(slot.end), isAddingSlot ? null : slot.id
+        );
     }
     
     // Handle canceling edit or add operation
@@ -405,8 +754,9 @@ export default class DashGantt extends Component {
         return colorPalette[index];
     }
     
-    // Render a single slot rectangle
-    renderSlotRectangle(slot) {
+    // Render a single slot rectangle. `position` overrides the horizontal
+    // placement (left/width) used in the absolute layout.
+    renderSlotRectangle(slot, position) {
         if (!slot) return null;
         
         const { slotDuration } = this.props || {};
@@ -414,7 +764,7 @@ export default class DashGantt extends Component {
         
         try {
             // Get the number of cells this slot should span
-            const numCellsToSpan = this.getSlotWidth(slot, slotDuration);
+            const numCellsToSpan = position ? 1 : this.getSlotWidth(slot, slotDuration);
             
             const slotStyle = {
                 position: 'absolute',
@@ -422,6 +772,7 @@ export default class DashGantt extends Component {
                 left: '0',
                 height: 'calc(100% - 4px)',
                 width: `calc(${numCellsToSpan * 100}% + ${numCellsToSpan - 1}px)`,
+                ...position,
                 boxSizing: 'border-box',
                 backgroundColor: this.getProbabilityColor(slot),
                 color: 'white',
@@ -592,15 +943,12 @@ Drag middle to move`}
     }
     
     // Generate time cells for each hour and minute interval
-    generateTimeCells(professional, styles) {
+    generateTimeCells(professional, professionalSlots, styles) {
         const { startHour, endHour, slotDuration } = this.props;
-        const { timeslots, dragPreview, isDragging, dragType, creationStart, creationEnd, creationProfessionalId } = this.state;
+        const { dragPreview, isDragging, dragType, creationStart, creationEnd, creationProfessionalId } = this.state;
         const slotsPerHour = 60 / slotDuration;
         const cells = [];
         
-        // Filter slots for this professional
-        const professionalSlots = timeslots.filter(slot => slot.professionalId === professional.id);
-        
         // Group slots by their start time
         const slotsByStartTime = {};
         professionalSlots.forEach(slot => {
@@ -633,6 +981,8 @@ Drag middle to move`}
                 [creationStartDecimal, creationEndDecimal] = [creationEndDecimal, creationStartDecimal];
             }
         }
+        const creationBlocked = creationStartDecimal !== null &&
+            this.creationOverlaps(professional.id, creationStart, creationEnd);
         
         // For each time cell in the grid
         for (let hour = startHour; hour <= endHour; hour++) {
@@ -696,8 +1046,8 @@ Drag middle to move`}
                                     left: '0',
                                     right: '0',
                                     bottom: '2px',
-                                    backgroundColor: 'rgba(33, 150, 243, 0.4)',
-                                    border: `1px ${borderStyle} #1976D2`,
+                                    backgroundColor: dragPreview.overlaps ? OVERLAP_FILL : 'rgba(33, 150, 243, 0.4)',
+                                    border: `1px ${borderStyle} ${dragPreview.overlaps ? OVERLAP_BORDER : '#1976D2'}`,
                                     pointerEvents: 'none',
                                     zIndex: 95
                                 }} />
@@ -717,8 +1067,8 @@ Drag middle to move`}
                                     left: '0',
                                     right: '0',
                                     bottom: '2px',
-                                    backgroundColor: 'rgba(76, 175, 80, 0.4)', // Green for creation
-                                    border: '1px dashed #388E3C',
+                                    backgroundColor: creationBlocked ? OVERLAP_FILL : 'rgba(76, 175, 80, 0.4)', // Green for creation
+                                    border: `1px dashed ${creationBlocked ? OVERLAP_BORDER : '#388E3C'}`,
                                     pointerEvents: 'none',
                                     zIndex: 90
                                 }} />
@@ -802,6 +1152,228 @@ Drag middle to move`}
         return cells;
     }
     
+    // Render the time area of a professional as a single cell: a CSS
+    // gradient draws the grid and slots are positioned by minute offset, so
+    // the DOM size depends on the number of slots rather than on slotDuration
+    renderSlotLayer(professional, professionalSlots, styles, columnCount) {
+        const { startHour, endHour, slotDuration } = this.props;
+        const { dragPreview, isDragging, dragType, creationStart, creationEnd, creationProfessionalId, hoveredCell } = this.state;
+        
+        const hours = endHour - startHour + 1;
+        const spanMinutes = hours * 60;
+        const toPosition = (startMinutes, endMinutes) => ({
+            left: `${((startMinutes - startHour * 60) / spanMinutes) * 100}%`,
+            width: `${((endMinutes - startMinutes) / spanMinutes) * 100}%`
+        });
+        
+        // Convert a mouse event on the layer to a grid-snapped hour and minute
+        const eventToTime = e => {
+            const rect = e.currentTarget.getBoundingClientRect();
+            const fraction = Math.max(0, Math.min(0.9999, (e.clientX - rect.left) / rect.width));
+            const minutes = startHour * 60 + Math.floor((fraction * spanMinutes) / slotDuration) * slotDuration;
+            return { hour: Math.floor(minutes / 60), minute: minutes % 60 };
+        };
+        
+        const slotBeingDragged = isDragging && dragPreview ? dragPreview.id : null;
+        
+        const previewStyle = {
+            position: 'absolute',
+            top: '2px',
+            bottom: '2px',
+            pointerEvents: 'none'
+        };
+        
+        let dragOverlay = null;
+        if (isDragging && dragPreview && dragPreview.professionalId === professional.id) {
+            dragOverlay = (
+                <div style={{
+                    ...previewStyle,
+                    ...toPosition(toMinutes(dragPreview.start), toMinutes(dragPreview.end)),
+                    backgroundColor: dragPreview.overlaps ? OVERLAP_FILL : 'rgba(33, 150, 243, 0.4)',
+                    border: `1px solid ${dragPreview.overlaps ? OVERLAP_BORDER : '#1976D2'}`,
+                    boxSizing: 'border-box',
+                    zIndex: 95
+                }} />
+            );
+        } else if (isDragging && dragType === 'create' && creationProfessionalId === professional.id && creationStart && creationEnd) {
+            const [first, last] = [toMinutes(creationStart), toMinutes(creationEnd)].sort((a, b) => a - b);
+            const blocked = this.creationOverlaps(professional.id, creationStart, creationEnd);
+            dragOverlay = (
+                <div style={{
+                    ...previewStyle,
+                    ...toPosition(first, last),
+                    backgroundColor: blocked ? OVERLAP_FILL : 'rgba(76, 175, 80, 0.4)', // Green for creation
+                    border: `1px dashed ${blocked ? OVERLAP_BORDER : '#388E3C'}`,
+                    boxSizing: 'border-box',
+                    zIndex: 90
+                }} />
+            );
+        }
+        
+        let hoverOverlay = null;
+        if (!isDragging && hoveredCell && hoveredCell.professionalId === professional.id) {
+            const hoverMinutes = hoveredCell.hour * 60 + hoveredCell.minute;
+            hoverOverlay = (
+                <div style={{
+                    ...previewStyle,
+                    ...toPosition(hoverMinutes, hoverMinutes + slotDuration),
+                    top: 0,
+                    bottom: 0,
+                    backgroundColor: 'rgba(33, 150, 243, 0.4)'
+                }}>
+                    <div style={{
+                        position: 'absolute',
+                        bottom: '2px',
+                        left: '100%',
+                        fontSize: '10px',
+                        color: '#666',
+                        backgroundColor: 'rgba(255, 255, 255, 0.8)',
+                        padding: '1px 3px',
+                        borderRadius: '2px',
+                        zIndex: 200,
+                        border: '1px solid #eaeaea',
+                        whiteSpace: 'nowrap'
+                    }}>
+                        {this.formatTime(hoveredCell.hour, hoveredCell.minute)}
+                    </div>
+                </div>
+            );
+        }
+        
+        const layerStyle = {
+            ...styles.dashGanttSlotLayer,
+            backgroundImage: [
+                `repeating-linear-gradient(to right, #eaeaea 0, #eaeaea 1px, transparent 1px, transparent ${100 / hours}%)`,
+                `repeating-linear-gradient(to right, #f5f5f5 0, #f5f5f5 1px, transparent 1px, transparent ${100 / (hours * (60 / slotDuration))}%)`
+            ].join(', ')
+        };
+        
+        return (
+            <td colSpan={columnCount} style={styles.dashGanttSlotLayerCell}>
+                <div
+                    style={layerStyle}
+                    onClick={(e) => {
+                        // Only create a slot on a direct click on empty space if not dragging
+                        if (e.target === e.currentTarget && !this.isCreatingSlot && !this.justFinishedDragging) {
+                            const { hour, minute } = eventToTime(e);
+                            this.handleCreateSlot(professional.id, hour, minute);
+                        }
+                    }}
+                    onMouseMove={(e) => {
+                        if (!isDragging) {
+                            const { hour, minute } = eventToTime(e);
+                            this.handleCellHover(professional.id, hour, minute);
+                        }
+                    }}
+                    onMouseLeave={() => {
+                        if (!isDragging) {
+                            this.handleCellLeave();
+                        }
+                    }}
+                    onMouseDown={(e) => {
+                        // Start creation drag when left-clicking on empty space
+                        if (e.button === 0 && e.target === e.currentTarget) {
+                            const { hour, minute } = eventToTime(e);
+                            this.handleCreationStart(e, professional.id, hour, minute);
+                        }
+                    }}
+                    title={`Click to add a 20-minute slot\nClick and drag to create a custom-length slot`}
+                >
+                    {professionalSlots.map(slot => (
+                        slot.id !== slotBeingDragged &&
+                            this.renderSlotRectangle(slot, toPosition(toMinutes(slot.start), toMinutes(slot.end)))
+                    ))}
+                    {dragOverlay}
+                    {hoverOverlay}
+                </div>
+            </td>
+        );
+    }
+    
+    // Whether the minutes start..end overlap a slot of the professional
+    // other than `excludeId`, in O(log n) through the interval index of
+    // the professional's slots. Always false with allowOverlap.
+    overlapsSlot(professionalId, start, end, excludeId = null) {
+        if (this.props.allowOverlap) {
+            return false;
+        }
+        const slots = this.getSlotGroups().get(professionalId);
+        return Boolean(slots) && intervalIndex(slots).overlaps(start, end, excludeId);
+    }
+    
+    // Whether the slot being created from creationStart to creationEnd
+    // (in either order) would overlap another slot
+    creationOverlaps(professionalId, creationStart, creationEnd) {
+        const [start, end] = [toMinutes(creationStart), toMinutes(creationEnd)].sort((a, b) => a - b);
+        return start !== end && this.overlapsSlot(professionalId, start, end);
+    }
+    
+    // Group timeslots by professional. Groups whose slots did not change
+    // keep their previous array, so unchanged rows can be recognised by
+    // identity in renderRowCells.
+    getSlotGroups() {
+        const { timeslots } = this.state;
+        if (this.slotGroups.timeslots === timeslots) {
+            return this.slotGroups.groups;
+        }
+        
+        const groups = new Map();
+        timeslots.forEach(slot => {
+            const group = groups.get(slot.professionalId);
+            if (group) {
+                group.push(slot);
+            } else {
+                groups.set(slot.professionalId, [slot]);
+            }
+        });
+        
+        const previous = this.slotGroups.groups;
+        groups.forEach((group, professionalId) => {
+            const old = previous.get(professionalId);
+            if (old && old.length === group.length && old.every((slot, i) => slot === group[i])) {
+                groups.set(professionalId, old);
+            }
+        });
+        
+        this.slotGroups = { timeslots, groups };
+        return groups;
+    }
+    
+    // Render the time area of a professional row, reusing the elements of
+    // the previous render when nothing the row depends on has changed.
+    // React skips identical elements, so a drag or hover only re-renders
+    // the rows it touches.
+    renderRowCells(professional, styles, timeColumnCount) {
+        const {
+            startHour, endHour, slotDuration, layout, allowOverlap, backgroundColor, virtualize, height
+        } = this.props;
+        const { isDragging, dragType, dragPreview, creationStart, creationEnd, creationProfessionalId, hoveredCell } = this.state;
+        const slots = this.getSlotGroups().get(professional.id) || EMPTY_SLOTS;
+        const creatingHere = creationProfessionalId === professional.id;
+        
+        // `styles` is rebuilt on every render, so the props it is built
+        // from stand in for it
+        const deps = [
+            slots, startHour, endHour, slotDuration, layout, allowOverlap, backgroundColor, virtualize, height,
+            isDragging, dragType,
+            dragPreview && dragPreview.professionalId === professional.id ? dragPreview : null,
+            creatingHere ? creationStart : null,
+            creatingHere ? creationEnd : null,
+            hoveredCell && hoveredCell.professionalId === professional.id ? hoveredCell : null
+        ];
+        
+        const cached = this.rowCache.get(professional);
+        if (cached && cached.deps.every((value, i) => value === deps[i])) {
+            return cached.element;
+        }
+        
+        const element = layout === 'absolute'
+            ? this.renderSlotLayer(professional, slots, styles, timeColumnCount)
+            : this.generateTimeCells(professional, slots, styles);
+        this.rowCache.set(professional, { deps, element });
+        return element;
+    }
+    
     // Get cached slot width or calculate it if not in cache
     getSlotWidth(slot, slotDuration) {
         if (!slot || !slot.start || !slot.end || !slotDuration) {
@@ -837,8 +1409,18 @@ Drag middle to move`}
         return true;
     }
     
+    componentDidMount() {
+        this.finishRenderTiming(true);
+        this.schedulePerfMetrics();
+        window.addEventListener('resize', this.scheduleViewport);
+        this.containerRef.current.addEventListener('wheel', this.handleWheel, { passive: false });
+        document.addEventListener('keydown', this.handleHistoryKey);
+        document.addEventListener('mousedown', this.handleDocumentMouseDown, true);
+        this.scheduleViewport();
+    }
+    
     // Reset cache when props change
-    componentDidUpdate(prevProps) {
+    componentDidUpdate(prevProps, prevState) {
         // If timeslots change, clear the width cache to ensure correct calculations
         if (prevProps.timeslots !== this.props.timeslots || 
             prevProps.slotDuration !== this.props.slotDuration) {
@@ -846,132 +1428,506 @@ Drag middle to move`}
                 slotWidthCache: {}
             });
         }
+        
+        // A different range of days or hours, or zoom, moves the viewport
+        const { date, days, startHour, endHour, prefetchDays, pixelsPerHour, detailPixelsPerHour } = this.props;
+        
+        // Steps cannot be undone on another date or on rawData replaced by
+        // a callback; the rawData emitted after an edit keeps the history
+        const { rawData, historyLimit } = this.props;
+        this.history.limit = historyLimit;
+        const replaced = prevProps.rawData !== rawData && rawData !== this.emittedRawData;
+        if ((prevProps.date !== date || replaced) && (this.history.canUndo || this.history.canRedo)) {
+            this.history.clear();
+            this.setState({ canUndo: false, canRedo: false });
+        }
+        if (prevProps.pixelsPerHour !== pixelsPerHour && this.zoomAnchor) {
+            const { hours, offset } = this.zoomAnchor;
+            this.zoomAnchor = null;
+            this.containerRef.current.scrollLeft = Math.max(0, hours * pixelsPerHour - offset);
+        }
+        if (prevProps.date !== date || prevProps.days !== days || prevProps.startHour !== startHour ||
+            prevProps.endHour !== endHour || prevProps.prefetchDays !== prefetchDays ||
+            prevProps.pixelsPerHour !== pixelsPerHour || prevProps.detailPixelsPerHour !== detailPixelsPerHour) {
+            this.viewportKey = null;
+            this.scheduleViewport();
+        }
+        
+        if (this.perfEnabled()) {
+            // Renders caused by publishing perfMetrics itself are not counted,
+            // otherwise every publication would schedule the next one
+            this.finishRenderTiming(prevProps.perfMetrics === this.props.perfMetrics);
+            if (this.state.transformTiming && this.state.transformTiming !== prevState.transformTiming) {
+                this.perf.record('transform', this.state.transformTiming.ms);
+            }
+            this.schedulePerfMetrics();
+        }
     }
     
-    // Update raw data when timeslots change
-    updateRawData(timeslots) {
-        const { rawData, onDataChange, setProps } = this.props;
+    perfEnabled() {
+        return this.props.perfMetricsInterval > 0;
+    }
+    
+    // Record the time from the start of render() until React committed it
+    finishRenderTiming(record) {
+        const stop = this.renderTiming;
+        this.renderTiming = null;
+        if (stop && record) {
+            stop();
+        }
+    }
+    
+    // Publish the collected samples through perfMetrics at most once per
+    // perfMetricsInterval, and never in the middle of a drag
+    schedulePerfMetrics() {
+        if (!this.perfEnabled() || this.perfTimer || this.perf.isEmpty()) return;
+        
+        this.perfTimer = setTimeout(() => {
+            this.perfTimer = null;
+            if (this.state.isDragging) {
+                this.schedulePerfMetrics();
+                return;
+            }
+            
+            const { setProps, rawData } = this.props;
+            if (setProps && this.perfEnabled() && !this.perf.isEmpty()) {
+                setProps({
+                    perfMetrics: this.perf.flush({
+                        rows: rowCount(rawData),
+                        slots: this.state.timeslots.length,
+                        professionals: this.state.professionals.length
+                    })
+                });
+            }
+        }, this.props.perfMetricsInterval);
+    }
+    
+    // Watch animation frames during a drag to count dropped frames
+    startFrameMonitor() {
+        if (!this.perfEnabled() || this.frameMonitor) return;
+        
+        let previous = null;
+        const tick = timestamp => {
+            if (previous !== null) {
+                this.perf.recordFrame(timestamp - previous);
+            }
+            previous = timestamp;
+            this.frameMonitor = requestAnimationFrame(tick);
+        };
+        this.frameMonitor = requestAnimationFrame(tick);
+    }
+    
+    stopFrameMonitor() {
+        if (this.frameMonitor) {
+            cancelAnimationFrame(this.frameMonitor);
+            this.frameMonitor = null;
+        }
+    }
+    
+    // Generate an id for a row created in the browser
+    newRowId() {
+        this.newRowCounter += 1;
+        return `new-${Date.now().toString(36)}-${this.newRowCounter}`;
+    }
+    
+    // Compute the rawData fields that a timeslot determines, or null if the
+    // timeslot is invalid
+    slotFields(timeslot) {
+        if (!this.isValidTime(timeslot.start) || !this.isValidTime(timeslot.end)) {
+            console.warn('Skipping invalid timeslot:', timeslot);
+            return null;
+        }
         
-        // Create a fresh array for the updated raw data
-        let updatedRawData = [];
+        const professional = this.state.professionalsById.get(timeslot.professionalId);
+        if (!professional) return null;
         
-        // First, filter existing data if needed
-        if (rawData && rawData.length > 0) {
-            // Keep track of which timeslots are still valid
-            const validTimeslots = new Set();
-            
-            // Generate lookup keys for all currently valid timeslots
-            timeslots.forEach(slot => {
-                const doctorName = this.state.professionals.find(p => p.id === slot.professionalId)?.name;
-                if (doctorName) {
-                    const key = `${slot.date} ${slot.start}_${doctorName}`;
-                    validTimeslots.add(key);
+        const [startHours, startMinutes] = timeslot.start.split(':').map(Number);
+        const [endHours, endMinutes] = timeslot.end.split(':').map(Number);
+        let durationMinutes = (endHours * 60 + endMinutes) - (startHours * 60 + startMinutes);
+        if (durationMinutes < 0) {
+            // End time is on the next day
+            durationMinutes += 24 * 60;
+        }
+        
+        return {
+            datetime: `${timeslot.date} ${timeslot.start}`,
+            laakari: professional.name,
+            kesto_min: durationMinutes,
+            tyhja: timeslot.isBooked ? 0 : 1,
+            bookingProbability: timeslot.bookingProbability || 0.5
+        };
+    }
+    
+    // Build the rawData row for a timeslot, keeping all fields of its source row
+    slotToRow(timeslot) {
+        const fields = this.slotFields(timeslot);
+        if (!fields) return null;
+        
+        const { rawData } = this.props;
+        let originalData = timeslot.rawData;
+        if (!originalData && timeslot.rowIndex !== undefined && rawData) {
+            originalData = isColumnar(rawData) ? rowAt(rawData, timeslot.rowIndex) : rawData[timeslot.rowIndex];
+        }
+        
+        return {
+            ...(originalData || NEW_ROW_DEFAULTS),
+            id: timeslot.rowId,
+            ...fields
+        };
+    }
+    
+    // Report only the changed rows through the rawDataPatch prop
+    emitPatch({ added = [], modified = [], removed = [] }) {
+        const { setProps } = this.props;
+        
+        this.patchSequence += 1;
+        const rawDataPatch = {
+            sequence: this.patchSequence,
+            added: added.map(this.slotToRow).filter(Boolean),
+            modified: modified.map(this.slotToRow).filter(Boolean),
+            removed: removed.map(slot => slot.rowId)
+        };
+        
+        if (this.perfEnabled()) {
+            this.perf.record('payloadBytes', payloadBytes(rawDataPatch));
+        }
+        
+        if (setProps) {
+            setProps({ rawDataPatch });
+        }
+    }
+    
+    // Report an edit made in the chart and record it in the undo history.
+    // `change` lists the added, modified and removed slots, and the
+    // modified slots as they were before as `previous`.
+    commitEdit(timeslots, change) {
+        const { rawData } = this.props;
+        const { professionalsById, date } = this.state;
+        
+        // Steps keep the doctor and the source row of their slots: slot ids
+        // and row positions change when rawData comes back after an edit
+        const detach = slots => (slots || []).map(({ rowIndex, ...slot }) => {
+            const professional = professionalsById.get(slot.professionalId);
+            let source = slot.rawData;
+            if (!source && rowIndex !== undefined && rawData) {
+                source = isColumnar(rawData) ? rowAt(rawData, rowIndex) : rawData[rowIndex];
+            }
+            return { ...slot, laakari: professional ? professional.name : null, rawData: source || null };
+        });
+        
+        this.history.record({
+            date,
+            added: detach(change.added),
+            modified: detach(change.modified),
+            removed: detach(change.removed),
+            previous: detach(change.previous)
+        });
+        this.setState({ canUndo: this.history.canUndo, canRedo: this.history.canRedo });
+        this.updateRawData(timeslots, change);
+    }
+    
+    // Apply an undo or redo step to the current slots and report only the
+    // slots it changes. Slots are found by doctor and start time, like
+    // rawData rows.
+    applyEdit(edit) {
+        const { timeslots, professionals, professionalsById, date } = this.state;
+        if (edit.date !== date) return;
+        
+        const keyOf = (laakari, start) => rowKey(`${date} ${start}`, laakari);
+        const positions = new Map();
+        timeslots.forEach((slot, i) => {
+            const professional = professionalsById.get(slot.professionalId);
+            const key = keyOf(professional ? professional.name : null, slot.start);
+            if (!positions.has(key)) {
+                positions.set(key, i);
+            }
+        });
+        
+        // Position -> replacement slot, or null when removed
+        const replaced = new Map();
+        const find = slot => {
+            const position = positions.get(keyOf(slot.laakari, slot.start));
+            return position !== undefined && !replaced.has(position) ? position : undefined;
+        };
+        
+        const removed = [];
+        edit.removed.forEach(slot => {
+            const position = find(slot);
+            if (position !== undefined) {
+                replaced.set(position, null);
+                removed.push(timeslots[position]);
+            }
+        });
+        
+        const idsByName = new Map(professionals.map(p => [p.name, p.id]));
+        
+        // Modified slots get every recorded field back, e.g. isBooked and
+        // appointmentType, but keep the identity of the current slot and row
+        const modified = [];
+        edit.previous.forEach((slot, i) => {
+            const position = find(slot);
+            if (position !== undefined) {
+                const { laakari, id, rowIndex, rowId, rawData, ...fields } = edit.modified[i];
+                const updated = { ...timeslots[position], ...fields };
+                if (idsByName.has(laakari)) {
+                    updated.professionalId = idsByName.get(laakari);
                 }
-            });
-            
-            // Only keep raw data items that correspond to slots we still have
-            updatedRawData = rawData.filter(item => {
-                // Skip items that don't have the required fields
-                if (!item.datetime || !item.laakari) return false;
-                
-                // Create a key to match against our valid timeslots
-                const key = `${item.datetime}_${item.laakari}`;
-                return validTimeslots.has(key);
-            });
+                replaced.set(position, updated);
+                modified.push(updated);
+            }
+        });
+        
+        let nextId = timeslots.reduce((max, slot) => Math.max(max, slot.id), 0) + 1;
+        const added = [];
+        edit.added.forEach(({ laakari, ...slot }) => {
+            const professionalId = idsByName.get(laakari);
+            if (professionalId !== undefined) {
+                added.push({ ...slot, id: nextId++, professionalId });
+            }
+        });
+        
+        const updatedTimeslots = [];
+        timeslots.forEach((slot, i) => {
+            if (!replaced.has(i)) {
+                updatedTimeslots.push(slot);
+            } else if (replaced.get(i)) {
+                updatedTimeslots.push(replaced.get(i));
+            }
+        });
+        added.forEach(slot => updatedTimeslots.push(slot));
+        
+        this.setState({ timeslots: updatedTimeslots, selectedSlot: null, isAddingSlot: false });
+        this.updateRawData(updatedTimeslots, { added, modified, removed });
+    }
+    
+    handleUndo() {
+        if (this.isTimeline() || this.state.isDragging) return;
+        
+        const edit = this.history.undo();
+        if (edit) {
+            this.applyEdit(edit);
+            this.setState({ canUndo: this.history.canUndo, canRedo: this.history.canRedo });
+        }
+    }
+    
+    handleRedo() {
+        if (this.isTimeline() || this.state.isDragging) return;
+        
+        const edit = this.history.redo();
+        if (edit) {
+            this.applyEdit(edit);
+            this.setState({ canUndo: this.history.canUndo, canRedo: this.history.canRedo });
+        }
+    }
+    
+    // Ctrl+Z undoes, Ctrl+Shift+Z and Ctrl+Y redo, if the chart was clicked
+    // last. Typing in the slot editor keeps the browser's own undo.
+    handleHistoryKey(e) {
+        if (!this.historyFocus || !(e.ctrlKey || e.metaKey)) return;
+        
+        const tag = e.target && e.target.tagName;
+        if (tag === 'INPUT' || tag === 'SELECT' || tag === 'TEXTAREA') return;
+        
+        const key = e.key.toLowerCase();
+        if (key === 'z' && !e.shiftKey) {
+            e.preventDefault();
+            this.handleUndo();
+        } else if (key === 'z' || key === 'y') {
+            e.preventDefault();
+            this.handleRedo();
+        }
+    }
+    
+    handleDocumentMouseDown(e) {
+        this.historyFocus = Boolean(this.rootRef.current && this.rootRef.current.contains(e.target));
+    }
+    
+    // Update raw data when timeslots change. `change` lists the added,
+    // modified and removed slots and is sent as a patch in 'patch' mode.
+    updateRawData(timeslots, change) {
+        if (this.perfEnabled()) {
+            this.perf.measure('update', () => this.writeRawData(timeslots, change));
+        } else {
+            this.writeRawData(timeslots, change);
+        }
+    }
+    
+    writeRawData(timeslots, change) {
+        const { onDataChange, setProps, updateMode } = this.props;
+        
+        if (updateMode === 'patch' && change) {
+            this.emitPatch(change);
+            return;
         }
         
-        // Now process all current timeslots to update or add them
+        // Reconcile on rows; columnar input is decoded here and encoded again below
+        const source = this.props.rawData || [];
+        const columnar = isColumnar(source);
+        const rawData = columnar ? decodeColumnar(source) : source;
+        const rowIndex = this.rowIndexCache.get(source, rawData);
+        const { date } = this.state;
+        
+        // Work out the new row of every timeslot. Slots that still match a row
+        // by (datetime, laakari) replace that row in place, the others are
+        // appended (moved slots keep the fields of their source row).
+        const replaced = new Map();
+        const appended = [];
         timeslots.forEach(timeslot => {
-            // Skip invalid timeslots
-            if (!this.isValidTime(timeslot.start) || !this.isValidTime(timeslot.end)) {
-                console.warn('Skipping invalid timeslot:', timeslot);
+            const fields = this.slotFields(timeslot);
+            if (!fields) return;
+            
+            const position = rowIndex.get(rowKey(fields.datetime, fields.laakari));
+            if (position !== undefined && !replaced.has(position)) {
+                replaced.set(position, { ...rawData[position], ...fields });
                 return;
             }
             
-            const originalData = timeslot.rawData;
-            const doctorName = this.state.professionals.find(p => p.id === timeslot.professionalId)?.name;
-            if (!doctorName) return;
+            const originalData = timeslot.rawData ||
+                (timeslot.rowIndex !== undefined ? rawData[timeslot.rowIndex] : null);
+            appended.push({ ...(originalData || NEW_ROW_DEFAULTS), ...fields });
+        });
+        
+        // Rows of other dates are kept as they are, rows of the displayed date
+        // without a timeslot have been removed
+        const updatedRawData = [];
+        for (let i = 0; i < rawData.length; i++) {
+            const row = rawData[i];
+            if (!row.datetime || !row.laakari) continue;
             
-            // For existing slots
-            if (originalData) {
-                // Calculate duration from start and end time
-                const [startHours, startMinutes] = timeslot.start.split(':').map(Number);
-                const [endHours, endMinutes] = timeslot.end.split(':').map(Number);
-                
-                // Handle crossing midnight if needed
-                let durationMinutes;
-                if (endHours < startHours || (endHours === startHours && endMinutes < startMinutes)) {
-                    // End time is on the next day
-                    durationMinutes = ((endHours + 24) * 60 + endMinutes) - (startHours * 60 + startMinutes);
-                } else {
-                    durationMinutes = (endHours * 60 + endMinutes) - (startHours * 60 + startMinutes);
-                }
-                
-                // Find the corresponding row in the filtered raw data
-                const rowIndex = updatedRawData.findIndex(row => 
-                    row.datetime === `${timeslot.date} ${timeslot.start}` &&
-                    row.laakari === doctorName
-                );
-                
-                if (rowIndex !== -1) {
-                    // Update the existing row
-                    updatedRawData[rowIndex] = {
-                        ...updatedRawData[rowIndex],
-                        datetime: `${timeslot.date} ${timeslot.start}`,
-                        kesto_min: durationMinutes,
-                        tyhja: timeslot.isBooked ? 0 : 1,
-                        bookingProbability: timeslot.bookingProbability || 0.5
-                    };
-                } else {
-                    // The row was removed during filtering, add it back
-                    updatedRawData.push({
-                        datetime: `${timeslot.date} ${timeslot.start}`,
-                        laakari: doctorName,
-                        kesto_min: durationMinutes,
-                        tyhja: timeslot.isBooked ? 0 : 1,
-                        bookingProbability: timeslot.bookingProbability || 0.5
-                    });
-                }
-            } 
-            // For new slots
-            else if (!originalData && timeslot.start && timeslot.end) {
-                // Calculate duration
-                const [startHours, startMinutes] = timeslot.start.split(':').map(Number);
-                const [endHours, endMinutes] = timeslot.end.split(':').map(Number);
-                
-                let durationMinutes;
-                if (endHours < startHours || (endHours === startHours && endMinutes < startMinutes)) {
-                    durationMinutes = ((endHours + 24) * 60 + endMinutes) - (startHours * 60 + startMinutes);
-                } else {
-                    durationMinutes = (endHours * 60 + endMinutes) - (startHours * 60 + startMinutes);
-                }
-                
-                // Create and add a new row
-                updatedRawData.push({
-                    datetime: `${timeslot.date} ${timeslot.start}`,
-                    laakari: doctorName,
-                    kesto_min: durationMinutes,
-                    tyhja: timeslot.isBooked ? 0 : 1,
-                    bookingProbability: timeslot.bookingProbability || 0.5,
-                    toimipiste: "Default",
-                    aikaryhman: "Default",
-                    aikaryhma: "Default",
-                    RESURSSI: "Default",
-                    specialty: "Default",
-                    ETNS_A: 1,
-                    ETNS_B: 1
-                });
+            if (replaced.has(i)) {
+                updatedRawData.push(replaced.get(i));
+            } else if (row.datetime.slice(0, 10) !== date) {
+                updatedRawData.push(row);
             }
-        });
+        }
+        appended.forEach(row => updatedRawData.push(row));
+        
+        // Send edits back in the format the data came in
+        const outputData = columnar ? encodeColumnar(updatedRawData, source) : updatedRawData;
+        
+        // The emitted data comes back as the rawData prop; index it now so
+        // the next edit does not have to
+        this.rowIndexCache.set(outputData, buildRowIndex(updatedRawData));
+        this.emittedRawData = outputData;
         
         // Call the callback if provided
         if (onDataChange) {
-            onDataChange(updatedRawData);
+            onDataChange(outputData);
         }
 
+        if (this.perfEnabled()) {
+            this.perf.record('payloadBytes', payloadBytes(outputData));
+        }
+        
         // Update Dash props if setProps is available
         if (setProps) {
-            setProps({ rawData: updatedRawData });
+            setProps({ rawData: outputData });
+        }
+    }
+    
+    // Measure the time area of the grid: its left edge and the width of an
+    // hour, both in viewport pixels
+    measureGrid() {
+        const table = this.tableRef.current;
+        if (!table) return null;
+        
+        const { startHour, endHour } = this.props;
+        const tableRect = table.getBoundingClientRect();
+        const nameHeader = this.nameHeaderRef.current;
+        const left = nameHeader ? nameHeader.getBoundingClientRect().right : tableRect.left;
+        // The time area ends at the last hour, before the summary column
+        const lastHourHeader = this.lastHourHeaderRef.current;
+        const right = lastHourHeader ? lastHourHeader.getBoundingClientRect().right : tableRect.right;
+        const width = right - left;
+        
+        return { left, width, pixelsPerHour: width / (endHour - startHour + 1) };
+    }
+    
+    // Grid geometry is measured once per drag and again only after a resize
+    // or scroll, so pointer moves never force a layout
+    getGridGeometry() {
+        if (!this.gridGeometry) {
+            this.gridGeometry = this.measureGrid();
+        }
+        return this.gridGeometry;
+    }
+    
+    invalidateGrid() {
+        this.gridGeometry = null;
+        if (this.state.isDragging) {
+            // The grid moved under the pointer, so the preview may have changed
+            this.requestDragFrame();
+        }
+    }
+    
+    // Listen for geometry changes for the duration of a drag
+    watchGrid(watch) {
+        const method = watch ? 'addEventListener' : 'removeEventListener';
+        window[method]('resize', this.invalidateGrid);
+        window[method]('scroll', this.invalidateGrid, true);
+        if (!watch) {
+            this.gridGeometry = null;
+        }
+    }
+    
+    // Convert a pointer x coordinate to a grid-snapped "HH:MM" time
+    pointerToTime(clientX, grid) {
+        const { slotDuration, startHour } = this.props;
+        
+        // Constrain the position to the grid bounds
+        const relativeX = Math.max(0, Math.min(clientX - grid.left, grid.width));
+        
+        // Convert to whole minutes and snap to the grid
+        const minutes = startHour * 60 + Math.floor((relativeX / grid.pixelsPerHour) * 60);
+        const snapped = Math.round(minutes / slotDuration) * slotDuration;
+        
+        // Keep the time within the day
+        return formatMinutes(Math.min(23 * 60 + 59, Math.max(0, snapped)));
+    }
+    
+    // Sample the pointer at most once per animation frame
+    requestDragFrame() {
+        if (this.dragFrame) return;
+        this.dragFrame = requestAnimationFrame(this.updateDragPreview);
+    }
+    
+    cancelDragFrame() {
+        if (this.dragFrame) {
+            cancelAnimationFrame(this.dragFrame);
+            this.dragFrame = null;
+            return true;
+        }
+        return false;
+    }
+    
+    // Update the drag or creation preview from the last pointer position.
+    // State only changes when the snapped times do, so only the row showing
+    // the preview re-renders.
+    updateDragPreview() {
+        this.dragFrame = null;
+        if (!this.state.isDragging || this.pointerX === undefined) return;
+        
+        const stop = this.perfEnabled() ? this.perf.start('drag') : null;
+        try {
+            this.applyDragPointer();
+        } finally {
+            if (stop) stop();
+        }
+    }
+    
+    applyDragPointer() {
+        if (this.state.dragType === 'create') {
+            const creationEnd = this.computeCreationEnd();
+            if (creationEnd && creationEnd !== this.state.creationEnd) {
+                this.setState({ creationEnd });
+            }
+            return;
+        }
+        
+        const dragPreview = this.computeDragPreview();
+        const current = this.state.dragPreview;
+        if (dragPreview && (!current || current.start !== dragPreview.start || current.end !== dragPreview.end)) {
+            this.setState({ dragPreview });
         }
     }
     
@@ -980,19 +1936,16 @@ Drag middle to move`}
         e.stopPropagation();
         if (slot.isBooked) return;
         
-        // For move operations, capture the initial mouse position and offset
-        const initialMouseX = e.clientX;
-        let initialOffset = 0;
+        // Measure the grid once for the whole drag
+        this.gridGeometry = this.measureGrid();
+        this.pointerX = e.clientX;
         
-        if (type === 'move' && this.tableRef.current) {
-            const tableRect = this.tableRef.current.getBoundingClientRect();
-            // Calculate initial offset based on the position within the slot
+        // For move operations, capture the offset of the pointer within the slot
+        let initialOffset = 0;
+        if (type === 'move' && this.gridGeometry) {
+            const { left, pixelsPerHour } = this.gridGeometry;
             const slotStart = this.timeToDecimal(slot.start) - this.props.startHour;
-            const hoursPerDay = this.props.endHour - this.props.startHour;
-            const pixelsPerHour = tableRect.width / hoursPerDay;
-            
-            // Calculate offset from the start of the slot in pixels
-            initialOffset = initialMouseX - (tableRect.left + slotStart * pixelsPerHour);
+            initialOffset = e.clientX - (left + slotStart * pixelsPerHour);
         }
         
         this.setState({
@@ -1001,101 +1954,63 @@ Drag middle to move`}
             draggedSlot: slot,
             originalSlot: { ...slot },
             dragPreview: { ...slot }, // Start with original slot as preview for smoother transitions
-            initialMouseX,
+            initialMouseX: e.clientX,
             initialOffset
         });
 
         document.addEventListener('mousemove', this.handleDrag);
         document.addEventListener('mouseup', this.handleDragEnd);
+        this.watchGrid(true);
+        this.startFrameMonitor();
     }
 
     handleDrag(e) {
-        if (!this.state.isDragging || !this.tableRef.current) return;
-
-        const { slotDuration, startHour, endHour } = this.props;
+        if (!this.state.isDragging) return;
+        this.pointerX = e.clientX;
+        this.requestDragFrame();
+    }
+    
+    // Compute the slot a move or resize drag would produce at the last pointer position
+    computeDragPreview() {
+        const { slotDuration } = this.props;
         const { draggedSlot, dragType, initialOffset } = this.state;
+        const grid = this.getGridGeometry();
         
         // If no draggedSlot is available, bail out early
-        if (!draggedSlot) return;
-
-        // Get accurate table dimensions
-        const tableRect = this.tableRef.current.getBoundingClientRect();
-        const hoursPerDay = endHour - startHour;
-        const pixelsPerHour = tableRect.width / hoursPerDay;
-        
-        // Calculate relative mouse position with offset adjustment for "move" operations
-        let relativeX;
-        if (dragType === 'move') {
-            relativeX = e.clientX - tableRect.left - initialOffset;
-        } else {
-            relativeX = e.clientX - tableRect.left;
-        }
-        
-        // Constrain the position to the table bounds
-        relativeX = Math.max(0, Math.min(relativeX, tableRect.width));
-        
-        // Convert pixel position to time
-        const hoursFromStart = relativeX / pixelsPerHour;
-        const totalHours = startHour + hoursFromStart;
+        if (!draggedSlot || !grid) return null;
         
-        // Calculate hours and minutes, ensuring we have a valid hour (never negative)
-        const hour = Math.max(0, Math.floor(totalHours));
-        const minute = Math.floor((totalHours - hour) * 60);
-        
-        // Snap to grid
-        const snappedMinute = Math.round(minute / slotDuration) * slotDuration;
-        
-        // Ensure we don't end up with 60 minutes (should roll over to next hour)
-        const adjustedMinute = snappedMinute >= 60 ? 0 : snappedMinute;
-        const adjustedHour = snappedMinute >= 60 ? hour + 1 : hour;
-        
-        // Format the time string with guaranteed positive hours
-        const newTime = `${Math.min(23, Math.max(0, adjustedHour)).toString().padStart(2, '0')}:${adjustedMinute.toString().padStart(2, '0')}`;
+        const newTime = this.pointerToTime(
+            dragType === 'move' ? this.pointerX - initialOffset : this.pointerX,
+            grid
+        );
         
         // Create a copy of the slot to update
         const updatedSlot = { ...draggedSlot };
+        const start = toMinutes(draggedSlot.start);
+        const end = toMinutes(draggedSlot.end);
+        const newMinutes = toMinutes(newTime);
         
         if (dragType === 'move') {
-            // For moving, calculate duration and preserve it
-            const startDecimal = this.timeToDecimal(draggedSlot.start);
-            const endDecimal = this.timeToDecimal(draggedSlot.end);
-            const duration = endDecimal - startDecimal;
-            
-            // Set new start time based on grid-snapped position
+            // For moving, preserve the duration
             updatedSlot.start = newTime;
-            
-            // Calculate new end time by adding the duration
-            const newEndDecimal = this.timeToDecimal(newTime) + duration;
-            // Using our decimalToTime helper, ensuring we validate the result
-            updatedSlot.end = this.decimalToTime(newEndDecimal);
+            updatedSlot.end = formatMinutes(newMinutes + (end - start));
         } else if (dragType === 'start') {
             // For resizing the start, ensure it doesn't go past the end
-            const endDecimal = this.timeToDecimal(draggedSlot.end);
-            const newStartDecimal = this.timeToDecimal(newTime);
-            
-            if (newStartDecimal < endDecimal) {
-                updatedSlot.start = newTime;
-            } else {
-                // If trying to drag start beyond end, cap it
-                updatedSlot.start = this.decimalToTime(endDecimal - (slotDuration / 60));
-            }
+            updatedSlot.start = newMinutes < end ? newTime : formatMinutes(end - slotDuration);
         } else if (dragType === 'end') {
             // For resizing the end, ensure it doesn't go before the start
-            const startDecimal = this.timeToDecimal(draggedSlot.start);
-            const newEndDecimal = this.timeToDecimal(newTime);
-            
-            if (newEndDecimal > startDecimal) {
-                updatedSlot.end = newTime;
-            } else {
-                // If trying to drag end before start, cap it
-                updatedSlot.end = this.decimalToTime(startDecimal + (slotDuration / 60));
-            }
+            updatedSlot.end = newMinutes > start ? newTime : formatMinutes(start + slotDuration);
         }
         
-        // Verify all time values are valid before updating state
+        // Verify all time values are valid before using them
         if (this.isValidTime(updatedSlot.start) && this.isValidTime(updatedSlot.end)) {
-            this.setState({ dragPreview: updatedSlot });
+            // Flag a drop onto another slot, the preview turns red
+            updatedSlot.overlaps = this.overlapsSlot(
+                draggedSlot.professionalId, toMinutes(updatedSlot.start), toMinutes(updatedSlot.end), draggedSlot.id
+            );
+            return updatedSlot;
         }
+        return null;
     }
 
     // 2. Add this helper method to check if a time string is valid
@@ -1114,11 +2029,18 @@ Drag middle to move`}
     }
 
     handleDragEnd(e) {
-        const { isDragging, dragPreview, draggedSlot, originalSlot, dragType } = this.state;
+        const { isDragging, draggedSlot } = this.state;
         if (!isDragging || !draggedSlot) return;
 
         document.removeEventListener('mousemove', this.handleDrag);
         document.removeEventListener('mouseup', this.handleDragEnd);
+        
+        // Apply a pointer move that has not been rendered yet
+        const dragPreview = this.cancelDragFrame()
+            ? (this.computeDragPreview() || this.state.dragPreview)
+            : this.state.dragPreview;
+        this.watchGrid(false);
+        this.stopFrameMonitor();
 
         // Store a reference to the slot we're working with
         const slotId = draggedSlot.id;
@@ -1134,8 +2056,8 @@ Drag middle to move`}
             const startTime = this.timeToDecimal(dragPreview.start);
             const endTime = this.timeToDecimal(dragPreview.end);
 
-            if (endTime <= startTime) {
-                // Invalid time range, revert to original
+            if (endTime <= startTime || dragPreview.overlaps) {
+                // Invalid time range or a drop onto another slot, revert to original
                 this.setState({
                     isDragging: false,
                     dragType: null,
@@ -1170,7 +2092,10 @@ Drag middle to move`}
                     dragPreview: null
                 });
 
-                this.updateRawData(updatedTimeslots);
+                this.commitEdit(updatedTimeslots, {
+                    modified: [updatedTimeslots[slotIndex]],
+                    previous: [timeslots[slotIndex]]
+                });
             } else {
                 // If the slot wasn't found (shouldn't happen), just reset drag state
                 console.warn('Could not find slot to update:', slotId);
@@ -1215,48 +2140,27 @@ Drag middle to move`}
         
         this.isCreatingSlot = true;
         
+        // Measure the grid once for the whole drag
+        this.gridGeometry = this.measureGrid();
+        this.pointerX = e.clientX;
+        
         // Add event listeners for drag and end
         document.addEventListener('mousemove', this.handleCreationDrag);
         document.addEventListener('mouseup', this.handleCreationEnd);
+        this.watchGrid(true);
+        this.startFrameMonitor();
     }
 
     handleCreationDrag(e) {
-        if (!this.isCreatingSlot || !this.tableRef.current) return;
-        
-        const { slotDuration, startHour, endHour } = this.props;
-        const { creationStart } = this.state;
-        
-        // Get table dimensions
-        const tableRect = this.tableRef.current.getBoundingClientRect();
-        const hoursPerDay = endHour - startHour;
-        const pixelsPerHour = tableRect.width / hoursPerDay;
-        
-        // Calculate relative mouse position
-        const relativeX = e.clientX - tableRect.left;
-        
-        // Constrain the position to the table bounds
-        const boundedX = Math.max(0, Math.min(relativeX, tableRect.width));
-        
-        // Convert pixel position to time
-        const hoursFromStart = boundedX / pixelsPerHour;
-        const totalHours = startHour + hoursFromStart;
-        
-        // Calculate hours and minutes, ensuring we have a valid hour (never negative)
-        const hour = Math.max(0, Math.floor(totalHours));
-        const minute = Math.floor((totalHours - hour) * 60);
-        
-        // Snap to grid
-        const snappedMinute = Math.round(minute / slotDuration) * slotDuration;
-        
-        // Ensure we don't end up with 60 minutes (should roll over to next hour)
-        const adjustedMinute = snappedMinute >= 60 ? 0 : snappedMinute;
-        const adjustedHour = snappedMinute >= 60 ? hour + 1 : hour;
-        
-        // Format the time string with guaranteed positive hours
-        const newTime = `${Math.min(23, Math.max(0, adjustedHour)).toString().padStart(2, '0')}:${adjustedMinute.toString().padStart(2, '0')}`;
-        
-        // Update the end time
-        this.setState({ creationEnd: newTime });
+        if (!this.isCreatingSlot) return;
+        this.pointerX = e.clientX;
+        this.requestDragFrame();
+    }
+    
+    // Compute the end time of a creation drag at the last pointer position
+    computeCreationEnd() {
+        const grid = this.getGridGeometry();
+        return grid ? this.pointerToTime(this.pointerX, grid) : null;
     }
 
     handleCreationEnd(e) {
@@ -1266,7 +2170,13 @@ Drag middle to move`}
         document.removeEventListener('mousemove', this.handleCreationDrag);
         document.removeEventListener('mouseup', this.handleCreationEnd);
         
-        const { creationStart, creationEnd, creationProfessionalId } = this.state;
+        // Apply a pointer move that has not been rendered yet
+        const { creationStart, creationProfessionalId } = this.state;
+        const creationEnd = this.cancelDragFrame()
+            ? (this.computeCreationEnd() || this.state.creationEnd)
+            : this.state.creationEnd;
+        this.watchGrid(false);
+        this.stopFrameMonitor();
         
         // Sort the times to ensure start is before end
         let startTime = creationStart;
@@ -1281,8 +2191,8 @@ Drag middle to move`}
             [startTime, endTime] = [endTime, startTime];
         }
         
-        // Only create a slot if the times are different
-        if (startTime !== endTime) {
+        // Only create a slot if the times are different and free
+        if (startTime !== endTime && !this.creationOverlaps(creationProfessionalId, startTime, endTime)) {
             const { timeslots, date } = this.state;
             
             // Create new slot
@@ -1297,6 +2207,7 @@ Drag middle to move`}
                 isBooked: false,
                 appointmentType: 'In-person appointment',
                 resource: 'Default',
+                rowId: this.newRowId(),
                 rawData: null // New slot has no original data
             };
             
@@ -1311,9 +2222,9 @@ Drag middle to move`}
                 creationProfessionalId: null
             });
             
-            this.updateRawData(updatedTimeslots);
+            this.commitEdit(updatedTimeslots, { added: [slotToAdd] });
         } else {
-            // If start and end are the same, just reset the state
+            // If start and end are the same or taken, just reset the state
             this.setState({
                 isDragging: false,
                 dragType: null,
@@ -1333,6 +2244,167 @@ Drag middle to move`}
         document.removeEventListener('mouseup', this.handleDragEnd);
         document.removeEventListener('mousemove', this.handleCreationDrag);
         document.removeEventListener('mouseup', this.handleCreationEnd);
+        this.watchGrid(false);
+        this.stopFrameMonitor();
+        this.cancelDragFrame();
+        
+        if (this.scrollFrame) {
+            cancelAnimationFrame(this.scrollFrame);
+        }
+        if (this.perfTimer) {
+            clearTimeout(this.perfTimer);
+        }
+        window.removeEventListener('resize', this.scheduleViewport);
+        document.removeEventListener('keydown', this.handleHistoryKey);
+        document.removeEventListener('mousedown', this.handleDocumentMouseDown, true);
+        if (this.containerRef.current) {
+            this.containerRef.current.removeEventListener('wheel', this.handleWheel);
+        }
+        if (this.viewportTimer) {
+            clearTimeout(this.viewportTimer);
+        }
+    }
+    
+    // Track the scroll position at most once per animation frame, and only
+    // re-render when the first visible row changes
+    handleScroll(e) {
+        this.scheduleViewport();
+        if (!this.props.virtualize) return;
+        
+        this.pendingScrollTop = e.currentTarget.scrollTop;
+        if (this.scrollFrame) return;
+        
+        this.scrollFrame = requestAnimationFrame(() => {
+            this.scrollFrame = null;
+            const scrollTop = this.pendingScrollTop;
+            if (Math.floor(scrollTop / ROW_HEIGHT) !== Math.floor(this.state.scrollTop / ROW_HEIGHT)) {
+                this.setState({ scrollTop });
+            }
+        });
+    }
+    
+    isTimeline() {
+        return this.props.days > 1;
+    }
+    
+    // Report the viewport once scrolling or resizing has paused for
+    // VIEWPORT_DELAY milliseconds
+    scheduleViewport() {
+        if (!this.isTimeline()) return;
+        
+        if (this.viewportTimer) {
+            clearTimeout(this.viewportTimer);
+        }
+        this.viewportTimer = setTimeout(this.publishViewport, VIEWPORT_DELAY);
+    }
+    
+    // Find the visible window of the multi-day timeline, drop the days more
+    // than twice prefetchDays away from it and request, through viewport,
+    // the days within prefetchDays that are not loaded yet at the current
+    // level of detail
+    publishViewport() {
+        this.viewportTimer = null;
+        const container = this.containerRef.current;
+        if (!container || !this.isTimeline()) return;
+        
+        const { date, days, startHour, endHour, prefetchDays, pixelsPerHour, setProps } = this.props;
+        const visible = visibleWindow({
+            date,
+            days,
+            startHour,
+            endHour,
+            hourWidth: pixelsPerHour,
+            scrollLeft: container.scrollLeft,
+            width: Math.max(pixelsPerHour, container.clientWidth - NAME_COLUMN_WIDTH)
+        });
+        const { firstDay, lastDay } = visible;
+        const dates = dayRange(date, days);
+        const keepFrom = dates[Math.max(0, firstDay - 2 * prefetchDays)];
+        const keepTo = dates[Math.min(days - 1, lastDay + 2 * prefetchDays)];
+        
+        const level = DashGantt.timelineLevel(this.props);
+        const loaded = this.state[LEVEL_DAYS[level]];
+        const missing = prefetchOrder(firstDay, lastDay, prefetchDays, days)
+            .map(index => dates[index])
+            .filter(day => !loaded.has(day));
+        
+        const changes = {};
+        Object.values(LEVEL_DAYS).forEach(key => {
+            const current = this.state[key];
+            const evicted = Array.from(current.keys()).filter(day => day < keepFrom || day > keepTo);
+            if (evicted.length || (current === loaded && missing.length)) {
+                const next = new Map(current);
+                evicted.forEach(day => next.delete(day));
+                if (current === loaded) {
+                    missing.forEach(day => next.set(day, null));
+                    changes.professionals = DashGantt.timelineRows(next);
+                }
+                changes[key] = next;
+            }
+        });
+        if (Object.keys(changes).length) {
+            this.setState(changes);
+        }
+        
+        const key = `${visible.start}/${visible.end}/${level}`;
+        if (setProps && (key !== this.viewportKey || missing.length)) {
+            this.viewportKey = key;
+            setProps({
+                viewport: {
+                    start: visible.start,
+                    end: visible.end,
+                    dates: dates.slice(firstDay, lastDay + 1),
+                    detail: level,
+                    missing
+                }
+            });
+        }
+    }
+    
+    // Zoom the multi-day timeline with ctrl+wheel, keeping the time under
+    // the pointer in place. Registered as a non-passive listener so the
+    // browser's page zoom can be prevented.
+    handleWheel(e) {
+        if (!this.isTimeline() || !e.ctrlKey || !this.props.setProps) return;
+        e.preventDefault();
+        
+        const { pixelsPerHour, setProps } = this.props;
+        const next = Math.max(MIN_PIXELS_PER_HOUR, Math.min(MAX_PIXELS_PER_HOUR,
+            e.deltaY < 0 ? pixelsPerHour * ZOOM_STEP : pixelsPerHour / ZOOM_STEP));
+        if (next === pixelsPerHour) return;
+        
+        const container = this.containerRef.current;
+        const offset = Math.max(0, e.clientX - container.getBoundingClientRect().left - NAME_COLUMN_WIDTH);
+        this.zoomAnchor = { hours: (container.scrollLeft + offset) / pixelsPerHour, offset };
+        setProps({ pixelsPerHour: next });
+    }
+    
+    // Get the [start, end) range of professional rows to mount
+    getVisibleRowRange() {
+        const { virtualize, height, overscan } = this.props;
+        const { professionals, scrollTop, isDragging, dragPreview, creationProfessionalId } = this.state;
+        const count = professionals.length;
+        
+        if (!virtualize) {
+            return { start: 0, end: count };
+        }
+        
+        let start = Math.max(0, Math.floor(scrollTop / ROW_HEIGHT) - overscan);
+        let end = Math.min(count, Math.ceil((scrollTop + height) / ROW_HEIGHT) + overscan);
+        
+        // Keep the row of an ongoing drag mounted even if it scrolls out of view
+        const activeProfessionalId = isDragging
+            ? (creationProfessionalId || (dragPreview && dragPreview.professionalId))
+            : null;
+        if (activeProfessionalId) {
+            const activeIndex = professionals.findIndex(p => p.id === activeProfessionalId);
+            if (activeIndex !== -1) {
+                start = Math.min(start, activeIndex);
+                end = Math.max(end, activeIndex + 1);
+            }
+        }
+        
+        return { start, end };
     }
     
     // Add this utility method to reset all drag-related state
@@ -1342,6 +2414,9 @@ Drag middle to move`}
         document.removeEventListener('mouseup', this.handleDragEnd);
         document.removeEventListener('mousemove', this.handleCreationDrag);
         document.removeEventListener('mouseup', this.handleCreationEnd);
+        this.watchGrid(false);
+        this.stopFrameMonitor();
+        this.cancelDragFrame();
         
         // Reset all drag-related state
         this.setState({
@@ -1360,13 +2435,209 @@ Drag middle to move`}
         this.justFinishedDragging = false;
     }
     
+    // Render the slots of one professional on one day of the multi-day
+    // timeline. Slots are shown read-only; a day's cell is reused for as
+    // long as its slots do not change.
+    renderDayCell(date, slots, styles) {
+        const { startHour, endHour } = this.props;
+        const cacheable = slots !== EMPTY_SLOTS;
+        const cached = cacheable && this.dayCellCache.get(slots);
+        if (cached && cached.startHour === startHour && cached.endHour === endHour) {
+            return cached.element;
+        }
+        
+        const spanMinutes = (endHour - startHour + 1) * 60;
+        const element = (
+            <td key={date} style={styles.dashGanttSlotLayerCell}>
+                <div style={styles.dashGanttDayLayer}>
+                    {slots.map(slot => {
+                        const startMinutes = toMinutes(slot.start);
+                        return (
+                            <div
+                                key={`slot-${slot.id}`}
+                                style={{
+                                    ...styles.dashGanttDaySlot,
+                                    left: `${((startMinutes - startHour * 60) / spanMinutes) * 100}%`,
+                                    width: `${(slot.durationMinutes / spanMinutes) * 100}%`,
+                                    backgroundColor: this.getProbabilityColor(slot)
+                                }}
+                                title={`${date} ${slot.start} - ${slot.end}
+${slot.isBooked ? 'Status: Booked' : `Booking probability: ${Math.round((slot.bookingProbability || 0.5) * 100)}%`}`}
+                            />
+                        );
+                    })}
+                </div>
+            </td>
+        );
+        if (cacheable) {
+            this.dayCellCache.set(slots, { startHour, endHour, element });
+        }
+        return element;
+    }
+    
+    // Render the hourly occupancy of one professional on one day of the
+    // zoomed-out timeline as a single element, whose background has one
+    // band per hour colored by its expected fill. The DOM size therefore
+    // depends on the number of professionals and days only.
+    renderOccupancyCell(date, bins, styles) {
+        const { startHour, endHour } = this.props;
+        const cached = this.dayCellCache.get(bins);
+        if (cached && cached.startHour === startHour && cached.endHour === endHour) {
+            return cached.element;
+        }
+        
+        const hours = endHour - startHour + 1;
+        const bands = [];
+        let booked = 0;
+        let available = 0;
+        let expected = 0;
+        for (let hour = startHour; hour <= endHour; hour++) {
+            const bin = bins[hour % 24];
+            let color = 'transparent';
+            if (bin) {
+                const total = bin[0] + bin[1];
+                // Expected fill: booked minutes plus expected bookings of the free ones
+                color = total ? this.getProbabilityColor({ bookingProbability: (bin[0] + bin[2]) / total }) : color;
+                booked += bin[0];
+                available += bin[1];
+                expected += bin[2];
+            }
+            const from = ((hour - startHour) / hours) * 100;
+            bands.push(`${color} ${from}% ${from + 100 / hours}%`);
+        }
+        
+        const total = booked + available;
+        const element = (
+            <td key={date} style={styles.dashGanttSlotLayerCell}>
+                <div
+                    style={{
+                        ...styles.dashGanttDayLayer,
+                        backgroundImage: `${styles.dashGanttDayLayer.backgroundImage}, linear-gradient(to right, ${bands.join(', ')})`
+                    }}
+                    title={`${date}
+Booked: ${Math.round(booked / 6) / 10} h, available: ${Math.round(available / 6) / 10} h
+Expected fill: ${total ? Math.round(((booked + expected) / total) * 100) : 0}%`}
+                />
+            </td>
+        );
+        this.dayCellCache.set(bins, { startHour, endHour, element });
+        return element;
+    }
+    
+    // Render a cell of the summary column or row: the share of booked
+    // minutes, with the minutes and expected fill as a tooltip. The totals
+    // come precomputed from the server through the summary prop.
+    renderSummaryCell(key, totals, styles, colSpan = 1) {
+        if (!totals) {
+            return <td key={key} colSpan={colSpan} style={styles.dashGanttSummaryCell} />;
+        }
+        
+        const percent = value => (value === null || value === undefined ? '–' : `${Math.round(value * 100)}%`);
+        return (
+            <td
+                key={key}
+                colSpan={colSpan}
+                style={styles.dashGanttSummaryCell}
+                title={`Booked: ${Math.round(totals.booked / 6) / 10} h, available: ${Math.round(totals.available / 6) / 10} h
+Expected fill: ${percent(totals.expectedUtilization)}`}
+            >
+                {percent(totals.utilization)}
+            </td>
+        );
+    }
+    
+    // Render the table of the multi-day timeline: one column per day, one
+    // row per professional. Zoomed out below detailPixelsPerHour, cells show
+    // hourly occupancy instead of slots. Days that were never requested are
+    // hatched.
+    renderTimeline(styles) {
+        const { date, days, startHour, endHour, pixelsPerHour } = this.props;
+        const { professionals } = this.state;
+        const occupancyLevel = DashGantt.timelineLevel(this.props) === 'occupancy';
+        const loadedDays = occupancyLevel ? this.state.loadedOccupancy : this.state.loadedDays;
+        const dates = dayRange(date, days);
+        const hours = endHour - startHour + 1;
+        
+        // Label every hour, or every few hours when zoomed out
+        const labelStep = Math.ceil(HOUR_LABEL_WIDTH / pixelsPerHour);
+        const hourLabels = [];
+        for (let hour = startHour; hour <= endHour; hour += labelStep) {
+            hourLabels.push(
+                <span key={hour} style={{ ...styles.dashGanttDayHour, width: `${labelStep * pixelsPerHour}px` }}>
+                    {`${(hour % 24).toString().padStart(2, '0')}:00`}
+                </span>
+            );
+        }
+        
+        const { start: firstRow, end: lastRow } = this.getVisibleRowRange();
+        const renderSpacer = (key, rows) => (rows > 0 ? (
+            <tr key={key} style={{ height: `${rows * ROW_HEIGHT}px` }}>
+                <td colSpan={1 + days} style={styles.dashGanttSpacerCell} />
+            </tr>
+        ) : null);
+        
+        return (
+            <table ref={this.tableRef} style={{ ...styles.dashGanttTable, width: `${NAME_COLUMN_WIDTH + days * hours * pixelsPerHour}px` }}>
+                <thead>
+                    <tr style={styles.dashGanttHeaderRow}>
+                        <th ref={this.nameHeaderRef} style={{ ...styles.dashGanttFirstHeaderCell, ...styles.dashGanttStickyName, zIndex: 350 }}></th>
+                        {dates.map(day => (
+                            <th key={day} style={{ ...styles.dashGanttHeaderCell, padding: '6px 0 4px', width: `${hours * pixelsPerHour}px` }}>
+                                <div>{day}</div>
+                                <div style={{ display: 'flex', overflow: 'hidden', fontSize: '11px', color: '#888' }}>{hourLabels}</div>
+                            </th>
+                        ))}
+                    </tr>
+                </thead>
+                <tbody>
+                    {renderSpacer('spacer-top', firstRow)}
+                    {professionals.slice(firstRow, lastRow).map(professional => (
+                        <tr key={`row-${professional.name}`} style={styles.dashGanttRow}>
+                            <td style={{ ...styles.dashGanttProfessionalCell, ...styles.dashGanttStickyName }}>
+                                {professional.name}
+                            </td>
+                            {dates.map(day => {
+                                const loaded = loadedDays.get(day);
+                                if (loaded === undefined) {
+                                    return <td key={day} style={{ ...styles.dashGanttSlotLayerCell, ...styles.dashGanttDayPending }} />;
+                                }
+                                const group = loaded && loaded.groups.get(professional.name);
+                                if (occupancyLevel) {
+                                    return group
+                                        ? this.renderOccupancyCell(day, group, styles)
+                                        : <td key={day} style={styles.dashGanttSlotLayerCell}><div style={styles.dashGanttDayLayer} /></td>;
+                                }
+                                return this.renderDayCell(day, group || EMPTY_SLOTS, styles);
+                            })}
+                        </tr>
+                    ))}
+                    {renderSpacer('spacer-bottom', professionals.length - lastRow)}
+                </tbody>
+            </table>
+        );
+    }
+    
     render() {
-        const { id, date, startHour, endHour, slotDuration, backgroundColor } = this.props;
-        const { professionals, timeslots } = this.state;
+        if (this.perfEnabled() && !this.renderTiming) {
+            this.renderTiming = this.perf.start('render');
+        }
+        
+        const { id, date, days, startHour, endHour, slotDuration, backgroundColor, virtualize, height, layout, summary, historyLimit } = this.props;
+        const { professionals } = this.state;
+        const timeline = this.isTimeline();
+        
+        // Utilization totals are shown as a column per professional and a
+        // row per hour, in the single-day view only
+        const summaryColumn = Boolean(summary && summary.professionals);
+        const summaryRow = Boolean(summary && (summary.hours || summary.total));
         
         // Calculate number of time slots per hour (e.g., 12 for 5-minute slots)
         const slotsPerHour = 60 / slotDuration;
         
+        // The absolute layout uses one table column per hour instead of one per slot
+        const absoluteLayout = layout === 'absolute';
+        const columnsPerHour = absoluteLayout ? 1 : slotsPerHour;
+        
         // Calculate total number of slots in the timeline
         const totalSlots = (endHour - startHour) * slotsPerHour;
         
@@ -1387,6 +2658,8 @@ Drag middle to move`}
                 borderRadius: '4px', // Less rounded corners for clean look
                 overflow: 'hidden',
                 overflowX: 'auto',
+                // With virtualization the container scrolls vertically as well
+                ...(virtualize ? { overflowY: 'auto', maxHeight: `${height}px` } : {}),
                 boxShadow: 'none' // No shadow for minimalist look
             },
             dashGanttTable: {
@@ -1407,15 +2680,71 @@ Drag middle to move`}
                 borderBottom: '1px solid #eaeaea',
                 fontSize: '14px',
                 color: '#444',
-                position: 'relative'
+                position: 'relative',
+                // Keep the time header visible while scrolling virtualized rows
+                ...(virtualize ? { position: 'sticky', top: 0, zIndex: 300, backgroundColor: backgroundColor || '#ffffff' } : {})
             },
             dashGanttFirstHeaderCell: {
                 width: '150px',
                 borderRight: '1px solid #eaeaea', // Changed from #aaaaaa to match other cells
-                borderBottom: '1px solid #eaeaea'
+                borderBottom: '1px solid #eaeaea',
+                ...(virtualize ? { position: 'sticky', top: 0, zIndex: 300, backgroundColor: backgroundColor || '#ffffff' } : {})
             },
             dashGanttRow: {
-                height: '60px'
+                height: `${ROW_HEIGHT}px`
+            },
+            dashGanttSpacerCell: {
+                padding: 0,
+                border: 'none'
+            },
+            dashGanttSlotLayerCell: {
+                padding: 0,
+                borderBottom: '1px solid #eaeaea',
+                height: `${ROW_HEIGHT}px`
+            },
+            dashGanttSlotLayer: {
+                position: 'relative',
+                height: `${ROW_HEIGHT}px`,
+                cursor: 'pointer'
+            },
+            dashGanttDayLayer: {
+                position: 'relative',
+                height: `${ROW_HEIGHT}px`,
+                overflow: 'hidden',
+                borderRight: '1px solid #d0d0d0',
+                boxSizing: 'border-box',
+                backgroundImage: `repeating-linear-gradient(to right, #eaeaea 0, #eaeaea 1px, transparent 1px, transparent ${100 / (endHour - startHour + 1)}%)`
+            },
+            dashGanttDaySlot: {
+                position: 'absolute',
+                top: '2px',
+                bottom: '2px',
+                boxSizing: 'border-box',
+                borderRight: '1px solid rgba(255, 255, 255, 0.6)'
+            },
+            dashGanttDayHour: {
+                flex: 'none',
+                overflow: 'hidden'
+            },
+            dashGanttDayPending: {
+                borderRight: '1px solid #d0d0d0',
+                backgroundImage: 'repeating-linear-gradient(45deg, #f7f7f7 0, #f7f7f7 6px, transparent 6px, transparent 12px)'
+            },
+            dashGanttStickyName: {
+                position: 'sticky',
+                left: 0,
+                zIndex: 250,
+                backgroundColor: backgroundColor || '#ffffff'
+            },
+            dashGanttSummaryCell: {
+                padding: '8px',
+                textAlign: 'center',
+                borderRight: '1px solid #eaeaea',
+                borderBottom: '1px solid #eaeaea',
+                backgroundColor: '#fafafa',
+                verticalAlign: 'middle',
+                fontSize: '13px',
+                color: '#444'
             },
             dashGanttProfessionalCell: {
                 width: '150px',
@@ -1434,7 +2763,7 @@ Drag middle to move`}
                 borderRight: '1px solid #f5f5f5', // Very subtle grid lines
                 borderBottom: '1px solid #eaeaea',
                 cursor: 'pointer',
-                height: '60px',
+                height: `${ROW_HEIGHT}px`,
                 // We're setting a minimum width based on a reasonable cell size
                 minWidth: '5px', 
                 width: `${100 / totalSlots}%`,
@@ -1506,6 +2835,10 @@ Drag middle to move`}
                 backgroundColor: '#2196F3', // Using blue for primary action
                 color: 'white'
             },
+            dashGanttFormError: {
+                color: OVERLAP_BORDER,
+                fontSize: '14px'
+            },
             dashGanttFormActionsCancel: {
                 backgroundColor: '#f5f5f5',
                 color: '#333'
@@ -1541,7 +2874,8 @@ Drag middle to move`}
                 cells.push(
                     <th 
                         key={`header-${hour}`} 
-                        colSpan={slotsPerHour}
+                        ref={hour === endHour ? this.lastHourHeaderRef : undefined}
+                        colSpan={columnsPerHour}
                         style={styles.dashGanttHeaderCell}
                     >
                         {timeLabel}
@@ -1551,31 +2885,88 @@ Drag middle to move`}
             
             return cells;
         };
+        
+        // Only mount the professional rows in (or near) the viewport and
+        // reserve the height of the others with spacer rows
+        const { start: firstRow, end: lastRow } = this.getVisibleRowRange();
+        const visibleProfessionals = professionals.slice(firstRow, lastRow);
+        const timeColumnCount = (endHour - startHour + 1) * columnsPerHour;
+        const columnCount = 1 + timeColumnCount + (summaryColumn ? 1 : 0);
+        const hours = Array.from({ length: endHour - startHour + 1 }, (_, i) => startHour + i);
+        const saveBlocked = this.editorOverlaps();
+        const renderSpacer = (key, rows) => (rows > 0 ? (
+            <tr key={key} style={{ height: `${rows * ROW_HEIGHT}px` }}>
+                <td colSpan={columnCount} style={styles.dashGanttSpacerCell} />
+            </tr>
+        ) : null);
 
         return (
-            <div id={id} style={styles.dashGantt}>
+            <div id={id} ref={this.rootRef} style={styles.dashGantt}>
                 <div style={styles.dashGanttHeader}>
-                    <h2>Schedule for {date}</h2>
+                    <h2>Schedule for {timeline ? `${date} – ${addDays(date, days - 1)}` : date}</h2>
+                    {!timeline && historyLimit > 0 ? (
+                        <div style={styles.dashGanttFormActions}>
+                            <button
+                                style={{...styles.dashGanttFormActionsButton, ...styles.dashGanttFormActionsCancel}}
+                                onClick={this.handleUndo}
+                                disabled={!this.state.canUndo}
+                                title="Undo (Ctrl+Z)"
+                            >
+                                Undo
+                            </button>
+                            <button
+                                style={{...styles.dashGanttFormActionsButton, ...styles.dashGanttFormActionsCancel}}
+                                onClick={this.handleRedo}
+                                disabled={!this.state.canRedo}
+                                title="Redo (Ctrl+Shift+Z)"
+                            >
+                                Redo
+                            </button>
+                        </div>
+                    ) : null}
                 </div>
-                <div style={styles.dashGanttContainer}>
-                    <table ref={this.tableRef} style={styles.dashGanttTable}>
-                        <thead>
-                            <tr style={styles.dashGanttHeaderRow}>
-                                <th style={styles.dashGanttFirstHeaderCell}></th>
-                                {generateHourHeaderCells()}
-                            </tr>
-                        </thead>
-                        <tbody>
-                            {professionals.map(professional => (
-                                <tr key={`row-${professional.id}`} style={styles.dashGanttRow}>
-                                    <td style={styles.dashGanttProfessionalCell}>
-                                        {professional.name}
-                                    </td>
-                                    {this.generateTimeCells(professional, styles)}
+                <div
+                    ref={this.containerRef}
+                    style={styles.dashGanttContainer}
+                    onScroll={virtualize || timeline ? this.handleScroll : undefined}
+                >
+                    {timeline ? this.renderTimeline(styles) : (
+                        <table ref={this.tableRef} style={styles.dashGanttTable}>
+                            <thead>
+                                <tr style={styles.dashGanttHeaderRow}>
+                                    <th ref={this.nameHeaderRef} style={styles.dashGanttFirstHeaderCell}></th>
+                                    {generateHourHeaderCells()}
+                                    {summaryColumn ? <th style={styles.dashGanttHeaderCell}>Utilization</th> : null}
                                 </tr>
-                            ))}
-                        </tbody>
-                    </table>
+                            </thead>
+                            <tbody>
+                                {renderSpacer('spacer-top', firstRow)}
+                                {visibleProfessionals.map(professional => (
+                                    <tr key={`row-${professional.id}`} style={styles.dashGanttRow}>
+                                        <td style={styles.dashGanttProfessionalCell}>
+                                            {professional.name}
+                                        </td>
+                                        {this.renderRowCells(professional, styles, timeColumnCount)}
+                                        {summaryColumn
+                                            ? this.renderSummaryCell('summary', summary.professionals[professional.name], styles)
+                                            : null}
+                                    </tr>
+                                ))}
+                                {renderSpacer('spacer-bottom', professionals.length - lastRow)}
+                            </tbody>
+                            {summaryRow ? (
+                                <tfoot>
+                                    <tr style={styles.dashGanttRow}>
+                                        <td style={styles.dashGanttProfessionalCell}>Utilization</td>
+                                        {hours.map(hour => this.renderSummaryCell(
+                                            `summary-${hour}`, (summary.hours || {})[hour], styles, columnsPerHour
+                                        ))}
+                                        {summaryColumn ? this.renderSummaryCell('summary-total', summary.total, styles) : null}
+                                    </tr>
+                                </tfoot>
+                            ) : null}
+                        </table>
+                    )}
                 </div>
                 
                 {/* Render slot editor */}
@@ -1635,10 +3026,16 @@ Drag middle to move`}
                                     }}
                                 />
                             </div>
+                            {saveBlocked ? (
+                                <div style={styles.dashGanttFormError}>
+                                    The slot overlaps another slot of this professional.
+                                </div>
+                            ) : null}
                             <div style={styles.dashGanttFormActions}>
                                 <button 
                                     style={{...styles.dashGanttFormActionsButton, ...styles.dashGanttFormActionsSave}}
                                     onClick={this.handleSaveSlot}
+                                    disabled={saveBlocked}
                                 >
                                     Save
                                 </button>
@@ -1672,24 +3069,96 @@ DashGantt.defaultProps = {
     endHour: 23,
     slotDuration: 5,
     backgroundColor: '#f5f5f5',
-    onDataChange: null
+    onDataChange: null,
+    updateMode: 'full',
+    predictions: null,
+    rawDataPatch: null,
+    virtualize: false,
+    height: 600,
+    overscan: 5,
+    layout: 'cells',
+    perfMetricsInterval: 0,
+    perfMetrics: null,
+    days: 1,
+    prefetchDays: 1,
+    viewport: null,
+    pixelsPerHour: 60,
+    detailPixelsPerHour: 20,
+    occupancy: null,
+    summary: null,
+    allowOverlap: false,
+    historyLimit: 100
 };
 
 DashGantt.propTypes = {
     id: PropTypes.string,
-    rawData: PropTypes.arrayOf(
-        PropTypes.shape({
-            datetime: PropTypes.string.isRequired,
-            laakari: PropTypes.string.isRequired,
-            kesto_min: PropTypes.number.isRequired,
-            tyhja: PropTypes.number.isRequired
-        })
-    ),
+    rawData: PropTypes.oneOfType([
+        PropTypes.arrayOf(
+            PropTypes.shape({
+                datetime: PropTypes.string.isRequired,
+                laakari: PropTypes.string.isRequired,
+                kesto_min: PropTypes.number.isRequired,
+                tyhja: PropTypes.number.isRequired
+            })
+        ),
+        PropTypes.objectOf(
+            PropTypes.oneOfType([
+                PropTypes.array,
+                PropTypes.shape({
+                    categories: PropTypes.array,
+                    codes: PropTypes.arrayOf(PropTypes.number)
+                })
+            ])
+        )
+    ]),
     date: PropTypes.string,
     startHour: PropTypes.number,
     endHour: PropTypes.number,
     slotDuration: PropTypes.number,
     backgroundColor: PropTypes.string,
     onDataChange: PropTypes.func,
+    updateMode: PropTypes.oneOf(['full', 'patch']),
+    predictions: PropTypes.objectOf(PropTypes.number),
+    rawDataPatch: PropTypes.shape({
+        sequence: PropTypes.number,
+        added: PropTypes.arrayOf(PropTypes.object),
+        modified: PropTypes.arrayOf(PropTypes.object),
+        removed: PropTypes.arrayOf(
+            PropTypes.oneOfType([PropTypes.string, PropTypes.number])
+        )
+    }),
+    virtualize: PropTypes.bool,
+    height: PropTypes.number,
+    overscan: PropTypes.number,
+    layout: PropTypes.oneOf(['cells', 'absolute']),
+    perfMetricsInterval: PropTypes.number,
+    perfMetrics: PropTypes.object,
+    days: PropTypes.number,
+    prefetchDays: PropTypes.number,
+    viewport: PropTypes.shape({
+        start: PropTypes.string,
+        end: PropTypes.string,
+        dates: PropTypes.arrayOf(PropTypes.string),
+        detail: PropTypes.oneOf(['slots', 'occupancy']),
+        missing: PropTypes.arrayOf(PropTypes.string)
+    }),
+    pixelsPerHour: PropTypes.number,
+    detailPixelsPerHour: PropTypes.number,
+    occupancy: PropTypes.objectOf(
+        PropTypes.oneOfType([
+            PropTypes.array,
+            PropTypes.shape({
+                categories: PropTypes.array,
+                codes: PropTypes.arrayOf(PropTypes.number)
+            })
+        ])
+    ),
+    summary: PropTypes.shape({
+        professionals: PropTypes.objectOf(PropTypes.object),
+        hours: PropTypes.objectOf(PropTypes.object),
+        total: PropTypes.object
+    }),
+    allowOverlap: PropTypes.bool,
+    historyLimit: PropTypes.number,
     setProps: PropTypes.func
 };
@@ -0,0 +1,105 @@
+/**
+ * Helpers for reading and writing rawData in either of its two formats.
+ *
+ * Row format is a list of objects, one per timeslot:
+ *   [{datetime: '2024-01-01 08:00', laakari: 'Dr. A', kesto_min: 20, ...}, ...]
+ *
+ * Columnar format is an object of equally long arrays, one per field:
+ *   {datetime: ['2024-01-01 08:00', ...], kesto_min: [20, ...], ...}
+ * String columns with few distinct values may be dictionary-encoded as
+ *   {categories: ['Dr. A', 'Dr. B'], codes: [0, 0, 1, ...]}
+ * where each code is an index into categories.
+ */
+
+// Check whether rawData uses the columnar format
+export const isColumnar = rawData => Boolean(rawData) && !Array.isArray(rawData);
+
+// Check whether a column is dictionary-encoded
+export const isEncoded = column =>
+    Boolean(column) && !Array.isArray(column) && Array.isArray(column.codes);
+
+// Number of rows in rawData of either format, or in another columnar
+// table such as occupancy. All columns are equally long.
+export function rowCount(rawData) {
+    if (!rawData) return 0;
+    if (!isColumnar(rawData)) return rawData.length;
+
+    const column = rawData.datetime || Object.values(rawData)[0];
+    if (!column) return 0;
+    return isEncoded(column) ? column.codes.length : column.length;
+}
+
+// Return a function reading one field of row i, without materializing rows
+export function fieldAccessor(rawData, name) {
+    if (!isColumnar(rawData)) {
+        return i => rawData[i][name];
+    }
+
+    const column = rawData[name];
+    if (!column) {
+        return () => undefined;
+    }
+    if (isEncoded(column)) {
+        const { categories, codes } = column;
+        return i => categories[codes[i]];
+    }
+    return i => column[i];
+}
+
+// Materialize a single row of columnar rawData
+export function rowAt(columns, i) {
+    const row = {};
+    Object.keys(columns).forEach(name => {
+        row[name] = fieldAccessor(columns, name)(i);
+    });
+    return row;
+}
+
+// Decode columnar rawData into a list of row objects
+export function decodeColumnar(columns) {
+    const names = Object.keys(columns);
+    const accessors = names.map(name => fieldAccessor(columns, name));
+    const length = rowCount(columns);
+    const rows = new Array(length);
+
+    for (let i = 0; i < length; i++) {
+        const row = {};
+        for (let c = 0; c < names.length; c++) {
+            row[names[c]] = accessors[c](i);
+        }
+        rows[i] = row;
+    }
+    return rows;
+}
+
+// Encode a list of rows as columnar rawData, dictionary-encoding the same
+// columns that are encoded in `template`
+export function encodeColumnar(rows, template = {}) {
+    const names = new Set(Object.keys(template));
+    rows.forEach(row => {
+        Object.keys(row).forEach(name => names.add(name));
+    });
+
+    const columns = {};
+    names.forEach(name => {
+        const values = rows.map(row => (row[name] === undefined ? null : row[name]));
+        if (!isEncoded(template[name])) {
+            columns[name] = values;
+            return;
+        }
+
+        const categories = [];
+        const lookup = new Map();
+        const codes = values.map(value => {
+            let code = lookup.get(value);
+            if (code === undefined) {
+                code = categories.length;
+                lookup.set(value, code);
+                categories.push(value);
+            }
+            return code;
+        });
+        columns[name] = { categories, codes };
+    });
+    return columns;
+}
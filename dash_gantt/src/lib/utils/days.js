@@ -0,0 +1,71 @@
+/**
+ * Day arithmetic and the visible window of the multi-day timeline.
+ *
+ * Dates are "YYYY-MM-DD" strings. They are computed in UTC, so daylight
+ * saving changes never skip or repeat a date.
+ */
+import { formatMinutes } from './time';
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+// The date `count` days after (or before, if negative) `date`
+export function addDays(date, count) {
+    return new Date(Date.parse(`${date}T00:00:00Z`) + count * DAY_MS).toISOString().slice(0, 10);
+}
+
+// `count` consecutive dates starting at `date`
+export function dayRange(date, count) {
+    const dates = [];
+    for (let i = 0; i < count; i++) {
+        dates.push(addDays(date, i));
+    }
+    return dates;
+}
+
+// "YYYY-MM-DD HH:MM" of a minute offset from midnight of `date`, which may
+// run into the following days
+function datetimeAt(date, minutes) {
+    return `${addDays(date, Math.floor(minutes / 1440))} ${formatMinutes(minutes)}`;
+}
+
+/**
+ * Visible part of a timeline of `days` days starting at `date`. Every day
+ * shows the hours startHour..endHour, `hourWidth` pixels each, and the
+ * time area is `width` pixels wide and scrolled by `scrollLeft`.
+ *
+ * Returns the indices of the first and last (partly) visible day and the
+ * visible `start` and `end` as datetimes, rounded outwards to whole hours.
+ */
+export function visibleWindow({ date, days, startHour, endHour, hourWidth, scrollLeft, width }) {
+    const hours = endHour - startHour + 1;
+    const total = days * hours;
+    const first = Math.max(0, Math.min(total - 1, Math.floor(scrollLeft / hourWidth)));
+    const last = Math.max(first + 1, Math.min(total, Math.ceil((scrollLeft + width) / hourWidth)));
+
+    const firstDay = Math.floor(first / hours);
+    const lastDay = Math.floor((last - 1) / hours);
+    return {
+        firstDay,
+        lastDay,
+        start: datetimeAt(addDays(date, firstDay), (startHour + first - firstDay * hours) * 60),
+        end: datetimeAt(addDays(date, lastDay), (startHour + last - lastDay * hours) * 60)
+    };
+}
+
+// Indices of the days to keep loaded, nearest first: the visible days, then
+// up to `prefetch` days on either side, alternating later and earlier
+export function prefetchOrder(firstDay, lastDay, prefetch, days) {
+    const order = [];
+    for (let i = firstDay; i <= lastDay; i++) {
+        order.push(i);
+    }
+    for (let distance = 1; distance <= prefetch; distance++) {
+        if (lastDay + distance < days) {
+            order.push(lastDay + distance);
+        }
+        if (firstDay - distance >= 0) {
+            order.push(firstDay - distance);
+        }
+    }
+    return order;
+}
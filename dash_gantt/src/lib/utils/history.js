@@ -0,0 +1,71 @@
+/**
+ * Undo/redo history of schedule edits.
+ *
+ * A step holds only the slots an edit touched, never a copy of the
+ * schedule: the `added` and `removed` slots, and the `modified` slots
+ * together with their `previous` versions. Undoing a step applies its
+ * inverse, which swaps added with removed and modified with previous, so
+ * undo and redo report just as few rows as the edit itself.
+ */
+
+// The edit that reverts `edit`
+export function invertEdit(edit) {
+    return {
+        ...edit,
+        added: edit.removed,
+        removed: edit.added,
+        modified: edit.previous,
+        previous: edit.modified
+    };
+}
+
+export class EditHistory {
+    constructor(limit = 100) {
+        this.limit = limit;
+        this.undoStack = [];
+        this.redoStack = [];
+    }
+
+    get canUndo() {
+        return this.undoStack.length > 0;
+    }
+
+    get canRedo() {
+        return this.redoStack.length > 0;
+    }
+
+    // Record a new edit. The oldest steps beyond `limit` are dropped, and
+    // the edits that were undone can no longer be redone.
+    record(edit) {
+        if (this.limit <= 0) return;
+
+        this.undoStack.push(edit);
+        if (this.undoStack.length > this.limit) {
+            this.undoStack.splice(0, this.undoStack.length - this.limit);
+        }
+        this.redoStack = [];
+    }
+
+    // The edit that undoes the last step, or null
+    undo() {
+        const edit = this.undoStack.pop();
+        if (!edit) return null;
+
+        this.redoStack.push(edit);
+        return invertEdit(edit);
+    }
+
+    // The last undone edit, to apply again, or null
+    redo() {
+        const edit = this.redoStack.pop();
+        if (!edit) return null;
+
+        this.undoStack.push(edit);
+        return edit;
+    }
+
+    clear() {
+        this.undoStack = [];
+        this.redoStack = [];
+    }
+}
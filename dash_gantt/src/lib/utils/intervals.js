@@ -0,0 +1,80 @@
+/**
+ * Sorted interval index of the slots of one professional, for overlap
+ * checks while dragging.
+ *
+ * Slots are sorted by start minute, and every position also holds the
+ * latest end of the slots up to it and the slot it belongs to, plus the
+ * runner-up. Whether a range overlaps any other slot then takes one binary
+ * search, even if the data already contains overlapping slots.
+ */
+import { toMinutes } from './time';
+
+// Index per slot array, see intervalIndex
+const indexCache = new WeakMap();
+
+export class IntervalIndex {
+    constructor(slots) {
+        const intervals = slots
+            .map(slot => ({ id: slot.id, start: toMinutes(slot.start), end: toMinutes(slot.end) }))
+            .sort((a, b) => a.start - b.start);
+
+        this.starts = intervals.map(interval => interval.start);
+        this.latestEnd = [];
+        this.latestId = [];
+        this.runnerUpEnd = [];
+
+        let latestEnd = -Infinity;
+        let latestId = null;
+        let runnerUpEnd = -Infinity;
+        intervals.forEach(({ id, start, end }) => {
+            if (end > latestEnd) {
+                runnerUpEnd = latestEnd;
+                latestEnd = end;
+                latestId = id;
+            } else if (end > runnerUpEnd) {
+                runnerUpEnd = end;
+            }
+            this.latestEnd.push(latestEnd);
+            this.latestId.push(latestId);
+            this.runnerUpEnd.push(runnerUpEnd);
+        });
+    }
+
+    // Number of slots starting before `minute`
+    countBefore(minute) {
+        let low = 0;
+        let high = this.starts.length;
+        while (low < high) {
+            const middle = (low + high) >> 1;
+            if (this.starts[middle] < minute) {
+                low = middle + 1;
+            } else {
+                high = middle;
+            }
+        }
+        return low;
+    }
+
+    // Whether the minutes start..end overlap a slot other than `excludeId`
+    overlaps(start, end, excludeId = null) {
+        const count = this.countBefore(end);
+        if (count === 0) {
+            return false;
+        }
+
+        const last = count - 1;
+        const latestEnd = this.latestId[last] === excludeId ? this.runnerUpEnd[last] : this.latestEnd[last];
+        return latestEnd > start;
+    }
+}
+
+// Index of a slot array, built once per array. The slot groups of
+// DashGantt keep their array while a professional's slots are unchanged.
+export function intervalIndex(slots) {
+    let index = indexCache.get(slots);
+    if (!index) {
+        index = new IntervalIndex(slots);
+        indexCache.set(slots, index);
+    }
+    return index;
+}
@@ -0,0 +1,42 @@
+/**
+ * Date partitioning of rawData.
+ *
+ * The row positions of a rawData object are grouped by date in a single
+ * scan, and the grouping is remembered for as long as the rawData object is
+ * alive. Switching between dates of an already loaded multi-day rawData is
+ * then a Map lookup instead of another pass over every row.
+ */
+import { fieldAccessor, rowCount } from './columnar';
+
+const partitions = new WeakMap();
+
+// Date part of a "YYYY-MM-DD HH:MM" datetime
+const dateOf = datetime => {
+    const separator = datetime.indexOf(' ');
+    return separator === -1 ? datetime : datetime.slice(0, separator);
+};
+
+// Map of date -> positions of its rows in rawData (of either format)
+export function partitionByDate(rawData) {
+    let partition = partitions.get(rawData);
+    if (partition) return partition;
+
+    partition = new Map();
+    const datetimeAt = fieldAccessor(rawData, 'datetime');
+    const length = rowCount(rawData);
+    for (let i = 0; i < length; i++) {
+        const datetime = datetimeAt(i);
+        if (typeof datetime !== 'string') continue;
+
+        const date = dateOf(datetime);
+        let rows = partition.get(date);
+        if (!rows) {
+            rows = [];
+            partition.set(date, rows);
+        }
+        rows.push(i);
+    }
+
+    partitions.set(rawData, partition);
+    return partition;
+}
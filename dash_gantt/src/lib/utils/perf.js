@@ -0,0 +1,114 @@
+/**
+ * Lightweight performance telemetry for DashGantt.
+ *
+ * Durations are measured with performance.now() and, where the browser
+ * supports it, also recorded as User Timing measures named `dash-gantt:<name>`
+ * so they show up in the browser's performance panel. Samples are kept per
+ * metric in a bounded reservoir, so a long session never grows the payload
+ * published through the perfMetrics prop.
+ */
+
+// Samples kept per metric between two publications
+const MAX_SAMPLES = 200;
+
+// Duration of a frame at 60 fps
+const FRAME_MS = 1000 / 60;
+
+export const now = () => (typeof performance !== 'undefined' ? performance.now() : Date.now());
+
+const userTiming = typeof performance !== 'undefined' &&
+    typeof performance.mark === 'function' &&
+    typeof performance.measure === 'function';
+
+const round = value => Math.round(value * 1000) / 1000;
+
+export class PerfRecorder {
+    constructor() {
+        this.sequence = 0;
+        this.reset();
+    }
+
+    reset() {
+        this.samples = {};
+        this.counts = {};
+        this.droppedFrames = 0;
+        this.dragFrames = 0;
+    }
+
+    // Start timing `name`; call the returned function to stop
+    start(name) {
+        const startTime = now();
+        if (userTiming) {
+            performance.mark(`dash-gantt:${name}:start`);
+        }
+        return () => {
+            if (userTiming) {
+                try {
+                    performance.measure(`dash-gantt:${name}`, `dash-gantt:${name}:start`);
+                } catch (e) {
+                    // The start mark may have been cleared by another measure
+                }
+            }
+            this.record(name, now() - startTime);
+        };
+    }
+
+    // Time a function call
+    measure(name, fn) {
+        const stop = this.start(name);
+        try {
+            return fn();
+        } finally {
+            stop();
+        }
+    }
+
+    // Add a sample, replacing a random one once the reservoir is full
+    record(name, value) {
+        const count = (this.counts[name] || 0) + 1;
+        this.counts[name] = count;
+
+        const samples = this.samples[name] || (this.samples[name] = []);
+        if (samples.length < MAX_SAMPLES) {
+            samples.push(round(value));
+        } else {
+            const slot = Math.floor(Math.random() * count);
+            if (slot < MAX_SAMPLES) {
+                samples[slot] = round(value);
+            }
+        }
+    }
+
+    // Count the frames a drag missed from the time between two frames
+    recordFrame(delta) {
+        this.dragFrames += 1;
+        this.droppedFrames += Math.max(0, Math.round(delta / FRAME_MS) - 1);
+    }
+
+    isEmpty() {
+        return Object.keys(this.counts).length === 0 && this.dragFrames === 0;
+    }
+
+    // Return the collected samples as a perfMetrics payload and start over
+    flush(context) {
+        this.sequence += 1;
+        const payload = {
+            sequence: this.sequence,
+            timestamp: Date.now(),
+            ...context,
+            samples: this.samples,
+            counts: this.counts,
+            droppedFrames: this.droppedFrames,
+            dragFrames: this.dragFrames
+        };
+        this.reset();
+        return payload;
+    }
+}
+
+// Size in bytes of a value once serialized as JSON
+export function payloadBytes(value) {
+    const json = JSON.stringify(value);
+    if (!json) return 0;
+    return typeof TextEncoder !== 'undefined' ? new TextEncoder().encode(json).length : json.length;
+}
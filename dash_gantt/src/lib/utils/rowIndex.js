@@ -0,0 +1,51 @@
+/**
+ * Hash indexes used to reconcile timeslots with rawData rows.
+ *
+ * A row is identified by its start time and doctor, i.e. the key
+ *   `${datetime}_${laakari}`
+ * and the index maps that key to the position of the row in rawData, so
+ * finding the row of a timeslot costs one Map lookup instead of a scan.
+ */
+
+// Key of a row or timeslot
+export const rowKey = (datetime, laakari) => `${datetime}_${laakari}`;
+
+// Index a list of rows by key. When several rows share a key the first one
+// wins, matching the order a linear search would find them in.
+export function buildRowIndex(rows) {
+    const index = new Map();
+    for (let i = 0; i < rows.length; i++) {
+        const row = rows[i];
+        if (!row || !row.datetime || !row.laakari) continue;
+
+        const key = rowKey(row.datetime, row.laakari);
+        if (!index.has(key)) {
+            index.set(key, i);
+        }
+    }
+    return index;
+}
+
+// Remember the index of the last rawData seen, so an unchanged rawData (or
+// the rawData the component itself emitted) is never indexed twice. `source`
+// is the rawData prop, `rows` the same data as a list of rows (columnar input
+// is decoded by the caller; positions are the same in both formats).
+export class RowIndexCache {
+    constructor() {
+        this.source = null;
+        this.index = new Map();
+    }
+
+    get(source, rows = source) {
+        if (source !== this.source) {
+            this.source = source;
+            this.index = buildRowIndex(rows || []);
+        }
+        return this.index;
+    }
+
+    set(source, index) {
+        this.source = source;
+        this.index = index;
+    }
+}
@@ -0,0 +1,17 @@
+/**
+ * Integer minute arithmetic on "HH:MM" time strings.
+ */
+
+// Minutes since midnight of a "HH:MM" string
+export function toMinutes(time) {
+    const separator = time.indexOf(':');
+    return Number(time.slice(0, separator)) * 60 + Number(time.slice(separator + 1));
+}
+
+// Format minutes since midnight as "HH:MM", wrapping around at midnight
+export function formatMinutes(minutes) {
+    const wrapped = ((minutes % 1440) + 1440) % 1440;
+    const hours = Math.floor(wrapped / 60);
+    const rest = wrapped % 60;
+    return `${hours < 10 ? '0' : ''}${hours}:${rest < 10 ? '0' : ''}${rest}`;
+}
@@ -0,0 +1,66 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from dash_gantt.background import ScoringJobs
+from dash_gantt.predict import FunctionModel, Scorer
+
+
+def predict(features):
+    return np.asarray(features['kesto_min'], dtype=float) / 1000
+
+
+def slow_predict(features):
+    time.sleep(0.05)
+    return predict(features)
+
+
+def schedule(count):
+    return [
+        {'id': position, 'datetime': '2024-01-01 08:00', 'laakari': 'Dr. A', 'kesto_min': position, 'tyhja': 1}
+        for position in range(count)
+    ]
+
+
+def wait(jobs, job_id):
+    predictions = {}
+    for _ in range(200):
+        result = jobs.poll(job_id)
+        predictions.update(result['predictions'])
+        if result['finished']:
+            return result, predictions
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+def test_jobs_stream_scores_from_a_process_pool():
+    scorer = Scorer(FunctionModel(predict, ['kesto_min']))
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        jobs = ScoringJobs(scorer, executor=executor, batch_size=10)
+        job_id = jobs.submit(schedule(45))
+        result, predictions = wait(jobs, job_id)
+
+    assert result['done'] == result['total'] == 45
+    assert result['error'] is None
+    assert predictions == {position: position / 1000 for position in range(45)}
+    # Scores reached the cache of the scorer in this process
+    assert scorer.stats()['entries'] == 45
+    assert job_id not in jobs
+    with pytest.raises(KeyError):
+        jobs.poll(job_id)
+
+
+def test_jobs_can_be_replaced_and_report_errors():
+    jobs = ScoringJobs(Scorer(FunctionModel(slow_predict, ['kesto_min'])), batch_size=1)
+    jobs.submit(schedule(20), job_id='session')
+    # Resubmitting under the same id cancels the running job
+    jobs.submit(schedule(2), job_id='session')
+    result, predictions = wait(jobs, 'session')
+    assert result['total'] == 2 and predictions == {0: 0.0, 1: 0.001}
+
+    broken = ScoringJobs(Scorer(FunctionModel(lambda features: [0.5], ['kesto_min'])))
+    result, _ = wait(broken, broken.submit(schedule(3)))
+    assert result['error'].startswith('ValueError')
+    assert broken.stats() == {'submitted': 1, 'failed': 1, 'running': 0, 'jobs': 0}
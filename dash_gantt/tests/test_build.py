@@ -0,0 +1,19 @@
+import json
+import os
+
+from dash_gantt import DashGantt
+
+PACKAGE = os.path.join(os.path.dirname(__file__), '..', 'dash_gantt')
+
+
+# The bundle and metadata.json are generated by `npm run build` from
+# src/lib; DashGantt.py has to describe the props the bundle accepts
+def test_build_matches_component_props():
+    with open(os.path.join(PACKAGE, 'metadata.json')) as f:
+        props = json.load(f)['src/lib/components/DashGantt.react.js']['props']
+    data_props = {name for name, prop in props.items() if prop['type']['name'] != 'func'}
+    assert data_props == set(DashGantt()._prop_names)
+
+    with open(os.path.join(PACKAGE, 'dash_gantt.min.js')) as f:
+        bundle = f.read()
+    assert all(name in bundle for name in DashGantt()._prop_names)
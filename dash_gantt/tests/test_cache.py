@@ -0,0 +1,95 @@
+from dash_gantt.cache import ScheduleCache
+
+
+def load(date):
+    return [
+        {'id': 1, 'datetime': f'{date} 08:00', 'laakari': 'Dr. A', 'kesto_min': 20, 'tyhja': 1},
+        {'id': 2, 'datetime': f'{date} 09:00', 'laakari': 'Dr. A', 'kesto_min': 20, 'tyhja': 0},
+    ]
+
+
+def test_cache_counts_hits_and_misses_per_session():
+    cache = ScheduleCache(load)
+
+    rows, version = cache.get('a', '2024-01-01')
+    cache.get('a', '2024-01-01')
+    cache.get('b', '2024-01-01')
+
+    assert len(rows) == 2
+    assert version == 0
+    assert cache.stats() == {'hits': 1, 'misses': 2, 'evictions': 0, 'entries': 2, 'rows': 4}
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ScheduleCache(load, max_entries=2)
+
+    cache.get('a', '2024-01-01')
+    cache.get('a', '2024-01-02')
+    cache.get('a', '2024-01-01')
+    cache.get('a', '2024-01-03')
+
+    assert ('a', '2024-01-01') in cache
+    assert ('a', '2024-01-02') not in cache
+    assert cache.evictions == 1
+
+    cache = ScheduleCache(load, max_rows=3)
+    cache.get('a', '2024-01-01')
+    cache.get('a', '2024-01-02')
+    assert len(cache) == 1
+
+
+def test_cache_applies_patches_and_bumps_version():
+    cache = ScheduleCache(load)
+    cache.get('a', '2024-01-01')
+
+    version = cache.apply_patch('a', '2024-01-01', {
+        'added': [{'id': 'new-1', 'datetime': '2024-01-01 10:00', 'laakari': 'Dr. B', 'kesto_min': 20, 'tyhja': 1}],
+        'modified': [{'id': 1, 'kesto_min': 40}],
+        'removed': [2],
+    })
+    rows, current = cache.get('a', '2024-01-01')
+
+    assert version == current == 1
+    assert [(row['id'], row['kesto_min']) for row in rows] == [(1, 40), ('new-1', 20)]
+    assert cache.stats()['rows'] == 2
+
+
+def test_cache_never_patches_an_evicted_entry():
+    cache = ScheduleCache(load, max_entries=1)
+    cache.get('a', '2024-01-01')
+    stale = cache._entry('a', '2024-01-01')
+    cache.get('b', '2024-01-01')
+    assert ('a', '2024-01-01') not in cache
+
+    # The entry is evicted between the lookup and the patch
+    lookups = iter([stale])
+    entry = cache._entry
+    cache._entry = lambda session_id, date: next(lookups, None) or entry(session_id, date)
+    cache.apply_patch('a', '2024-01-01', {'removed': [2]})
+
+    rows, version = cache.get('a', '2024-01-01')
+    assert [row['id'] for row in rows] == [1]
+    assert version == 1
+    assert cache.stats()['rows'] == 1
+
+
+def test_derived_state_is_patched_and_evicted_with_the_rows():
+    class Counter:
+        def __init__(self, rows):
+            self.rows = len(rows)
+
+        def apply_patch(self, patch):
+            self.rows += len(patch.get('added', [])) - len(patch.get('removed', []))
+
+    cache = ScheduleCache(load, max_entries=1)
+    counter = cache.derived('a', '2024-01-01', 'count', Counter)
+    assert counter.rows == 2
+    assert cache.derived('a', '2024-01-01', 'count', Counter) is counter
+
+    cache.apply_patch('a', '2024-01-01', {'removed': [1]})
+    assert counter.rows == 1
+
+    cache.get('b', '2024-01-01')
+    rebuilt = cache.derived('a', '2024-01-01', 'count', Counter)
+    assert rebuilt is not counter
+    assert rebuilt.rows == 2
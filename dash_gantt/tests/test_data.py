@@ -0,0 +1,82 @@
+import pandas as pd
+import pytest
+
+from dash_gantt.data import format_datetimes, raw_data_to_frame, to_raw_data
+
+
+def make_frame():
+    return pd.DataFrame({
+        'datetime': ['2024-01-01 08:00', '2024-01-01 08:20', 'not a date'],
+        'toimipiste': ['Lääkäriasema Koski'] * 3,
+        'aikaryhman': ['In-person appointment'] * 3,
+        'aikaryhma': ['IA'] * 3,
+        'laakari': ['Dr. A', 'Dr. B', 'Dr. A'],
+        'RESURSSI': ['Gynecology'] * 3,
+        'ETNS': ['Obstetrics'] * 3,
+        'ETNS_A': [1, 1, 1],
+        'kesto_min': [20, 60, 20],
+        'ETNS_B': [1, 1, 1],
+        'tyhja': [1, 0, 1],
+    })
+
+
+def test_to_raw_data_formats_rows():
+    raw_data = to_raw_data(make_frame().iloc[:2])
+
+    assert raw_data[0] == {
+        'datetime': '2024-01-01 08:00',
+        'toimipiste': 'Lääkäriasema Koski',
+        'aikaryhman': 'In-person appointment',
+        'aikaryhma': 'IA',
+        'laakari': 'Dr. A',
+        'RESURSSI': 'Gynecology',
+        'specialty': 'Obstetrics',
+        'ETNS_A': 1,
+        'kesto_min': 20,
+        'ETNS_B': 1,
+        'tyhja': 1,
+    }
+    assert type(raw_data[1]['kesto_min']) is int
+
+
+def test_to_raw_data_accepts_columns_mapping():
+    columns = make_frame().iloc[:2].to_dict('list')
+
+    assert to_raw_data(columns) == to_raw_data(make_frame().iloc[:2])
+
+
+def test_to_raw_data_reports_bad_rows_in_bulk(caplog):
+    raw_data = to_raw_data(make_frame())
+
+    assert len(raw_data) == 2
+    assert len(caplog.records) == 1
+    assert '1 rows could not be converted' in caplog.records[0].getMessage()
+
+    with pytest.raises(ValueError, match='index: 2'):
+        to_raw_data(make_frame(), errors='raise')
+
+
+def test_columnar_round_trip():
+    frame = make_frame().iloc[:2]
+    columns = to_raw_data(frame, orient='columns')
+
+    assert columns['laakari'] == {'categories': ['Dr. A', 'Dr. B'], 'codes': [0, 1]}
+    assert columns['kesto_min'] == [20, 60]
+    assert raw_data_to_frame(columns).to_dict('records') == to_raw_data(frame)
+
+
+def test_missing_booking_probability_is_kept_as_none():
+    frame = make_frame().iloc[:2].assign(bookingProbability=[0.8, None])
+
+    raw_data = to_raw_data(frame)
+    assert [row['bookingProbability'] for row in raw_data] == [0.8, None]
+    assert to_raw_data(frame, orient='columns')['bookingProbability'] == [0.8, None]
+
+
+def test_timezone_aware_datetimes_keep_local_time():
+    timestamps = pd.Series(pd.to_datetime(['2024-01-01 08:00', '2024-06-01 08:20'])).dt.tz_localize('Europe/Helsinki')
+    assert format_datetimes(timestamps).tolist() == ['2024-01-01 08:00', '2024-06-01 08:20']
+    assert format_datetimes(pd.DatetimeIndex(timestamps)).tolist() == ['2024-01-01 08:00', '2024-06-01 08:20']
+
+    data = make_frame().assign(datetime=timestamps.iloc[[0, 1, 0]].reset_index(drop=True))
+    assert [row['datetime'] for row in to_raw_data(data)][:2] == ['2024-01-01 08:00', '2024-06-01 08:20']
@@ -0,0 +1,65 @@
+"""
+Browser test of the grid geometry, driven by `dash_duo`. Like the browser
+benchmarks it needs Chrome and a matching chromedriver on the PATH, and a
+bundle built with `npm run build`:
+
+    python -m pytest tests/test_grid.py --headless
+"""
+import shutil
+
+import pytest
+
+if not shutil.which('chromedriver'):
+    pytest.skip('chromedriver is not installed', allow_module_level=True)
+
+from dash import Dash, Input, Output, html  # noqa: E402
+from selenium.webdriver.common.action_chains import ActionChains  # noqa: E402
+
+import dash_gantt  # noqa: E402
+
+RAW_DATA = [
+    {'datetime': '2024-01-01 08:00', 'laakari': 'Dr. A', 'kesto_min': 20, 'tyhja': 0},
+    {'datetime': '2024-01-01 08:00', 'laakari': 'Dr. B', 'kesto_min': 20, 'tyhja': 0},
+]
+
+SUMMARY = {
+    'professionals': {
+        name: {'booked': 20, 'available': 0, 'expected': 0, 'utilization': 1, 'expectedUtilization': 1}
+        for name in ('Dr. A', 'Dr. B')
+    },
+    'hours': {'8': {'booked': 40, 'available': 0, 'expected': 0, 'utilization': 1, 'expectedUtilization': 1}},
+    'total': {'booked': 40, 'available': 0, 'expected': 0, 'utilization': 1, 'expectedUtilization': 1},
+}
+
+
+# Creating a slot by dragging must map the pointer to the same time with
+# the utilization column shown, which is not part of the time area
+def test_drag_with_summary_column(dash_duo):
+    app = Dash(__name__)
+    app.layout = html.Div([
+        dash_gantt.DashGantt(
+            id='gantt', rawData=RAW_DATA, date='2024-01-01', startHour=8, endHour=11,
+            slotDuration=20, updateMode='patch', summary=SUMMARY,
+        ),
+        html.Div(id='added'),
+    ])
+
+    @app.callback(Output('added', 'children'), Input('gantt', 'rawDataPatch'), prevent_initial_call=True)
+    def show_added(patch):
+        return ', '.join(f"{row['datetime']} {row['kesto_min']}" for row in patch['added'])
+
+    dash_duo.start_server(app)
+
+    # Drag from 09:00 to the start of 10:00 in the row of Dr. B
+    start = dash_duo.driver.find_element(
+        'xpath', "//tbody/tr[td[text()='Dr. B']]/td[@title[starts-with(., 'Time: 09:00')]]"
+    )
+    header = dash_duo.driver.find_element('xpath', "//thead//th[text()='10:00']")
+    (ActionChains(dash_duo.driver)
+        .move_to_element(start)
+        .click_and_hold()
+        .move_to_element_with_offset(header, -header.size['width'] // 2 + 2, 0)
+        .release()
+        .perform())
+
+    dash_duo.wait_for_text_to_equal('#added', '2024-01-01 09:00 60')
@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+
+from dash_gantt.index import ScheduleIndex
+
+
+def make_frame():
+    return pd.DataFrame({
+        'datetime': ['2024-01-02 09:00', '2024-01-01 08:20', '2024-01-01 08:00', '2024-01-02 08:00'],
+        'toimipiste': ['Koski', 'Koski', 'Lahti', 'Lahti'],
+        'aikaryhman': ['In-person appointment'] * 4,
+        'aikaryhma': ['IA'] * 4,
+        'laakari': ['Dr. A', 'Dr. B', 'Dr. A', 'Dr. A'],
+        'RESURSSI': ['Gynecology'] * 4,
+        'ETNS': ['Obstetrics'] * 4,
+        'ETNS_A': [1] * 4,
+        'kesto_min': [20] * 4,
+        'ETNS_B': [1] * 4,
+        'tyhja': [1, 0, 1, 1],
+    })
+
+
+def test_schedule_index_partitions_by_date():
+    source = make_frame()
+    index = ScheduleIndex(source)
+
+    assert index.dates == ['2024-01-01', '2024-01-02']
+    assert [row['datetime'] for row in index.raw_data('2024-01-01')] == [
+        '2024-01-01 08:00', '2024-01-01 08:20'
+    ]
+    assert index.raw_data('2023-12-31') == []
+    # The source frame is left untouched
+    assert list(source.columns) == list(make_frame().columns)
+
+
+def test_schedule_index_filters():
+    index = ScheduleIndex(make_frame(), by=('laakari',))
+
+    indexed = index.frame('2024-01-02', laakari='Dr. A', toimipiste='Lahti')
+    assert list(indexed['datetime']) == ['2024-01-02 08:00']
+    assert list(index.frame('2024-01-01', laakari='Dr. C')['datetime']) == []
+    assert list(index.frame('2024-01-01', toimipiste='Koski')['laakari']) == ['Dr. B']
+
+
+def test_bad_rows_are_reported(caplog):
+    data = make_frame()
+    data.loc[1, 'datetime'] = 'not a date'
+
+    index = ScheduleIndex(data)
+    assert list(index.bad_index) == [1]
+    assert '1 rows could not be converted' in caplog.records[0].getMessage()
+    with pytest.raises(ValueError, match='index: 1'):
+        ScheduleIndex(data, errors='raise')
@@ -0,0 +1,61 @@
+from dash import Dash, Input, Output, html
+from dash.exceptions import PreventUpdate
+
+from dash_gantt.instrument import CallbackMetrics, count_rows
+
+ROW = {'id': 1, 'datetime': '2024-01-01 08:00', 'laakari': 'Dr. A', 'kesto_min': 20, 'tyhja': 1}
+
+
+def callback_request(value):
+    return {
+        'output': 'out.children',
+        'outputs': {'id': 'out', 'property': 'children'},
+        'inputs': [{'id': 'in', 'property': 'children', 'value': value}],
+        'changedPropIds': ['in.children'],
+        'state': [],
+    }
+
+
+def test_count_rows():
+    assert count_rows([ROW, ROW]) == 2
+    assert count_rows({'datetime': ['2024-01-01 08:00'] * 3, 'tyhja': [1, 0, 1]}) == 3
+    assert count_rows({'datetime': {'categories': ['a'], 'codes': [0, 0]}}) == 2
+    assert count_rows({'sequence': 1, 'added': [ROW], 'modified': [], 'removed': [3, 4]}) == 3
+    # Several outputs of one callback
+    assert count_rows(([ROW], None, '1 rows', {'date': '2024-01-01'})) == 1
+    assert count_rows('2024-01-01') == 0
+
+
+def test_metrics_of_callback_requests():
+    metrics = CallbackMetrics(max_response_bytes=100)
+    app = Dash(__name__)
+    app.layout = html.Div([html.Div(id='in'), html.Div(id='out')])
+
+    @app.callback(Output('out', 'children'), Input('in', 'children'))
+    @metrics.instrument(name='schedule')
+    def schedule(count):
+        if count == 0:
+            raise PreventUpdate
+        if count < 0:
+            raise ValueError(count)
+        return [ROW] * count
+
+    metrics.init_app(app)
+    client = app.server.test_client()
+
+    assert client.post('/_dash-update-component', json=callback_request(5)).status_code == 200
+    assert client.post('/_dash-update-component', json=callback_request(0)).status_code == 204
+    assert client.post('/_dash-update-component', json=callback_request(-1)).status_code == 500
+
+    stats = metrics.stats()['schedule']
+    assert (stats['calls'], stats['errors'], stats['oversized']) == (3, 1, 1)
+    assert stats['output_rows'] == {'count': 1, 'sum': 5, 'mean': 5.0}
+    assert stats['request_bytes']['count'] == 3
+    assert stats['response_bytes']['sum'] > 100
+
+    response = client.get('/metrics')
+    assert response.mimetype == 'text/plain'
+    text = response.get_data(as_text=True)
+    assert 'dash_gantt_callback_calls_total{callback="schedule"} 3' in text
+    assert 'dash_gantt_output_rows_bucket{callback="schedule",le="10"} 1' in text
+    assert 'dash_gantt_callback_duration_seconds_count{callback="schedule"} 3' in text
@@ -0,0 +1,74 @@
+import os
+
+import pandas as pd
+import pytest
+
+from dash_gantt.index import ScheduleIndex
+from dash_gantt.intervals import IntervalIndex
+from dash_gantt.schedule import Schedule
+
+CSV = os.path.join(os.path.dirname(__file__), '..', 'chatgpt-01.csv')
+
+RAW_DATA = [
+    {'datetime': '2024-01-01 08:00', 'laakari': 'Dr. A', 'kesto_min': 30, 'tyhja': 0},
+    {'datetime': '2024-01-01 08:20', 'laakari': 'Dr. A', 'kesto_min': 20, 'tyhja': 1},
+    {'datetime': '2024-01-01 09:00', 'laakari': 'Dr. A', 'kesto_min': 15, 'tyhja': 0},
+    {'datetime': '2024-01-01 08:00', 'laakari': 'Dr. B', 'kesto_min': 60, 'tyhja': 0},
+]
+
+
+def test_overlaps():
+    index = IntervalIndex(RAW_DATA)
+    assert len(index) == 3
+    assert index.overlaps('Dr. A', '2024-01-01 08:30', '2024-01-01 08:45')
+    assert not index.overlaps('Dr. A', '2024-01-01 08:40', '2024-01-01 09:00')
+    assert index.overlaps('Dr. A', '2024-01-01 07:00', '2024-01-01 12:00')
+    assert not index.overlaps('Dr. B', '2024-01-01 09:00', '2024-01-01 09:30')
+    assert not index.overlaps('Dr. C', '2024-01-01 08:00', '2024-01-01 09:00')
+
+    # Available slots are free time with booked_only
+    assert not IntervalIndex(RAW_DATA, booked_only=True).overlaps('Dr. A', '2024-01-01 08:30', '2024-01-01 08:40')
+
+
+def test_free_gaps_and_next_free():
+    index = IntervalIndex(RAW_DATA)
+    gaps = index.free_gaps(10, '2024-01-01 08:00', '2024-01-01 10:00')
+    assert gaps.to_dict('records') == [
+        {'laakari': 'Dr. A', 'start': '2024-01-01 08:40', 'end': '2024-01-01 09:00', 'minutes': 20},
+        {'laakari': 'Dr. A', 'start': '2024-01-01 09:15', 'end': '2024-01-01 10:00', 'minutes': 45},
+        {'laakari': 'Dr. B', 'start': '2024-01-01 09:00', 'end': '2024-01-01 10:00', 'minutes': 60},
+    ]
+
+    first = index.next_free(30, '2024-01-01 08:00', '2024-01-01 10:00')
+    assert first.to_dict('records') == [
+        {'laakari': 'Dr. A', 'start': '2024-01-01 09:15', 'end': '2024-01-01 09:45', 'minutes': 30},
+        {'laakari': 'Dr. B', 'start': '2024-01-01 09:00', 'end': '2024-01-01 09:30', 'minutes': 30},
+    ]
+    assert index.next_free(90, '2024-01-01 08:00', '2024-01-01 10:00').empty
+    assert index.free_gaps(10, '2024-01-01 08:30', '2024-01-01 08:50', laakari=['Dr. A'])['start'].tolist() == [
+        '2024-01-01 08:40'
+    ]
+    with pytest.raises(ValueError):
+        index.free_gaps(0, '2024-01-01 08:00', '2024-01-01 10:00')
+    with pytest.raises(KeyError):
+        index.free_gaps(10, '2024-01-01 08:00', '2024-01-01 10:00', laakari=['Dr. C'])
+
+
+def test_free_gaps_match_scan():
+    data = pd.read_csv(CSV)
+    date = ScheduleIndex(data).dates[0]
+    schedule = Schedule.from_frame(data)
+    gaps = IntervalIndex(schedule.select(date)).free_gaps(20, f'{date} 08:00', f'{date} 16:00')
+
+    # Every minute of a gap is free in a scan over the rows
+    frame = ScheduleIndex(data).frame(date)
+    starts = pd.to_datetime(frame['datetime'])
+    ends = starts + pd.to_timedelta(frame['kesto_min'], unit='m')
+    for gap in gaps.itertuples():
+        rows = frame['laakari'] == gap.laakari
+        overlapping = rows & (starts < pd.Timestamp(gap.end)) & (ends > pd.Timestamp(gap.start))
+        assert not overlapping.any()
+        assert gap.minutes >= 20
+    assert IntervalIndex(schedule.select(date)).free_gaps(20, f'{date} 08:00', f'{date} 16:00').equals(
+        IntervalIndex(frame).free_gaps(20, f'{date} 08:00', f'{date} 16:00')
+    )
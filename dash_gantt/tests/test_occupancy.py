@@ -0,0 +1,47 @@
+import os
+
+import pandas as pd
+import pytest
+
+from dash_gantt.data import to_raw_data
+from dash_gantt.index import ScheduleIndex
+from dash_gantt.occupancy import occupancy, occupancy_frame
+from dash_gantt.schedule import Schedule
+
+CSV = os.path.join(os.path.dirname(__file__), '..', 'chatgpt-01.csv')
+
+
+def test_occupancy_splits_slots_into_hours():
+    raw_data = [
+        {'datetime': '2024-01-01 08:50', 'laakari': 'Dr. B', 'kesto_min': 30, 'tyhja': 0},
+        {'datetime': '2024-01-01 08:00', 'laakari': 'Dr. A', 'kesto_min': 20, 'tyhja': 1, 'bookingProbability': 0.25},
+        {'datetime': '2024-01-01 08:20', 'laakari': 'Dr. A', 'kesto_min': 20, 'tyhja': 1},
+        {'datetime': '2024-01-01 23:40', 'laakari': 'Dr. A', 'kesto_min': 40, 'tyhja': 0},
+    ]
+
+    frame = occupancy_frame(raw_data)
+    assert frame.to_dict('records') == [
+        {'date': '2024-01-01', 'hour': 8, 'laakari': 'Dr. A', 'booked': 0, 'available': 40, 'expected': 15.0},
+        {'date': '2024-01-01', 'hour': 23, 'laakari': 'Dr. A', 'booked': 20, 'available': 0, 'expected': 0.0},
+        {'date': '2024-01-02', 'hour': 0, 'laakari': 'Dr. A', 'booked': 20, 'available': 0, 'expected': 0.0},
+        {'date': '2024-01-01', 'hour': 8, 'laakari': 'Dr. B', 'booked': 10, 'available': 0, 'expected': 0.0},
+        {'date': '2024-01-01', 'hour': 9, 'laakari': 'Dr. B', 'booked': 20, 'available': 0, 'expected': 0.0},
+    ]
+
+    columns = occupancy(raw_data)
+    assert columns['laakari'] == {'categories': ['Dr. A', 'Dr. B'], 'codes': [0, 0, 0, 1, 1]}
+    assert columns['hour'] == [8, 23, 0, 8, 9]
+    assert occupancy([])['hour'] == []
+
+
+def test_occupancy_of_schedule_matches_frame():
+    data = pd.read_csv(CSV)
+    index = ScheduleIndex(data)
+    date = index.dates[3]
+
+    expected = occupancy_frame(index.frame(date))
+    assert occupancy_frame(Schedule.from_frame(data).select(date)).equals(expected)
+    assert occupancy_frame(to_raw_data(data[data['datetime'].str.startswith(date)])).equals(expected)
+    assert (expected['booked'] + expected['available']).sum() == index.frame(date)['kesto_min'].sum()
+    with pytest.raises(KeyError):
+        occupancy_frame([{'datetime': '2024-01-01 08:00', 'laakari': 'Dr. A'}])
@@ -0,0 +1,68 @@
+import pandas as pd
+
+from dash_gantt.patch import apply_patch
+
+PATCH = {
+    'sequence': 1,
+    'added': [{'id': 'new-1', 'datetime': '2024-01-01 10:00', 'laakari': 'Dr. B', 'kesto_min': 20, 'tyhja': 1}],
+    'modified': [{'id': 0, 'datetime': '2024-01-01 08:10', 'laakari': 'Dr. A', 'kesto_min': 30, 'tyhja': 1}],
+    'removed': [1],
+}
+
+
+def make_records():
+    return [
+        {'datetime': '2024-01-01 08:00', 'laakari': 'Dr. A', 'kesto_min': 20, 'tyhja': 1},
+        {'datetime': '2024-01-01 09:00', 'laakari': 'Dr. A', 'kesto_min': 20, 'tyhja': 0},
+        {'datetime': '2024-01-01 09:20', 'laakari': 'Dr. B', 'kesto_min': 20, 'tyhja': 0},
+    ]
+
+
+def test_apply_patch_to_frame():
+    frame = pd.DataFrame(make_records())
+    result = apply_patch(frame, PATCH)
+
+    assert result is frame
+    assert list(frame.index) == [0, 2, 'new-1']
+    assert frame.loc[0, 'datetime'] == '2024-01-01 08:10'
+    assert frame.loc[0, 'kesto_min'] == 30
+    assert frame.loc['new-1', 'laakari'] == 'Dr. B'
+
+
+def test_apply_patch_adds_browser_ids_to_id_column():
+    frame = pd.DataFrame(make_records())
+    frame['id'] = frame.index
+    apply_patch(frame, PATCH)
+
+    assert frame['id'].tolist() == [0, 2, 'new-1']
+
+
+def test_apply_patch_adds_many_rows_to_frame():
+    frame = pd.DataFrame(make_records())
+    added = [
+        {'id': f'new-{i}', 'datetime': f'2024-01-01 1{i}:00', 'laakari': 'Dr. C', 'kesto_min': 20, 'tyhja': 1}
+        for i in range(3)
+    ]
+    result = apply_patch(frame, {'added': added})
+
+    assert result is frame
+    assert list(frame.index) == [0, 1, 2, 'new-0', 'new-1', 'new-2']
+    assert frame.loc['new-2', 'datetime'] == '2024-01-01 12:00'
+    assert frame['kesto_min'].tolist() == [20] * 6
+
+
+def test_apply_patch_to_mapping():
+    store = {position: dict(row, id=position) for position, row in enumerate(make_records())}
+    apply_patch(store, PATCH)
+
+    assert sorted(store, key=str) == [0, 2, 'new-1']
+    assert store[0]['kesto_min'] == 30
+
+
+def test_apply_patch_to_records_without_ids():
+    records = make_records()
+    apply_patch(records, PATCH)
+
+    assert [row['datetime'] for row in records] == [
+        '2024-01-01 08:10', '2024-01-01 09:20', '2024-01-01 10:00'
+    ]
@@ -0,0 +1,84 @@
+import numpy as np
+
+from dash_gantt.predict import FunctionModel, HeuristicModel, Scorer
+
+
+def counting_model():
+    calls = []
+
+    def predict(features):
+        calls.append(len(features['kesto_min']))
+        return np.asarray(features['kesto_min'], dtype=float) / 100
+
+    return FunctionModel(predict, ['datetime', 'laakari', 'kesto_min']), calls
+
+
+def rows():
+    return [
+        {'id': 1, 'datetime': '2024-01-01 08:00', 'laakari': 'Dr. A', 'kesto_min': 20, 'tyhja': 1},
+        {'id': 2, 'datetime': '2024-01-01 09:00', 'laakari': 'Dr. A', 'kesto_min': 30, 'tyhja': 1},
+        {'id': 3, 'datetime': '2024-01-01 09:00', 'laakari': 'Dr. B', 'kesto_min': 20, 'tyhja': 0},
+    ]
+
+
+def test_scorer_only_scores_changed_rows():
+    model, calls = counting_model()
+    scorer = Scorer(model)
+    schedule = rows()
+
+    assert scorer.score(schedule).tolist() == [0.2, 0.3, 0.2]
+
+    # Fields that are not features don't invalidate the cached score
+    schedule[2]['tyhja'] = 1
+    schedule[1]['kesto_min'] = 40
+    assert scorer.score(schedule).tolist() == [0.2, 0.4, 0.2]
+
+    assert calls == [3, 1]
+    assert scorer.stats() == {'hits': 2, 'misses': 4, 'entries': 4}
+
+
+def test_scorer_annotates_patch_rows_in_place():
+    model, calls = counting_model()
+    scorer = Scorer(model)
+    patch = {
+        'sequence': 1,
+        'added': [{'id': 'new-1', 'datetime': '2024-01-01 10:00', 'laakari': 'Dr. A', 'kesto_min': 50}],
+        'modified': [rows()[0]],
+        'removed': [2],
+    }
+
+    assert scorer.score_patch(patch) == {'new-1': 0.5, 1: 0.2}
+    assert patch['added'][0]['bookingProbability'] == 0.5
+    assert calls == [2]
+
+
+def test_scorer_evicts_least_recently_used_scores():
+    model, _ = counting_model()
+    scorer = Scorer(model, max_entries=2)
+
+    scorer.score(rows())
+
+    assert len(scorer) == 2
+
+
+def test_heuristic_model_returns_probabilities():
+    scores = Scorer(HeuristicModel()).score(rows())
+
+    assert scores.shape == (3,)
+    assert ((scores >= 0) & (scores <= 1)).all()
+
+
+def test_scorer_yields_batches_and_fills_the_cache():
+    model, calls = counting_model()
+    scorer = Scorer(model)
+    schedule = rows()
+    scorer.score(schedule[:1])
+
+    batches = list(scorer.score_batches(schedule + [dict(schedule[1], id=4)], batch_size=1))
+
+    # The cached row first, then one model call per distinct missing slot
+    assert batches[0] == (1, 4, {1: 0.2})
+    assert [done for done, _, _ in batches] == [1, 3, 4]
+    assert batches[1][2] == {2: 0.3, 4: 0.3}
+    assert calls == [1, 1, 1]
+    assert scorer.stats()['entries'] == 3
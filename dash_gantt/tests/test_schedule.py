@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dash_gantt.data import to_raw_data
+from dash_gantt.schedule import Schedule
+
+
+def source():
+    return pd.DataFrame({
+        'datetime': ['2024-01-02 09:00', '2024-01-01 08:00', '2024-01-01 08:20', '2024-01-01 08:00'],
+        'toimipiste': ['Koski', 'Koski', 'Koski', 'Lahti'],
+        'aikaryhman': ['In-person appointment'] * 4,
+        'aikaryhma': ['IA'] * 4,
+        'laakari': ['Dr. A', 'Dr. A', 'Dr. A', 'Dr. B'],
+        'RESURSSI': ['Gynecology'] * 4,
+        'ETNS': ['Obstetrics'] * 4,
+        'ETNS_A': [1] * 4,
+        'kesto_min': [20, 20, 40, 30],
+        'ETNS_B': [1] * 4,
+        'tyhja': [1, 0, 1, 1],
+        'bookingProbability': [0.82, 0.5, 0.15, 0.33],
+    })
+
+
+def test_schedule_round_trips_raw_data():
+    data = source()
+    schedule = Schedule.from_frame(data)
+    expected = sorted(to_raw_data(data, with_ids=True), key=lambda row: (row['datetime'], row['id']))
+
+    assert schedule.to_raw_data() == expected
+    assert schedule.records.dtype.itemsize < 64
+    assert Schedule.from_raw_data(schedule.to_raw_data(orient='columns')).to_raw_data() == expected
+
+    # rawData without ids is numbered by position
+    rows = [{'datetime': '2024-01-01 08:00', 'laakari': 'Dr. A', 'kesto_min': 20, 'tyhja': 1}]
+    assert Schedule.from_raw_data(rows).to_raw_data() == [dict(rows[0], id=0)]
+
+
+def test_schedule_selects_dates_and_columns():
+    schedule = Schedule.from_frame(source())
+
+    assert schedule.dates == ['2024-01-01', '2024-01-02']
+    assert '2024-01-02' in schedule and '2024-01-03' not in schedule
+    assert schedule.categories('laakari') == ['Dr. A', 'Dr. B']
+
+    assert [row['id'] for row in schedule.raw_data('2024-01-01')] == [1, 3, 2]
+    assert [row['id'] for row in schedule.raw_data('2024-01-01', laakari='Dr. A', tyhja=1)] == [2]
+    assert len(schedule.select(laakari=['Dr. B', 'Dr. C'])) == 1
+    assert len(schedule.select(laakari='Dr. C')) == 0
+    assert len(schedule.between('2024-01-01 08:10', '2024-01-02')) == 1
+
+    with pytest.raises(KeyError):
+        schedule.select(unknown=1)
+    with pytest.raises(ValueError):
+        Schedule.from_frame(source().assign(kesto_min=[20, 20, 20, 100_000]))
+
+
+def test_schedule_is_shared_through_a_memory_map(tmp_path):
+    schedule = Schedule.from_frame(source())
+    schedule.save(tmp_path / 'schedule')
+    with pytest.raises(FileExistsError):
+        schedule.save(tmp_path / 'schedule')
+
+    shared = Schedule.load(tmp_path / 'schedule')
+    assert isinstance(shared.records, np.memmap)
+    assert shared.to_raw_data() == schedule.to_raw_data()
+    assert shared.raw_data('2024-01-01', laakari='Dr. A') == schedule.raw_data('2024-01-01', laakari='Dr. A')
+
+    # Dates are views of the mapped file, and nothing can write to it
+    day = shared.select('2024-01-01').records
+    assert np.shares_memory(day, shared.records)
+    with pytest.raises(ValueError):
+        day['tyhja'] = False
+    with pytest.raises(ValueError):
+        schedule.records['kesto_min'] = 0
+
+    assert Schedule.load(tmp_path / 'schedule', mmap=False).to_raw_data() == schedule.to_raw_data()
+
+
+def test_schedule_keeps_missing_strings_missing():
+    rows = [
+        {'datetime': '2024-01-01 08:00', 'laakari': 'Dr. A', 'toimipiste': 'Koski', 'kesto_min': 20, 'tyhja': 1},
+        {'datetime': '2024-01-01 08:20', 'laakari': 'Dr. A', 'toimipiste': None, 'kesto_min': 20, 'tyhja': 1},
+        {'datetime': '2024-01-01 08:40', 'laakari': 'Dr. A', 'toimipiste': 'Lahti', 'kesto_min': 20, 'tyhja': 1},
+    ]
+    schedule = Schedule.from_raw_data(rows)
+
+    assert schedule.categories('toimipiste') == ['Koski', 'Lahti']
+    assert [row['toimipiste'] for row in schedule.to_raw_data()] == ['Koski', None, 'Lahti']
+    columns = schedule.to_raw_data(orient='columns')
+    assert [columns['toimipiste']['categories'][code] for code in columns['toimipiste']['codes']] == [
+        'Koski', None, 'Lahti'
+    ]
+
+
+def test_schedule_sends_missing_probabilities_as_none():
+    rows = [
+        {'datetime': '2024-01-01 08:00', 'laakari': 'Dr. A', 'kesto_min': 20, 'tyhja': 1, 'bookingProbability': 0.4},
+        {'datetime': '2024-01-01 08:20', 'laakari': 'Dr. A', 'kesto_min': 20, 'tyhja': 1, 'bookingProbability': None},
+    ]
+    schedule = Schedule.from_raw_data(rows)
+
+    assert [row['bookingProbability'] for row in schedule.to_raw_data()] == [0.4, None]
+    assert schedule.to_raw_data(orient='columns')['bookingProbability'] == [0.4, None]
@@ -0,0 +1,42 @@
+import os
+
+import pandas as pd
+import pytest
+
+from dash_gantt.index import ScheduleIndex
+from dash_gantt.store import ScheduleStore, convert_csv
+
+CSV = os.path.join(os.path.dirname(__file__), '..', 'chatgpt-01.csv')
+
+
+@pytest.mark.parametrize('format', ['parquet', 'arrow'])
+def test_store_matches_index(tmp_path, format):
+    target = tmp_path / 'schedule'
+    assert convert_csv(CSV, target, format=format, chunksize=1_000) == 3761
+    with pytest.raises(FileExistsError):
+        convert_csv(CSV, target, format=format)
+
+    store = ScheduleStore(target, format=format)
+    index = ScheduleIndex(pd.read_csv(CSV))
+    date = index.dates[5]
+
+    assert store.dates == index.dates
+    assert date in store and '1999-01-01' not in store
+    assert store.raw_data(date) == index.raw_data(date)
+    assert store.raw_data(date, orient='columns') == index.raw_data(date, orient='columns')
+    assert store.raw_data(date, laakari='Dr. A') == index.raw_data(date, laakari='Dr. A')
+    assert store.raw_data('1999-01-01') == []
+
+
+def test_store_reads_only_requested_rows_and_columns(tmp_path):
+    convert_csv(CSV, tmp_path / 'schedule')
+    store = ScheduleStore(tmp_path / 'schedule')
+
+    frame = store.frame('2024-01-02', columns=['datetime', 'laakari'], laakari=['Dr. A', 'Dr. B'], tyhja=0)
+    assert list(frame.columns) == ['datetime', 'laakari']
+    assert set(frame['laakari']) <= {'Dr. A', 'Dr. B'}
+
+    frame = store.between('2024-01-01 12:00', '2024-01-02 12:00', columns=['datetime'])
+    assert frame['datetime'].min() >= '2024-01-01 12:00'
+    assert frame['datetime'].max() < '2024-01-02 12:00'
+    assert frame['datetime'].is_monotonic_increasing
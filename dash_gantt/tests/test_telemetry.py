@@ -0,0 +1,55 @@
+import pytest
+
+from dash_gantt.telemetry import PerfCollector
+
+
+def report(render, **kwargs):
+    metrics = {
+        'sequence': 1,
+        'rows': 500,
+        'slots': 120,
+        'professionals': 8,
+        'samples': {'render': render, 'payloadBytes': [2048]},
+        'counts': {'render': len(render), 'payloadBytes': 1},
+        'droppedFrames': 0,
+        'dragFrames': 0,
+    }
+    metrics.update(kwargs)
+    return metrics
+
+
+def test_collector_summarizes_sessions():
+    collector = PerfCollector()
+    collector.add('a', None)
+    collector.add('a', report(list(range(1, 101)), droppedFrames=3, dragFrames=60))
+    collector.add('b', report([5.0, 7.0], rows=9000))
+
+    summary = collector.summary('a', percentiles=(50, 99))
+    assert summary['reports'] == 1
+    assert summary['droppedFrames'] == 3
+    assert summary['metrics']['render']['count'] == 100
+    assert summary['metrics']['render']['max'] == 100
+    assert summary['metrics']['render']['p50'] == pytest.approx(50.5)
+
+    pooled = collector.summary()
+    assert pooled['rows'] == 9000
+    assert pooled['metrics']['render']['count'] == 102
+    assert pooled['metrics']['payloadBytes']['count'] == 2
+
+    with pytest.raises(KeyError):
+        collector.summary('missing')
+
+
+def test_collector_finds_slow_sessions_and_bounds_memory():
+    collector = PerfCollector(max_samples=10, max_sessions=2)
+    collector.add('fast', report([10.0] * 20))
+    collector.add('slow', report([10.0] * 20))
+    collector.add('slow', report([200.0] * 10))
+
+    # Only the last 10 samples of a metric are kept
+    assert collector.summary('slow')['metrics']['render']['count'] == 10
+    assert collector.sessions_over(100) == {'slow': 200.0}
+
+    collector.add('new', report([1.0]))
+    assert 'fast' not in collector
+    assert collector.stats() == {'reports': 4, 'evictions': 1, 'sessions': 2}
@@ -0,0 +1,55 @@
+import os
+
+import pandas as pd
+import pytest
+
+from dash_gantt.data import raw_data_to_frame
+from dash_gantt.index import ScheduleIndex
+from dash_gantt.schedule import Schedule
+from dash_gantt.timeline import viewport_occupancy, viewport_raw_data
+
+CSV = os.path.join(os.path.dirname(__file__), '..', 'chatgpt-01.csv')
+
+
+def test_viewport_raw_data_loads_missing_dates():
+    index = ScheduleIndex(pd.read_csv(CSV))
+    first, second, third = index.dates[:3]
+    viewport = {
+        'start': f'{second} 06:00',
+        'end': f'{second} 18:00',
+        'dates': [second],
+        'missing': [second, third, first],
+    }
+
+    rows = viewport_raw_data(index, viewport)
+    assert rows == index.raw_data(second) + index.raw_data(third) + index.raw_data(first)
+    assert viewport_raw_data(Schedule.from_frame(pd.read_csv(CSV)), viewport, laakari='Dr. A') == [
+        row for row in rows if row['laakari'] == 'Dr. A'
+    ]
+
+    columns = viewport_raw_data(index, viewport, orient='columns')
+    assert raw_data_to_frame(columns).to_dict('records') == rows
+
+
+def test_viewport_raw_data_without_missing_dates():
+    index = ScheduleIndex(pd.read_csv(CSV))
+    assert viewport_raw_data(index, None) is None
+    assert viewport_raw_data(index, {'dates': index.dates[:2], 'missing': []}) is None
+    with pytest.raises(ValueError):
+        viewport_raw_data(index, {'missing': index.dates[:1]}, orient='rows')
+
+
+def test_viewport_occupancy_answers_zoomed_out_viewports():
+    index = ScheduleIndex(pd.read_csv(CSV))
+    schedule = Schedule.from_frame(pd.read_csv(CSV))
+    dates = index.dates[:2]
+    viewport = {'dates': dates[:1], 'detail': 'occupancy', 'missing': dates}
+
+    assert viewport_raw_data(index, viewport) is None
+    bins = viewport_occupancy(index, viewport)
+    assert bins == viewport_occupancy(schedule, viewport)
+    assert bins['date']['categories'] == dates
+    assert sum(bins['booked']) + sum(bins['available']) == sum(
+        row['kesto_min'] for date in dates for row in index.raw_data(date)
+    )
+    assert viewport_occupancy(index, dict(viewport, detail='slots')) is None
@@ -0,0 +1,69 @@
+import copy
+import math
+import os
+
+import pandas as pd
+import pytest
+
+from dash_gantt.index import ScheduleIndex
+from dash_gantt.patch import apply_patch
+from dash_gantt.utilization import UtilizationTracker, summary, utilization
+
+CSV = os.path.join(os.path.dirname(__file__), '..', 'chatgpt-01.csv')
+
+RAW_DATA = [
+    {'id': 1, 'datetime': '2024-01-01 08:00', 'laakari': 'Dr. A', 'kesto_min': 30, 'tyhja': 0},
+    {'id': 2, 'datetime': '2024-01-01 08:30', 'laakari': 'Dr. A', 'kesto_min': 60, 'tyhja': 1, 'bookingProbability': 0.5},
+    {'id': 3, 'datetime': '2024-01-01 09:00', 'laakari': 'Dr. B', 'kesto_min': 20, 'tyhja': 1, 'bookingProbability': 0.25},
+]
+
+
+def test_utilization_by_professional_and_hour():
+    by_professional = utilization(RAW_DATA)
+    assert by_professional[['laakari', 'booked', 'available', 'expected']].to_dict('records') == [
+        {'laakari': 'Dr. A', 'booked': 30, 'available': 60, 'expected': 30.0},
+        {'laakari': 'Dr. B', 'booked': 0, 'available': 20, 'expected': 5.0},
+    ]
+    assert by_professional['utilization'].tolist() == pytest.approx([1 / 3, 0.0])
+    assert by_professional['expected_utilization'].tolist() == pytest.approx([2 / 3, 0.25])
+
+    by_hour = utilization(RAW_DATA, by=('hour',))
+    assert by_hour[['hour', 'booked', 'available']].to_dict('records') == [
+        {'hour': 8, 'booked': 30, 'available': 30},
+        {'hour': 9, 'booked': 0, 'available': 50},
+    ]
+
+    total = summary(RAW_DATA)['total']
+    assert total['utilization'] == round(30 / 110, 4)
+    assert math.isnan(utilization([], by=()).loc[0, 'utilization'])
+    with pytest.raises(ValueError):
+        utilization(RAW_DATA, by=('toimipiste',))
+
+
+def test_tracker_matches_full_recompute_after_patches():
+    data = pd.read_csv(CSV)
+    index = ScheduleIndex(data)
+    date = index.dates[0]
+    rows = index.raw_data(date)
+
+    tracker = UtilizationTracker(rows)
+    first, second = rows[0], rows[1]
+    patch = {
+        'sequence': 1,
+        'added': [{**first, 'id': 'new-1', 'datetime': f'{date} 21:10', 'tyhja': 1}],
+        'modified': [{**second, 'tyhja': 1 - second['tyhja'], 'kesto_min': second['kesto_min'] + 15}],
+        'removed': [first['id']],
+    }
+    # Patches are applied to the server copy in place, before or after the tracker
+    patched = apply_patch(copy.deepcopy(rows), patch)
+    tracker.apply_patch(patch)
+
+    expected = utilization(patched, by=('laakari', 'hour'))
+    actual = tracker.utilization(by=('laakari', 'hour'))
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+    assert tracker.summary() == summary(patched)
+    assert tracker.stats() == {'rows': len(patched), 'bins': len(expected), 'patches': 1}
+
+    # Removing every row leaves no totals behind
+    tracker.apply_patch({'removed': [row.get('id') for row in patched]})
+    assert len(tracker) == 0 and tracker.stats()['bins'] == 0
@@ -1,172 +1,274 @@
 import dash_gantt
-from dash import Dash, callback, html, Input, Output, State, dcc
+from dash_gantt.store import ScheduleStore, convert_csv
+from dash_gantt.cache import ScheduleCache
+from dash_gantt.predict import HeuristicModel, Scorer
+from dash_gantt.telemetry import PerfCollector
+from dash_gantt.instrument import CallbackMetrics
+from dash_gantt.timeline import viewport_occupancy, viewport_raw_data
+from dash_gantt.utilization import UtilizationTracker
+from dash import Dash, callback, html, Input, Output, State, dcc, no_update
+from dash.exceptions import PreventUpdate
 import json
+import logging
 from datetime import datetime
-import pandas as pd
-import numpy as np
-import random
+import os
+import uuid
 
-# Load and prepare data
-df = pd.read_csv('chatgpt-01.csv')
-df['datetime'] = pd.to_datetime(df['datetime'])  # Convert datetime column to datetime type
+logger = logging.getLogger(__name__)
 
-# Print column names and first row for debugging
-print("Available columns:", df.columns.tolist())
-print("\nFirst row of data:")
-print(df.iloc[0])
+# The CSV export is converted once into a date-partitioned Parquet dataset;
+# afterwards start-up reads nothing and callbacks read only the selected day
+DATA_DIR = 'chatgpt-01.parquet'
+if not os.path.isdir(DATA_DIR):
+    convert_csv('chatgpt-01.csv', DATA_DIR)
+schedule_store = ScheduleStore(DATA_DIR)
+available_dates = schedule_store.dates
 
-# Get unique dates from the data
-available_dates = sorted(df['datetime'].dt.date.unique().astype(str))
+# Props of the shipped bundle, from the metadata.json `npm run build`
+# generates with it. The demo only wires up what the bundle supports, so it
+# keeps working with a bundle built from older sources.
+with open(os.path.join(os.path.dirname(dash_gantt.__file__), 'metadata.json')) as f:
+    BUNDLE_PROPS = set(json.load(f)['src/lib/components/DashGantt.react.js']['props'])
+PATCH_EDITS = 'rawDataPatch' in BUNDLE_PROPS
+WEEK_VIEW = 'viewport' in BUNDLE_PROPS
 
 app = Dash(__name__)
 
 # Apply styles matching Plotly's simple_white theme
-app.layout = html.Div([
-    html.H1("Scheduling Tool with Booking Predictions", 
-            style={'color': '#444', 'fontWeight': '400', 'marginBottom': '25px'}),
+def serve_layout():
+    """Build the layout on every page load so each session gets its own id"""
+    return html.Div([
+        html.H1("Scheduling Tool with Booking Predictions", 
+                style={'color': '#444', 'fontWeight': '400', 'marginBottom': '25px'}),
     
-    html.Div([
-        html.Label("Select Date:", style={'color': '#444', 'marginRight': '10px', 'fontSize': '14px'}),
-        dcc.DatePickerSingle(
-            id='date-picker',
-            date=available_dates[0],  # Set default to first available date
-            min_date_allowed=available_dates[0],
-            max_date_allowed=available_dates[-1],
-            display_format='YYYY-MM-DD'
-        )
-    ], style={'marginBottom': '20px', 'display': 'flex', 'alignItems': 'center'}),
+        html.Div([
+            html.Label("Select Date:", style={'color': '#444', 'marginRight': '10px', 'fontSize': '14px'}),
+            dcc.DatePickerSingle(
+                id='date-picker',
+                date=available_dates[0],  # Set default to first available date
+                min_date_allowed=available_dates[0],
+                max_date_allowed=available_dates[-1],
+                display_format='YYYY-MM-DD'
+            )
+        ], style={'marginBottom': '20px', 'display': 'flex', 'alignItems': 'center'}),
+    
+        # Schedules are kept in a server-side cache; the browser only holds the
+        # session id and the date/version of the schedule it is showing
+        dcc.Store(id='session-id', data=str(uuid.uuid4())),
+        dcc.Store(id='schedule-version', data={}),
     
-    # Add a store component to hold the current state of the data
-    dcc.Store(id='data-store', data={}),
+        dash_gantt.DashGantt(
+            id='gantt-chart',
+            rawData=[],  # Will be populated by callback
+            date=available_dates[0],
+            startHour=6,
+            endHour=23,
+            slotDuration=5,  # 5-minute slots
+            backgroundColor='#ffffff',
+            # Report edits as rawDataPatch instead of the full rawData
+            **({'updateMode': 'patch'} if PATCH_EDITS else {}),
+            # Report render/drag timings every 5 seconds
+            **({'perfMetricsInterval': 5000} if 'perfMetrics' in BUNDLE_PROPS else {})
+        ),
     
-    dash_gantt.DashGantt(
-        id='gantt-chart',
-        rawData=[],  # Will be populated by callback
-        date=available_dates[0],
-        startHour=6,
-        endHour=23,
-        slotDuration=5,  # 5-minute slots
-        backgroundColor='#ffffff'
-    ),
+        html.Div(id='perf-summary', style={'color': '#888', 'fontSize': '12px', 'marginTop': '8px'}),
     
-    html.Div([
-        html.H3("Number of rows in data", style={'color': '#444', 'fontWeight': '400', 'marginBottom': '10px'}),
-        html.H3(id='num-rows', style={'color': '#444', 'fontWeight': '400', 'marginBottom': '10px'}),
-        html.H3("Raw Data (for Prediction Model)", 
-                style={'color': '#444', 'fontWeight': '400', 'marginBottom': '10px'}),
-        html.Pre(id='raw-data', style={
-            'backgroundColor': '#fafafa',
-            'padding': '15px',
-            'borderRadius': '4px',
-            'whiteSpace': 'pre-wrap',
-            'border': '1px solid #eaeaea',
-            'fontSize': '13px',
-            'color': '#333'
-        })
-    ], style={'marginTop': '30px'})
-], style={'fontFamily': 'Arial, sans-serif', 'margin': '20px', 'maxWidth': '1200px', 'marginLeft': 'auto', 'marginRight': 'auto'})
-
-# Define a function to add random probabilities to data
-def add_random_probabilities(data_list):
-    """Add random booking probabilities to each item in the data list"""
-    for item in data_list:
-        item['bookingProbability'] = round(random.random(), 2)  # Random value between 0 and 1
-    return data_list
+        # Read-only week from the selected date; only the days around the
+        # scrolled-to part are loaded, through the viewport prop. Zoomed out
+        # (ctrl+wheel) it shows hourly occupancy instead of slots.
+        *([dash_gantt.DashGantt(
+            id='week-chart',
+            rawData=[],
+            date=available_dates[0],
+            days=7,
+            prefetchDays=1,
+            startHour=6,
+            endHour=23,
+            backgroundColor='#ffffff',
+            virtualize=True,
+            height=400
+        )] if WEEK_VIEW else []),
+    
+        html.Div([
+            html.H3("Number of rows in data", style={'color': '#444', 'fontWeight': '400', 'marginBottom': '10px'}),
+            html.H3(id='num-rows', style={'color': '#444', 'fontWeight': '400', 'marginBottom': '10px'}),
+            html.H3("Schedule", 
+                    style={'color': '#444', 'fontWeight': '400', 'marginBottom': '10px'}),
+            html.Pre(id='raw-data', style={
+                'backgroundColor': '#fafafa',
+                'padding': '15px',
+                'borderRadius': '4px',
+                'whiteSpace': 'pre-wrap',
+                'border': '1px solid #eaeaea',
+                'fontSize': '13px',
+                'color': '#333'
+            })
+        ], style={'marginTop': '30px'})
+    ], style={'fontFamily': 'Arial, sans-serif', 'margin': '20px', 'maxWidth': '1200px', 'marginLeft': 'auto', 'marginRight': 'auto'})
+
+app.layout = serve_layout
+
+# Timings and payload sizes of the schedule callbacks, served at /metrics in
+# the Prometheus text format. Responses over 5 MB are logged.
+callback_metrics = CallbackMetrics(max_response_bytes=5_000_000)
+callback_metrics.init_app(app)
+
+# Booking probabilities come from a model whose scores are cached by the
+# slot features, so only new or changed slots are ever scored again
+scorer = Scorer(HeuristicModel())
+
+def load_schedule(date):
+    """Load the rows of a date and add predicted booking probabilities"""
+    return scorer.annotate(schedule_store.raw_data(date))
+
+# Per-session, per-date schedules kept on the server with LRU eviction
+schedule_cache = ScheduleCache(load_schedule, max_entries=256)
+
+# Utilization totals of a cached date are kept with its rows, updated from
+# the same patches and evicted together; the chart shows them as a column
+# and a row without aggregating
+def utilization_tracker(session_id, date):
+    return schedule_cache.derived(session_id, date, 'utilization', UtilizationTracker)
 
 @callback(
     [Output('gantt-chart', 'rawData'),
+     Output('gantt-chart', 'predictions'),
      Output('raw-data', 'children'),
      Output('num-rows', 'children'),
-     Output('data-store', 'data')],
+     Output('schedule-version', 'data'),
+     Output('gantt-chart', 'summary')],
     [Input('date-picker', 'date')],
-    [State('data-store', 'data')]
+    [State('session-id', 'data')]
 )
-def update_gantt_data(selected_date, data_store):
+@callback_metrics.instrument
+def update_gantt_data(selected_date, session_id):
     if not selected_date:
-        return [], "No date selected.", "0", {}
+        return [], None, "No date selected.", "0", {}, None
     
-    # Check if we already have processed data for this date
-    if selected_date in data_store:
-        raw_data = data_store[selected_date]
-    else:
-        # Filter data for the selected date
-        df['date'] = df['datetime'].dt.date.astype(str)
-        df_filtered = df[df['date'] == selected_date]
-        
-        # Convert filtered data to list of dictionaries and handle datetime serialization
-        raw_data = []
-        for _, row in df_filtered.iterrows():
-            try:
-                data_dict = {
-                    'datetime': row['datetime'].strftime('%Y-%m-%d %H:%M'),
-                    'toimipiste': str(row['toimipiste']),
-                    'aikaryhman': str(row['aikaryhman']),
-                    'aikaryhma': str(row['aikaryhma']),
-                    'laakari': str(row['laakari']),
-                    'RESURSSI': str(row['RESURSSI']),
-                    'specialty': str(row['ETNS']),  # Changed from ETNS to specialty
-                    'ETNS_A': int(row['ETNS_A']),
-                    'kesto_min': int(row['kesto_min']),
-                    'ETNS_B': int(row['ETNS_B']),
-                    'tyhja': int(row['tyhja'])
-                }
-                raw_data.append(data_dict)
-            except Exception as e:
-                print(f"Error processing row: {row}")
-                print(f"Error details: {str(e)}")
-                continue
-        
-        # Add random booking probabilities to the data
-        raw_data = add_random_probabilities(raw_data)
-        
-        # Save processed data for this date
-        data_store[selected_date] = raw_data
+    # Load the schedule from the server-side cache (or the index on a miss)
+    raw_data, version = schedule_cache.get(session_id, selected_date)
+    tracker = utilization_tracker(session_id, selected_date)
     
-    # Format raw data for display
-    raw_data_display = json.dumps(raw_data, indent=2)
+    # Summarize the day; the rows themselves stay in the cache
+    booked = sum(1 for row in raw_data if row.get('tyhja') == 0)
+    raw_data_display = (f"{selected_date}: {len(raw_data)} slots, {booked} booked, "
+                        f"{len(raw_data) - booked} available (version {version})")
     
-    return raw_data, raw_data_display, str(len(raw_data)), data_store
+    # The loaded rows already carry their probabilities
+    return (raw_data, None, raw_data_display, str(len(raw_data)),
+            {'date': selected_date, 'version': version}, tracker.summary())
 
-@callback(
-    Output('gantt-chart', 'rawData', allow_duplicate=True),
-    Input('gantt-chart', 'rawData'),
-    prevent_initial_call=True
-)
-def update_with_probabilities(gantt_data):
-    """Apply random probabilities to the data whenever it changes"""
-    if not gantt_data:
-        return gantt_data
-        
-    # Add random probabilities to simulate prediction model
-    updated_data = add_random_probabilities(gantt_data)
+if PATCH_EDITS:
+    @callback(
+        [Output('gantt-chart', 'predictions', allow_duplicate=True),
+         Output('raw-data', 'children', allow_duplicate=True),
+         Output('num-rows', 'children', allow_duplicate=True),
+         Output('schedule-version', 'data', allow_duplicate=True),
+         Output('gantt-chart', 'summary', allow_duplicate=True)],
+        [Input('gantt-chart', 'rawDataPatch')],
+        [State('date-picker', 'date'),
+         State('session-id', 'data')],
+        prevent_initial_call=True
+    )
+    @callback_metrics.instrument
+    def handle_gantt_updates(raw_data_patch, current_date, session_id):
+        # Nothing was edited: keep the predictions, counts and summary shown
+        if not raw_data_patch or not current_date:
+            return no_update, no_update, no_update, no_update, no_update
     
-    print(f"Applied random probabilities to {len(updated_data)} timeslots")
+        counts = {change: len(raw_data_patch.get(change, [])) for change in ('added', 'modified', 'removed')}
+        logger.debug("Handling patch from Gantt chart - %(added)d added, %(modified)d modified, "
+                     "%(removed)d removed", counts)
     
-    return updated_data
-
-@callback(
-    [Output('raw-data', 'children', allow_duplicate=True),
-     Output('num-rows', 'children', allow_duplicate=True),
-     Output('data-store', 'data', allow_duplicate=True)],
-    [Input('gantt-chart', 'rawData')],
-    [State('date-picker', 'date'),
-     State('data-store', 'data')],
-    prevent_initial_call=True
-)
-def handle_gantt_updates(updated_raw_data, current_date, data_store):
-    if not updated_raw_data or not current_date:
-        return "No data available.", "0", data_store
-    
-    # Print for debugging
-    print(f"Handling update from Gantt chart - {len(updated_raw_data)} timeslots")
+        # Score only the added and modified rows, then apply them to the cached
+        # schedule of the current date. The scores go back through the
+        # predictions prop, which recolors the edited slots without resending
+        # the schedule.
+        predictions = scorer.score_patch(raw_data_patch)
+        # The utilization tracker of the date bins only the edited rows again
+        version = schedule_cache.apply_patch(session_id, current_date, raw_data_patch)
+        tracker = utilization_tracker(session_id, current_date)
     
-    # Update the data store with the new data for the current date
-    data_store[current_date] = updated_raw_data
+        # Acknowledge the patch instead of resending the whole day
+        acknowledgement = ("Applied patch {version}: {added} added, {modified} modified, "
+                           "{removed} removed".format(version=version, **counts))
     
-    # Format raw data for display
-    raw_data_display = json.dumps(updated_raw_data, indent=2)
+        return (predictions, acknowledgement, str(len(tracker)),
+                {'date': current_date, 'version': version}, tracker.summary())
+else:
+    # Bundles built before updateMode report every edit as the full rawData
+    @callback(
+        [Output('raw-data', 'children', allow_duplicate=True),
+         Output('num-rows', 'children', allow_duplicate=True),
+         Output('schedule-version', 'data', allow_duplicate=True)],
+        [Input('gantt-chart', 'rawData')],
+        [State('date-picker', 'date'),
+         State('session-id', 'data')],
+        prevent_initial_call=True
+    )
+    @callback_metrics.instrument
+    def handle_gantt_edits(raw_data, current_date, session_id):
+        if raw_data is None or not current_date:
+            raise PreventUpdate
+        
+        # Also fires for the rows update_gantt_data loads into the chart
+        cached, _ = schedule_cache.get(session_id, current_date)
+        if raw_data == cached:
+            raise PreventUpdate
+        
+        version = schedule_cache.put(session_id, current_date, raw_data)
+        return (f"Saved edit {version}: {len(raw_data)} slots", str(len(raw_data)),
+                {'date': current_date, 'version': version})
+
+# Client-side timings of every session, for finding slow schedules
+perf_collector = PerfCollector()
+
+if 'perfMetrics' in BUNDLE_PROPS:
+    @callback(
+        Output('perf-summary', 'children'),
+        Input('gantt-chart', 'perfMetrics'),
+        State('session-id', 'data'),
+        prevent_initial_call=True
+    )
+    def collect_perf_metrics(perf_metrics, session_id):
+        perf_collector.add(session_id, perf_metrics)
+        if session_id not in perf_collector:
+            return ""
     
-    return raw_data_display, str(len(updated_raw_data)), data_store
+        summary = perf_collector.summary(session_id, percentiles=(50, 95))
+        parts = [
+            f"{name} p50 {metric['p50']:.1f} / p95 {metric['p95']:.1f}"
+            for name, metric in summary['metrics'].items()
+        ]
+        parts.append(f"dropped frames {summary['droppedFrames']}/{summary['dragFrames']}")
+        return f"{summary['rows']} rows: " + ", ".join(parts)
+
+if WEEK_VIEW:
+    @callback(
+        [Output('week-chart', 'rawData'),
+         Output('week-chart', 'occupancy')],
+        Input('week-chart', 'viewport'),
+        prevent_initial_call=True
+    )
+    @callback_metrics.instrument
+    def load_week_viewport(viewport):
+        # Send only the days the week view is missing, as slots or as hourly
+        # occupancy depending on its zoom; it keeps the others
+        raw_data = viewport_raw_data(schedule_store, viewport)
+        occupancy = viewport_occupancy(schedule_store, viewport)
+        if raw_data is None and occupancy is None:
+            raise PreventUpdate
+        return (
+            no_update if raw_data is None else scorer.annotate(raw_data),
+            no_update if occupancy is None else occupancy,
+        )
+
+    @callback(
+        Output('week-chart', 'date'),
+        Input('date-picker', 'date')
+    )
+    def update_week_date(date):
+        return date
 
 @callback(
     Output('gantt-chart', 'date'),